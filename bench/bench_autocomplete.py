@@ -0,0 +1,75 @@
+"""
+Micro-benchmark autocomplete nama produk: ProductNameIndex vs scan linear
+lama (load semua nama lalu cek substring satu per satu).
+
+    python bench/bench_autocomplete.py --products 10000
+"""
+import argparse
+import random
+import string
+import tempfile
+import time
+
+from fakes import load_app
+
+WORDS = ["ikan", "secret", "tumbal", "mutasi", "gold", "rainbow", "shiny", "big", "mega", "frozen",
+         "lava", "ghost", "dragon", "koi", "shark", "tuna", "whale", "crab", "squid", "eel"]
+
+
+def make_names(count: int) -> list:
+    rng = random.Random(42)
+    names = set()
+    while len(names) < count:
+        words = rng.sample(WORDS, rng.randint(2, 3))
+        suffix = "".join(rng.choices(string.ascii_uppercase + string.digits, k=3))
+        names.add(" ".join(w.title() for w in words) + f" {suffix}")
+    return list(names)
+
+
+def linear_scan(names: list, current: str) -> list:
+    current_lower = current.lower()
+    return [n for n in names if not current or current_lower in n.lower()][:25]
+
+
+def bench(label: str, fn, queries: list, rounds: int) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for q in queries:
+            fn(q)
+    per_query = (time.perf_counter() - start) / (rounds * len(queries))
+    print(f"{label:<28} {per_query * 1e6:10.2f} µs/query")
+    return per_query
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--products", type=int, default=10_000)
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    app = load_app(tempfile.mkdtemp(prefix="bench-ac-"))
+    names = make_names(args.products)
+
+    start = time.perf_counter()
+    index = app.ProductNameIndex(names)
+    print(f"build index {len(index)} produk: {(time.perf_counter() - start) * 1e3:.1f} ms")
+
+    # Ketikan user: tiap prefix dari beberapa nama + potongan kata di tengah
+    rng = random.Random(7)
+    queries = [""]
+    for name in rng.sample(names, 20):
+        queries.extend(name[:i] for i in range(1, min(len(name), 8)))
+        queries.append(name.split()[1][:4])
+
+    bench("scan linear (lama)", lambda q: linear_scan(names, q), queries, max(1, args.rounds // 10))
+    bench("index (tanpa cache)", lambda q: (index._cache.clear(), index.search(q)), queries, args.rounds)
+    bench("index (cache hit)", index.search, queries, args.rounds)
+
+    start = time.perf_counter()
+    for name in names[:1000]:
+        index.rename(name, name + " X")
+    print(f"rename incremental: {(time.perf_counter() - start) / 1000 * 1e6:.1f} µs/produk")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,289 @@
+"""
+Benchmark handler asli app.py (ProductSelect, PurchaseModal, TicketView,
+autocomplete & command admin) terhadap Discord palsu dari fakes.py, tanpa
+network. Katalog & riwayat transaksi dibuat dulu sesuai ukuran yang diminta,
+lalu tiap skenario dijalankan `--ops` kali dengan `--concurrency` worker.
+
+Hasil (throughput, p50/p99/max per skenario) dicetak dan bisa disimpan ke
+JSON untuk dibandingkan antar versi:
+
+    python bench/bench_handlers.py --products 2000 --history 100000 --output baru.json
+    python bench/bench_handlers.py --products 2000 --history 100000 --compare baru.json
+
+STORAGE_BACKEND=sqlite di environment untuk mengukur backend SQLite.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from fakes import REPO_ROOT, FakeAttachment, FakeGuild, FakeInteraction, FakeUser, load_app
+
+CATEGORIES = ["Ikan", "Secret", "Mutasi", "Event"]
+
+
+def write_fixtures(workdir: str, products: int, history: int, users: int, seed: int) -> list:
+    """Tulis products.json & transactions.json awal. Return daftar nama produk."""
+    rng = random.Random(seed)
+    names = [f"Produk {i:05d}" for i in range(products)]
+    catalogue = {
+        name: {"stock": 10 ** 9, "price": rng.randrange(1000, 100000, 500), "category": rng.choice(CATEGORIES)}
+        for name in names
+    }
+
+    now = datetime.now()
+    transactions = {}
+    for i in range(history):
+        amount = rng.randint(1, 5)
+        price = catalogue[rng.choice(names)]["price"]
+        created = now - timedelta(days=rng.uniform(0, 365))
+        transactions[str(1_000_000_000 + i)] = {
+            "user_id": 500_000 + rng.randrange(users),
+            "product": rng.choice(names),
+            "amount": amount,
+            "unit_price": price,
+            "total_price": amount * price,
+            "status": "success" if rng.random() < 0.8 else "cancelled",
+            "created_at": created.isoformat(),
+            "processed_by": 1,
+            "processed_at": (created + timedelta(minutes=5)).isoformat()
+        }
+
+    with open(os.path.join(workdir, "products.json"), "w") as f:
+        json.dump(catalogue, f)
+    with open(os.path.join(workdir, "transactions.json"), "w") as f:
+        json.dump(transactions, f)
+    return names
+
+
+async def run_scenario(name: str, op, ops: int, concurrency: int) -> dict:
+    latencies = []
+    errors = 0
+    indexes = iter(range(ops))
+
+    async def worker():
+        nonlocal errors
+        for i in indexes:
+            started = time.perf_counter()
+            try:
+                await op(i)
+            except Exception:
+                errors += 1
+            latencies.append(time.perf_counter() - started)
+
+    wall = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    wall = time.perf_counter() - wall
+
+    latencies.sort()
+
+    def pct(q: float) -> float:
+        return latencies[min(len(latencies) - 1, int(q * len(latencies)))] * 1000 if latencies else 0.0
+
+    result = {
+        "ops": len(latencies),
+        "errors": errors,
+        "seconds": round(wall, 4),
+        "throughput": round(len(latencies) / wall, 1) if wall else 0.0,
+        "p50_ms": round(pct(0.50), 3),
+        "p99_ms": round(pct(0.99), 3),
+        "max_ms": round(latencies[-1] * 1000, 3) if latencies else 0.0
+    }
+    print(
+        f"{name:<18} {result['throughput']:>10.1f} op/s  p50 {result['p50_ms']:>8.3f}ms  "
+        f"p99 {result['p99_ms']:>8.3f}ms  max {result['max_ms']:>8.3f}ms  error {errors}"
+    )
+    return result
+
+
+async def run(args) -> dict:
+    workdir = tempfile.mkdtemp(prefix="bench-")
+    names = write_fixtures(workdir, args.products, args.history, args.users, args.seed)
+
+    load_started = time.perf_counter()
+    app = load_app(workdir)
+    # Store di-load lazy: sentuh sekali supaya waktu load ikut terukur
+    app.store.products
+    load_seconds = time.perf_counter() - load_started
+
+    rng = random.Random(args.seed)
+    store = app.store
+    store.start()
+    # Kondisi steady state: transaksi lama sudah dipindah ke arsip (riwayat & laporan ikut membaca arsip)
+    archived = await store.archive_completed()
+    if args.rate_limits:
+        # Antrian REST aktif dengan budget asli: latency ikut menunggu rate limit Discord
+        app.outbound.start()
+
+    guild = FakeGuild()
+    admin = FakeUser()
+    app.config.ALLOWED_USER_IDS.append(admin.id)
+    buyers = [FakeUser(user_id=500_000 + i) for i in range(args.users)]
+    # Skenario purchase mengukur jalur create ticket: pembeli diambil acak dari --users (banyak yang
+    # beli berkali-kali), jadi batas ticket terbuka & rate limit per user dimatikan dulu.
+    # purchase_repeat menyalakan lagi batasnya: satu pembeli submit produk yang sama berulang kali,
+    # jadi (selain op pertama kalau dia belum punya ticket) yang terukur adalah jalur redirect.
+    max_open_tickets = app.config.MAX_OPEN_TICKETS
+    app.config.MAX_OPEN_TICKETS = 0
+    app.purchase_limiter.capacity = 0
+
+    main_view = app.storefront_pages.main_view()
+    select = next(item for item in main_view.children if isinstance(item, app.ProductSelect))
+    tickets = []
+
+    async def product_select(i):
+        select._values = [rng.choice(names)]
+        await select.callback(FakeInteraction(guild, rng.choice(buyers)))
+
+    async def autocomplete(i):
+        await app.product_name_autocomplete(FakeInteraction(guild, admin), f"{rng.randrange(args.products):05d}"[:3])
+
+    async def purchase(i):
+        modal = app.PurchaseModal(rng.choice(names))
+        modal.amount._value = "1"
+        await modal.on_submit(FakeInteraction(guild, rng.choice(buyers)))
+
+    repeat_buyer, repeat_product = buyers[0], names[0]
+
+    async def purchase_repeat(i):
+        modal = app.PurchaseModal(repeat_product)
+        modal.amount._value = "1"
+        await modal.on_submit(FakeInteraction(guild, repeat_buyer))
+
+    async def ticket_success(i):
+        channel = tickets[i]
+        view = app.TicketView(channel.id)
+        await view.success_button.callback(FakeInteraction(guild, admin, channel=channel))
+
+    async def setstock(i):
+        await app.setstock.callback(FakeInteraction(guild, admin), rng.choice(names), 10 ** 9)
+
+    async def bulkupdate(i):
+        # Restock 200 produk dalam satu command (setara 200x /setstock)
+        rows = "".join(f"{name},+1,\n" for name in rng.sample(names, min(200, len(names))))
+        attachment = FakeAttachment("restock.csv", ("name,stock,price\n" + rows).encode())
+        await app.bulkupdate.callback(FakeInteraction(guild, admin), attachment, False)
+
+    async def stock(i):
+        await app.stock_cmd.callback(FakeInteraction(guild, admin))
+
+    async def riwayat(i):
+        await app.riwayat.callback(FakeInteraction(guild, admin), rng.choice(buyers))
+
+    async def laporan(i):
+        await app.laporan.callback(FakeInteraction(guild, admin), 30)
+
+    print(
+        f"produk={args.products} riwayat={args.history} concurrency={args.concurrency} "
+        f"ops={args.ops} backend={app.config.STORAGE_BACKEND} load={load_seconds * 1000:.0f}ms "
+        f"aktif={len(store.transactions)} arsip={archived}"
+    )
+    results = {}
+    scenarios = [
+        ("product_select", product_select),
+        ("autocomplete", autocomplete),
+        ("purchase", purchase),
+        ("purchase_repeat", purchase_repeat),
+        ("ticket_success", ticket_success),
+        ("setstock", setstock),
+        ("bulkupdate", bulkupdate),
+        ("stock", stock),
+        ("riwayat", riwayat),
+        ("laporan", laporan)
+    ]
+    for name, op in scenarios:
+        if args.only and name not in args.only:
+            continue
+        ops = args.ops
+        if name == "purchase_repeat":
+            app.config.MAX_OPEN_TICKETS = max(1, max_open_tickets)
+        if name == "ticket_success":
+            tickets = [c for category in guild.categories for c in category.channels]
+            ops = min(ops, len(tickets))
+        results[name] = await run_scenario(name, op, ops, args.concurrency)
+
+    await app.outbound.close()
+    await store.close()
+
+    return {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "git": git_revision(),
+            "python": platform.python_version(),
+            "backend": app.config.STORAGE_BACKEND,
+            "products": args.products,
+            "history": args.history,
+            "users": args.users,
+            "concurrency": args.concurrency,
+            "ops": args.ops,
+            "rate_limits": args.rate_limits,
+            "load_ms": round(load_seconds * 1000, 1)
+        },
+        "results": results
+    }
+
+
+def git_revision() -> str:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=REPO_ROOT, capture_output=True, text=True, timeout=10
+        )
+        return out.stdout.strip() or None
+    except Exception:
+        return None
+
+
+def compare(baseline: dict, current: dict):
+    print(f"\nDibanding {baseline['meta'].get('git')} ({baseline['meta'].get('timestamp')}):")
+    for name, now in current["results"].items():
+        old = baseline.get("results", {}).get(name)
+        if not old:
+            continue
+        parts = []
+        for key in ("throughput", "p50_ms", "p99_ms"):
+            if old[key]:
+                parts.append(f"{key} {(now[key] - old[key]) * 100 / old[key]:+6.1f}%")
+        print(f"{name:<18} " + "  ".join(parts))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--products", type=int, default=1000, help="ukuran katalog")
+    parser.add_argument("--history", type=int, default=20000, help="jumlah transaksi lama di riwayat")
+    parser.add_argument("--users", type=int, default=500, help="jumlah pembeli berbeda")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--ops", type=int, default=2000, help="operasi per skenario")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--rate-limits", action="store_true", help="aktifkan antrian REST dengan budget rate limit asli")
+    parser.add_argument("--only", nargs="*", help="jalankan skenario tertentu saja")
+    parser.add_argument("--output", help="simpan hasil ke file JSON")
+    parser.add_argument("--compare", help="file JSON hasil sebelumnya untuk dibandingkan")
+    args = parser.parse_args()
+
+    # Path relatif terhadap direktori pemanggil (load_app pindah ke workdir sementara)
+    output = os.path.abspath(args.output) if args.output else None
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+
+    report = asyncio.run(run(args))
+
+    if baseline:
+        compare(baseline, report)
+    if output:
+        with open(output, "w") as f:
+            json.dump(report, f, indent=4)
+        print(f"\nHasil disimpan ke {output}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,106 @@
+"""
+Crash-reload check: transaksi dibuat & di-Success, lalu store di-load ulang
+dari file yang sama TANPA close / flush (seperti proses yang mati tiba-tiba).
+Setelah reload, transaksi success harus selalu datang bersama stock yang
+sudah dikurangi; kalau tidak, stock itu tidak lagi dihitung pending dan
+toko bisa oversell. Stock yang diubah admin setelah penjualan (dan sudah
+di-flush) juga tidak boleh tertimpa stock dari journal.
+
+    python bench/crash_reload.py                 # json & sqlite
+    python bench/crash_reload.py --backend sqlite
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+from datetime import datetime
+
+from fakes import REPO_ROOT
+
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from storebot.config import config  # noqa: E402
+from storebot.guilds import GuildSettings  # noqa: E402
+from storebot.store import create_store  # noqa: E402
+
+PRODUCT = "Ikan Crash"
+
+
+def sell(store, tx_id: int, amount: int):
+    tx = {
+        "user_id": 1,
+        "product": PRODUCT,
+        "amount": amount,
+        "total_price": amount * 1000,
+        "status": "pending",
+        "created_at": datetime.now().isoformat()
+    }
+    store.create_transaction(tx_id, tx)
+    store.complete_sale(tx_id, 2)
+
+
+def check(backend: str, scenario: str, stock: int, amount: int) -> bool:
+    os.chdir(tempfile.mkdtemp(prefix=f"crash-{backend}-{scenario}-"))
+    config.STORAGE_BACKEND = backend
+    settings = GuildSettings.primary()
+
+    store = create_store(settings)
+    store.put_product(PRODUCT, stock, 1000)
+    store.flush_now()
+    store = create_store(settings)
+
+    sell(store, 1, amount)
+    expected = stock - amount
+    if scenario == "restock":
+        # Admin ubah stock setelah penjualan & produk sempat di-flush (journal masih berisi event success)
+        store.put_product(PRODUCT, 50, 1000)
+        asyncio.run(store.flush())
+        expected = 50
+    elif scenario == "two_sales":
+        # Penjualan pertama sudah di products.json, yang kedua hanya ada di journal
+        asyncio.run(store.flush())
+        sell(store, 2, amount)
+        expected = stock - 2 * amount
+    # "Crash": store lama ditinggal begitu saja, tanpa flush write-behind / close
+
+    reloaded = create_store(settings)
+    status = reloaded.transactions["1"]["status"]
+    stock_after = reloaded.products[PRODUCT]["stock"]
+    available = reloaded.available_stock(PRODUCT)
+    print(f"{backend}/{scenario}: status={status} stock={stock_after} pending={reloaded.pending} tersedia={available}")
+
+    ok = True
+    if status != "success":
+        print(f"GAGAL ({backend}/{scenario}): transaksi tidak success setelah reload")
+        ok = False
+    if stock_after != expected:
+        print(f"GAGAL ({backend}/{scenario}): stock {stock_after}, seharusnya {expected}")
+        ok = False
+    if available > expected:
+        print(f"GAGAL ({backend}/{scenario}): stock tersedia {available} > {expected} -> bisa oversell")
+        ok = False
+    reloaded.backend.close()
+    store.backend.close()
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backend", choices=["json", "sqlite"], action="append")
+    parser.add_argument("--stock", type=int, default=10)
+    parser.add_argument("--amount", type=int, default=2)
+    args = parser.parse_args()
+
+    ok = all([
+        check(backend, scenario, args.stock, args.amount)
+        for backend in args.backend or ["json", "sqlite"]
+        for scenario in ("sale", "restock", "two_sales")
+    ])
+    print("OK" if ok else "FAILED")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
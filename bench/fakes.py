@@ -0,0 +1,245 @@
+"""
+Pengganti in-process untuk objek discord.py (Interaction, Guild, TextChannel, ...)
+supaya handler di app.py bisa dijalankan tanpa koneksi ke Discord.
+Hanya atribut / method yang dipakai app.py yang diimplementasikan.
+"""
+import asyncio
+import itertools
+import os
+import random
+import sys
+
+import discord
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_ids = itertools.count(10_000_000)
+
+
+def load_app(workdir: str):
+    """
+    Import app.py dengan working directory `workdir` (semua file JSON/journal
+    ditulis di sana) dan tanpa token, supaya bot tidak connect ke gateway.
+    """
+    os.environ["DISCORD_TOKEN"] = ""
+    os.chdir(workdir)
+    if REPO_ROOT not in sys.path:
+        sys.path.insert(0, REPO_ROOT)
+    import app
+    return app
+
+
+def next_id() -> int:
+    return next(_ids)
+
+
+class FakeUser:
+    def __init__(self, user_id: int = None, name: str = None):
+        self.id = user_id if user_id is not None else next_id()
+        self.name = name or f"user{self.id}"
+        self.display_name = self.name
+        self.mention = f"<@{self.id}>"
+        self.bot = False
+
+    def __hash__(self):
+        return hash(self.id)
+
+    def __eq__(self, other):
+        return isinstance(other, FakeUser) and other.id == self.id
+
+
+class FakeRole:
+    def __init__(self, name: str = "@everyone"):
+        self.id = next_id()
+        self.name = name
+
+
+class FakeTextChannel:
+    # Lolos cek isinstance(channel, discord.TextChannel) di app.py
+    @property
+    def __class__(self):
+        return discord.TextChannel
+
+    def __init__(self, guild, name: str, category=None, overwrites=None):
+        self.id = next_id()
+        self.guild = guild
+        self.name = name
+        self.category = category
+        self.category_id = category.id if category is not None else None
+        self.overwrites = overwrites or {}
+        self.mention = f"<#{self.id}>"
+        self.sent = []
+        self.messages = {}
+        self.deleted = False
+
+    async def send(self, content=None, **kwargs):
+        self.sent.append({"content": content, **kwargs})
+        message = FakeMessage(self, content, **kwargs)
+        self.messages[message.id] = message
+        return message
+
+    def get_partial_message(self, message_id: int):
+        return self.messages[message_id]
+
+    async def delete(self, **kwargs):
+        self.deleted = True
+        if self.category is not None and self in self.category.channels:
+            self.category.channels.remove(self)
+        self.guild.channels.pop(self.id, None)
+
+
+class FakeMessage:
+    def __init__(self, channel, content=None, embed=None, view=None, **kwargs):
+        self.id = next_id()
+        self.channel = channel
+        self.content = content
+        self.embeds = [embed] if embed is not None else []
+        self.view = view
+        self.edits = 0
+
+    async def edit(self, **kwargs):
+        self.edits += 1
+        if "embed" in kwargs:
+            self.embeds = [kwargs["embed"]] if kwargs["embed"] is not None else []
+        if "view" in kwargs:
+            self.view = kwargs["view"]
+        return self
+
+
+class FakeAttachment:
+    def __init__(self, filename: str, data: bytes):
+        self.filename = filename
+        self.data = data
+        self.size = len(data)
+
+    async def read(self) -> bytes:
+        return self.data
+
+
+class FakeCategory:
+    """Kategori ticket. create_text_channel bisa diberi latency & peluang gagal."""
+
+    # Lolos cek isinstance(category, discord.CategoryChannel) di TicketCategoryManager
+    @property
+    def __class__(self):
+        return discord.CategoryChannel
+
+    def __init__(self, guild, name: str = "TICKETS", latency: tuple = (0.0, 0.0), fail_rate: float = 0.0,
+                 overwrites=None, position: int = 0):
+        self.id = next_id()
+        self.guild = guild
+        self.name = name
+        self.overwrites = overwrites or {}
+        self.position = position
+        self.channels = []
+        self.latency = latency
+        self.fail_rate = fail_rate
+        self.create_calls = 0
+
+    async def create_text_channel(self, name: str, overwrites=None, **kwargs):
+        self.create_calls += 1
+        low, high = self.latency
+        if high > 0:
+            await asyncio.sleep(random.uniform(low, high))
+        if self.fail_rate and random.random() < self.fail_rate:
+            raise RuntimeError("simulated create_text_channel failure")
+        channel = FakeTextChannel(self.guild, name, category=self, overwrites=overwrites)
+        self.channels.append(channel)
+        self.guild.channels[channel.id] = channel
+        return channel
+
+    @property
+    def text_channels(self) -> list:
+        return list(self.channels)
+
+    async def delete(self, **kwargs):
+        self.guild.categories.remove(self)
+        self.guild.channels.pop(self.id, None)
+
+
+class FakeGuild:
+    def __init__(self, latency: tuple = (0.0, 0.0), fail_rate: float = 0.0):
+        self.id = next_id()
+        self.default_role = FakeRole()
+        self.me = FakeUser(name="bot")
+        self.channels = {}
+        self.members = {}
+        self.categories = []
+        self._add_category(FakeCategory(self, "TICKETS", latency=latency, fail_rate=fail_rate))
+
+    def _add_category(self, category):
+        self.categories.append(category)
+        self.channels[category.id] = category
+        return category
+
+    def get_channel(self, channel_id: int):
+        return self.channels.get(channel_id)
+
+    def get_member(self, user_id: int):
+        return self.members.get(user_id)
+
+    async def create_category(self, name: str, overwrites=None, position: int = 0, **kwargs):
+        first = self.categories[0] if self.categories else None
+        latency, fail_rate = (first.latency, first.fail_rate) if first is not None else ((0.0, 0.0), 0.0)
+        return self._add_category(
+            FakeCategory(self, name, latency=latency, fail_rate=fail_rate, overwrites=overwrites, position=position)
+        )
+
+
+class FakeResponse:
+    def __init__(self):
+        self.messages = []
+        self.modal = None
+        self._done = False
+
+    def is_done(self) -> bool:
+        return self._done
+
+    def _ack(self):
+        if self._done:
+            raise RuntimeError("Interaction sudah di-acknowledge")
+        self._done = True
+
+    async def send_message(self, content=None, **kwargs):
+        self._ack()
+        self.messages.append({"content": content, **kwargs})
+
+    async def send_modal(self, modal):
+        self._ack()
+        self.modal = modal
+
+    async def defer(self, **kwargs):
+        self._ack()
+
+    async def edit_message(self, **kwargs):
+        self._ack()
+        self.messages.append({"edit": True, **kwargs})
+
+
+class FakeFollowup:
+    def __init__(self):
+        self.messages = []
+
+    async def send(self, content=None, **kwargs):
+        self.messages.append({"content": content, **kwargs})
+
+
+class FakeClient:
+    def __init__(self):
+        self.user = FakeUser(name="bot")
+        self.channels = {}
+
+    def get_channel(self, channel_id: int):
+        return self.channels.get(channel_id)
+
+
+class FakeInteraction:
+    def __init__(self, guild: FakeGuild = None, user: FakeUser = None, channel=None, client: FakeClient = None, message=None):
+        self.guild = guild
+        self.guild_id = guild.id if guild is not None else None
+        self.user = user or FakeUser()
+        self.channel = channel
+        self.client = client or FakeClient()
+        self.message = message
+        self.response = FakeResponse()
+        self.followup = FakeFollowup()
@@ -0,0 +1,129 @@
+"""
+Stress test reservasi stock: ribuan PurchaseModal.on_submit dijalankan
+bersamaan terhadap guild palsu (create channel dengan latency & sesekali
+gagal), sementara admin menekan Success di ticket yang sudah jadi.
+
+Invariant yang dicek:
+- stock tersedia (stock - pending - holds) tidak pernah negatif
+- total amount yang terjual + pending tidak melebihi stock awal
+- semua hold dilepas setelah semua submit selesai (termasuk yang gagal)
+- ticket benar-benar tercipta (terjual + pending > 0) dan jumlah create
+  yang gagal kira-kira fail_rate x create channel yang dicoba (fake guild
+  tidak rusak diam-diam)
+
+    python bench/stress_reservation.py --buyers 5000 --stock 1000
+"""
+import argparse
+import asyncio
+import math
+import random
+import sys
+import tempfile
+
+from fakes import FakeGuild, FakeInteraction, FakeUser, load_app
+
+PRODUCT = "Ikan Stress"
+
+
+async def run(args) -> int:
+    app = load_app(tempfile.mkdtemp(prefix="stress-"))
+    store = app.store
+    store.products[PRODUCT] = {"stock": args.stock, "price": 1000}
+
+    guild = FakeGuild(latency=(0.0, args.max_latency), fail_rate=args.fail_rate)
+    admin = FakeUser()
+    app.config.ALLOWED_USER_IDS.append(admin.id)
+    violations = []
+    sold = 0
+
+    async def buyer():
+        await asyncio.sleep(random.uniform(0, args.spread))
+        modal = app.PurchaseModal(PRODUCT)
+        modal.amount._value = str(random.randint(1, args.max_amount))
+        interaction = FakeInteraction(guild=guild)
+        await modal.on_submit(interaction)
+
+    async def admin_loop(done: asyncio.Event):
+        nonlocal sold
+        while not done.is_set():
+            pending_ids = [tx_id for tx_id, tx in store.transactions.items() if tx.get("status") == "pending"]
+            if pending_ids and random.random() < args.success_rate:
+                tx_id = random.choice(pending_ids)
+                sold += store.transactions[tx_id]["amount"]
+                store.complete_sale(tx_id, admin.id)
+            await asyncio.sleep(0)
+
+    async def monitor(done: asyncio.Event):
+        while not done.is_set():
+            available = store.available_stock(PRODUCT)
+            if available < 0:
+                violations.append(available)
+            await asyncio.sleep(0)
+
+    done = asyncio.Event()
+    watchers = [asyncio.create_task(monitor(done)), asyncio.create_task(admin_loop(done))]
+    results = await asyncio.gather(*(buyer() for _ in range(args.buyers)), return_exceptions=True)
+    done.set()
+    await asyncio.gather(*watchers)
+
+    failed = sum(1 for r in results if isinstance(r, Exception))
+    pending = store.pending.get(PRODUCT, 0)
+    stock_left = store.products[PRODUCT]["stock"]
+    tickets = sum(len(c.channels) for c in guild.categories)
+    # Pembeli yang ditolak karena stock habis tidak pernah sampai create channel
+    create_attempts = sum(c.create_calls for c in guild.categories)
+
+    print(f"buyers={args.buyers} tickets={tickets} create_attempts={create_attempts} create_failed={failed}")
+    print(f"stock_awal={args.stock} terjual={sold} pending={pending} stock_sisa={stock_left} holds={store.holds}")
+    for line in app.metrics.summary_lines():
+        if line.startswith("interaction"):
+            print(line)
+
+    ok = True
+    if violations:
+        print(f"GAGAL: stock tersedia sempat negatif ({min(violations)})")
+        ok = False
+    if sold + pending > args.stock:
+        print("GAGAL: oversell (terjual + pending > stock awal)")
+        ok = False
+    if stock_left != args.stock - sold:
+        print("GAGAL: pengurangan stock tidak konsisten")
+        ok = False
+    if store.holds:
+        print("GAGAL: masih ada hold yang tidak dilepas")
+        ok = False
+    if sold + pending <= 0 or not tickets:
+        print("GAGAL: tidak ada ticket yang tercipta")
+        ok = False
+    # Gagal create ~ Binomial(create_attempts, fail_rate); toleransi 4 sigma + sedikit slack
+    expected_failed = args.fail_rate * create_attempts
+    tolerance = 4 * math.sqrt(create_attempts * args.fail_rate * (1 - args.fail_rate)) + 5
+    if abs(failed - expected_failed) > tolerance:
+        print(f"GAGAL: create_failed={failed}, diharapkan sekitar {expected_failed:.0f} (±{tolerance:.0f})")
+        ok = False
+    if tickets + failed > args.buyers:
+        print("GAGAL: ticket + gagal melebihi jumlah pembeli")
+        ok = False
+    if store.verify_pending_index():
+        ok = False
+
+    store.backend.close()
+    print("OK" if ok else "FAILED")
+    return 0 if ok else 1
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--buyers", type=int, default=5000)
+    parser.add_argument("--stock", type=int, default=1000)
+    parser.add_argument("--max-amount", type=int, default=3)
+    parser.add_argument("--spread", type=float, default=1.0, help="rentang waktu kedatangan pembeli (detik)")
+    parser.add_argument("--max-latency", type=float, default=0.02, help="latency maksimum create channel (detik)")
+    parser.add_argument("--fail-rate", type=float, default=0.05, help="peluang create channel gagal")
+    parser.add_argument("--success-rate", type=float, default=0.05, help="peluang admin menekan Success tiap tick")
+    args = parser.parse_args()
+    sys.exit(asyncio.run(run(args)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,15 @@
+"""
+Bot toko Discord: storefront produk, ticket pembelian & stock.
+
+Import package ini tidak membaca .env, tidak menyentuh file data dan tidak
+connect ke Discord; semua itu baru terjadi lewat `main()` atau saat object
+seperti `storebot.guilds.store` pertama kali dipakai.
+"""
+from .lazy import startup_timings
+
+__all__ = ["main", "startup_timings"]
+
+
+def main():
+    from .bot import main as run_bot
+    return run_bot()
@@ -0,0 +1,770 @@
+import asyncio
+import hashlib
+import io
+import json
+import time
+from datetime import datetime, timedelta
+from typing import Literal, Optional
+
+import discord
+from discord import app_commands
+from discord.ext import commands
+
+from .catalog import parse_bulk_file, plan_bulk_update
+from .config import config
+from .formatting import rupiah
+from .lazy import PROCESS_STARTED, is_loaded, startup_phase, startup_timings
+from .metrics import metrics, metrics_server, profiler
+from .outbound import outbound
+from .scheduler import scheduler
+from .guilds import (
+    DEFAULT_GUILD,
+    GuildContext,
+    GuildSettings,
+    current_guild,
+    guilds,
+    refresh_main_embed,
+    settings,
+    store,
+    ticket_categories,
+    ticket_pool
+)
+from .handlers import NOT_SET_UP_MESSAGE
+from .storage import load_command_sync, load_main_message, save_command_sync, save_main_message
+from .storefront import storefront_fingerprint
+from .views import StorefrontView
+
+
+# ============================================
+# DISCORD INTENTS & BOT
+# ============================================
+intents = discord.Intents.default()
+intents.message_content = True
+intents.members = True
+
+class StoreCommandTree(app_commands.CommandTree):
+    """
+    CommandTree yang mencatat durasi & hasil tiap slash command ke metrics,
+    dan memasang toko milik guild interaction sebagai toko aktif (termasuk
+    untuk autocomplete). Command ber-extras {"scope": "global"} tidak butuh toko.
+    """
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        interaction.extras["started_at"] = time.perf_counter()
+        command = interaction.command
+        if command is not None and command.extras.get("scope") == "global":
+            return True
+
+        ctx = await guilds.acquire(interaction.guild_id)
+        if ctx is None:
+            if interaction.type is discord.InteractionType.application_command:
+                await interaction.response.send_message(NOT_SET_UP_MESSAGE, ephemeral=True)
+            return False
+        # Tiap interaction jalan di task sendiri, jadi toko aktif tidak bocor ke interaction lain
+        current_guild.set(ctx)
+        return True
+
+    async def on_error(self, interaction: discord.Interaction, error: app_commands.AppCommandError):
+        observe_command(interaction, "error")
+        await super().on_error(interaction, error)
+
+
+def observe_command(interaction: discord.Interaction, outcome: str):
+    started = interaction.extras.get("started_at")
+    command = interaction.command
+    if started is None or command is None:
+        return
+    name = f"/{command.qualified_name}"
+    metrics.observe("interaction_seconds", time.perf_counter() - started, handler=name)
+    metrics.inc("interactions_total", handler=name, outcome=outcome)
+
+
+class StoreBot(commands.AutoShardedBot):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Setup di on_ready (sync command, embed utama) hanya sekali per proses
+        self.setup_done = False
+
+    async def setup_hook(self):
+        with startup_phase("setup_hook"):
+            if config.PROFILER_ENABLED:
+                profiler.start()
+            await metrics_server.start()
+            outbound.start()
+            scheduler.register("delete_channel", delete_channel_job, per_second=config.CHANNEL_DELETE_PER_SECOND)
+            scheduler.register("reclaim_ticket_category", reclaim_ticket_category_job, per_second=1)
+            # Job baru jalan setelah READY (cache channel sudah terisi)
+            scheduler.start(self)
+            # Toko di-load saat guild-nya pertama dipakai, bukan di sini
+            guilds.start(self)
+            # Persistent view message utama semua toko, cukup didaftarkan sekali
+            self.add_view(StorefrontView.dispatcher())
+
+    async def close(self):
+        # Komponen yang belum pernah dipakai tidak perlu dibuat hanya untuk ditutup
+        for component in (guilds, scheduler, outbound, metrics_server):
+            if is_loaded(component):
+                await component.close()
+        if is_loaded(profiler):
+            profiler.stop()
+        await super().close()
+
+
+# Member tidak di-chunk saat startup: biaya startup tidak ikut jumlah guild / member
+bot = StoreBot(command_prefix="!", intents=intents, tree_cls=StoreCommandTree, chunk_guilds_at_startup=False)
+
+
+async def delete_channel_job(job: dict):
+    channel_id = job["args"]["channel_id"]
+    channel = bot.get_channel(channel_id)
+    if channel is None:
+        # Sudah dihapus (manual / sebelum restart)
+        return
+    try:
+        await outbound.submit("ticket", f"channel_delete:{channel.guild.id}", channel.delete)
+    except discord.NotFound:
+        pass
+
+
+async def reclaim_ticket_category_job(job: dict):
+    category = bot.get_channel(job["args"]["category_id"])
+    if not isinstance(category, discord.CategoryChannel):
+        return
+    ctx = await guilds.acquire(category.guild.id)
+    if ctx is not None:
+        await ctx.ticket_categories.reclaim(category)
+
+
+def startup_report() -> str:
+    phases = ", ".join(f"{name} {seconds * 1000:.0f}ms" for name, seconds in startup_timings.items())
+    return f"Startup {time.perf_counter() - PROCESS_STARTED:.2f}s sejak import ({phases})"
+
+# ============================================
+# EVENTS
+# ============================================
+def command_tree_fingerprint(tree: app_commands.CommandTree) -> str:
+    """Hash payload semua command di tree, sama dengan yang dikirim saat sync."""
+    payloads = sorted((command.to_dict(tree) for command in tree.get_commands()), key=lambda d: (d.get("type", 1), d["name"]))
+    return hashlib.sha1(json.dumps(payloads, sort_keys=True, default=str).encode()).hexdigest()
+
+
+async def sync_commands():
+    """
+    Sync slash command hanya kalau command tree berubah sejak sync terakhir
+    (fingerprint disimpan di COMMAND_SYNC_FILE). Sync global kena rate limit,
+    jadi restart / reconnect tanpa perubahan tidak perlu memanggilnya.
+    """
+    fingerprint = command_tree_fingerprint(bot.tree)
+    state = load_command_sync()
+    if (
+        not config.FORCE_COMMAND_SYNC
+        and state
+        and state.get("application_id") == bot.application_id
+        and state.get("fingerprint") == fingerprint
+    ):
+        metrics.inc("command_sync_total", result="skipped")
+        print("Slash command tidak berubah, sync dilewati.")
+        return
+
+    try:
+        synced = await bot.tree.sync()
+    except Exception as e:
+        metrics.inc("command_sync_total", result="error")
+        print(f"Error syncing commands: {e}")
+        return
+    save_command_sync(bot.application_id, fingerprint)
+    metrics.inc("command_sync_total", result="synced")
+    print(f"Synced {len(synced)} command(s)")
+
+
+async def setup_storefront(ctx: GuildContext, channel: discord.TextChannel):
+    """Kirim embed utama toko, atau pakai ulang message yang tersimpan."""
+    pages = ctx.storefront_pages
+    embed = pages.page(None, 0).embed
+    view = pages.main_view()
+    fingerprint = storefront_fingerprint(embed, view)
+    path = ctx.settings.MAIN_MESSAGE_FILE
+
+    state = load_main_message(path)
+    msg = None
+
+    if state and state.get("channel_id") == channel.id:
+        try:
+            msg = await channel.fetch_message(state.get("message_id"))
+        except Exception:
+            msg = None
+
+    if msg and state.get("fingerprint") == fingerprint:
+        # Tampilan sama dengan yang terakhir dikirim (mis. restart tanpa perubahan produk)
+        print(f"Embed utama tidak berubah (message {msg.id}), edit dilewati.")
+    elif msg:
+        await msg.edit(embed=embed, view=view)
+        save_main_message(path, channel.id, msg.id, fingerprint)
+        print(f"Embed utama diupdate (reuse message {msg.id}) di channel {channel.id}")
+    else:
+        msg = await channel.send(embed=embed, view=view)
+        save_main_message(path, channel.id, msg.id, fingerprint)
+        print(f"Embed baru dikirim ke channel {channel.id}, message_id {msg.id} disimpan.")
+
+    ctx.storefront_refresher.set_message(msg, fingerprint)
+
+
+@bot.event
+async def on_ready():
+    metrics.inc("gateway_ready_total")
+    if bot.setup_done:
+        # on_ready juga terpanggil tiap reconnect gateway; command & embed utama
+        # sudah disiapkan di proses ini, jadi tidak perlu memakai budget API lagi.
+        print(f"{bot.user} tersambung ulang.")
+        return
+    bot.setup_done = True
+
+    print(f"{bot.user} telah online!")
+    startup_timings["ready"] = time.perf_counter() - PROCESS_STARTED
+    print(startup_report())
+
+    await sync_commands()
+
+    # Toko utama (CHANNEL_ID di .env). Toko guild lain di-load saat pertama dipakai.
+    channel = bot.get_channel(config.CHANNEL_ID)
+    if not isinstance(channel, discord.TextChannel):
+        print("Channel utama tidak ditemukan atau bukan TextChannel.")
+        return
+    if guilds.primary_guild_id is None:
+        guilds.primary_guild_id = channel.guild.id
+    ctx = await guilds.acquire(channel.guild.id)
+    if ctx is not None and ctx.key == DEFAULT_GUILD:
+        await setup_storefront(ctx, channel)
+
+
+@bot.event
+async def on_guild_channel_delete(channel: discord.abc.GuildChannel):
+    # Isi kategori ticket dihitung sendiri (lihat TicketCategoryManager); toko yang tidak
+    # di memory tidak perlu diberi tahu, hitungannya dibangun ulang saat di-load
+    ctx = guilds.loaded(channel.guild.id)
+    if ctx is not None:
+        ctx.ticket_categories.forget(channel)
+
+
+@bot.event
+async def on_app_command_completion(interaction: discord.Interaction, command):
+    observe_command(interaction, "ok")
+
+# ============================================
+# SLASH COMMANDS (ADMIN)
+# ============================================
+async def product_name_autocomplete(
+    interaction: discord.Interaction,
+    current: str
+):
+    """Autocomplete nama produk, dilayani dari store.name_index (tanpa baca disk / scan linear)."""
+    with metrics.timer("autocomplete_seconds"):
+        return [
+            app_commands.Choice(name=pname[:100], value=pname)
+            for pname in store.name_index.search(current, 25)
+        ]
+
+
+@bot.tree.command(name="addproduct", description="Tambah/Update produk (Admin only)")
+@app_commands.describe(
+    name="Nama produk",
+    stock="Stock awal",
+    price="Harga per SC (dalam Rupiah)",
+    category="Kategori produk (opsional, untuk filter di storefront)"
+)
+async def addproduct(interaction: discord.Interaction, name: str, stock: int, price: int, category: Optional[str] = None):
+    if interaction.user.id not in settings.ALLOWED_USER_IDS:
+        return await interaction.response.send_message(
+            "❌ Kamu tidak memiliki izin untuk menggunakan command ini!",
+            ephemeral=True
+        )
+
+    name = name.strip()
+    if not name:
+        return await interaction.response.send_message(
+            "❌ Nama produk tidak boleh kosong.",
+            ephemeral=True
+        )
+
+    if stock < 0 or price <= 0:
+        return await interaction.response.send_message(
+            "❌ Stock tidak boleh negatif dan harga harus lebih dari 0!",
+            ephemeral=True
+        )
+
+    if category is not None:
+        category = category.strip()
+    is_new = store.put_product(name, stock, price, category)
+
+    await interaction.response.send_message(
+        f"✅ Produk **{name}** {'ditambahkan' if is_new else 'diupdate'}.\n"
+        f"Stock: **{stock}**\n"
+        f"Harga: **Rp{rupiah(price)}**",
+        ephemeral=True
+    )
+
+    refresh_main_embed()
+
+
+@bot.tree.command(name="setstock", description="Atur stock produk (Admin only)")
+@app_commands.describe(
+    name="Nama produk",
+    amount="Stock baru"
+)
+async def setstock(interaction: discord.Interaction, name: str, amount: int):
+    if interaction.user.id not in settings.ALLOWED_USER_IDS:
+        return await interaction.response.send_message(
+            "❌ Kamu tidak memiliki izin untuk menggunakan command ini!",
+            ephemeral=True
+        )
+
+    products = store.products
+    if name not in products:
+        return await interaction.response.send_message(
+            f"❌ Produk **{name}** tidak ditemukan. Tambah dulu pakai `/addproduct`.",
+            ephemeral=True
+        )
+
+    store.update_product(name, stock=max(0, amount))
+
+    await interaction.response.send_message(
+        f"✅ Stock produk **{name}** diatur menjadi **{products[name]['stock']}**",
+        ephemeral=True
+    )
+
+    refresh_main_embed()
+
+
+setstock.autocomplete("name")(product_name_autocomplete)
+
+
+@bot.tree.command(name="setharga", description="Atur harga produk (Admin only)")
+@app_commands.describe(
+    name="Nama produk",
+    price="Harga baru per 1 SC (dalam Rupiah)"
+)
+async def setharga(interaction: discord.Interaction, name: str, price: int):
+    if interaction.user.id not in settings.ALLOWED_USER_IDS:
+        return await interaction.response.send_message(
+            "❌ Kamu tidak memiliki izin untuk menggunakan command ini!",
+            ephemeral=True
+        )
+
+    if price <= 0:
+        return await interaction.response.send_message(
+            "❌ Harga harus lebih dari 0!",
+            ephemeral=True
+        )
+
+    products = store.products
+    if name not in products:
+        return await interaction.response.send_message(
+            f"❌ Produk **{name}** tidak ditemukan. Tambah dulu pakai `/addproduct`.",
+            ephemeral=True
+        )
+
+    store.update_product(name, price=price)
+
+    await interaction.response.send_message(
+        f"✅ Harga produk **{name}** diatur menjadi **Rp{rupiah(price)}**",
+        ephemeral=True
+    )
+
+    refresh_main_embed()
+
+
+setharga.autocomplete("name")(product_name_autocomplete)
+
+
+@bot.tree.command(name="hapusproduk", description="Hapus produk (Admin only)")
+@app_commands.describe(
+    name="Nama produk yang akan dihapus"
+)
+async def hapusproduk(interaction: discord.Interaction, name: str):
+    if interaction.user.id not in settings.ALLOWED_USER_IDS:
+        return await interaction.response.send_message(
+            "❌ Kamu tidak memiliki izin untuk menggunakan command ini!",
+            ephemeral=True
+        )
+
+    products = store.products
+    if name not in products:
+        return await interaction.response.send_message(
+            f"❌ Produk **{name}** tidak ditemukan.",
+            ephemeral=True
+        )
+
+    store.delete_product(name)
+
+    await interaction.response.send_message(
+        f"🗑️ Produk **{name}** berhasil dihapus.",
+        ephemeral=True
+    )
+
+    refresh_main_embed()
+
+
+hapusproduk.autocomplete("name")(product_name_autocomplete)
+
+
+@bot.tree.command(name="setttl", description="Atur batas waktu ticket pending sebelum dibatalkan otomatis (Admin only)")
+@app_commands.describe(
+    name="Nama produk",
+    menit="Menit sampai ticket pending kedaluwarsa (0 = tidak pernah, kosongkan = ikut default)"
+)
+async def setttl(interaction: discord.Interaction, name: str, menit: Optional[app_commands.Range[int, 0, 10080]] = None):
+    if interaction.user.id not in settings.ALLOWED_USER_IDS:
+        return await interaction.response.send_message(
+            "❌ Kamu tidak memiliki izin untuk menggunakan command ini!",
+            ephemeral=True
+        )
+
+    if name not in store.products:
+        return await interaction.response.send_message(
+            f"❌ Produk **{name}** tidak ditemukan.",
+            ephemeral=True
+        )
+
+    # Hanya berlaku untuk ticket baru; ticket yang sudah dibuat tetap pakai expires_at-nya
+    store.set_ticket_ttl(name, menit)
+    ttl = store.ticket_ttl(name) // 60
+    if menit is None:
+        detail = f"ikut default (**{ttl} menit**)" if ttl else "ikut default (**tidak pernah kedaluwarsa**)"
+    else:
+        detail = f"**{ttl} menit**" if ttl else "**tidak pernah kedaluwarsa**"
+
+    await interaction.response.send_message(
+        f"✅ Ticket pending **{name}** sekarang {detail}.",
+        ephemeral=True
+    )
+
+
+setttl.autocomplete("name")(product_name_autocomplete)
+
+
+# Diff lebih panjang dari ini dikirim sebagai lampiran .txt, bukan di embed
+BULK_DIFF_INLINE_LINES = 15
+
+
+@bot.tree.command(name="bulkupdate", description="Tambah/Update banyak produk sekaligus dari file CSV / JSON (Admin only)")
+@app_commands.describe(
+    file="File .csv / .json / .jsonl dengan kolom name, stock, price, category (stock '+50' = tambah)",
+    dry_run="Tampilkan perubahannya saja tanpa menyimpan"
+)
+async def bulkupdate(interaction: discord.Interaction, file: discord.Attachment, dry_run: bool = False):
+    if interaction.user.id not in settings.ALLOWED_USER_IDS:
+        return await interaction.response.send_message(
+            "❌ Kamu tidak memiliki izin untuk menggunakan command ini!",
+            ephemeral=True
+        )
+
+    if file.size > config.BULK_UPDATE_MAX_BYTES:
+        return await interaction.response.send_message(
+            f"❌ File terlalu besar (maks {config.BULK_UPDATE_MAX_BYTES // 1024} KB).",
+            ephemeral=True
+        )
+
+    await interaction.response.defer(ephemeral=True, thinking=True)
+    try:
+        data = await file.read()
+    except discord.HTTPException as e:
+        return await interaction.followup.send(f"❌ Gagal download file: {e}", ephemeral=True)
+
+    rows, errors = await asyncio.to_thread(parse_bulk_file, data, file.filename, config.BULK_UPDATE_MAX_ROWS)
+    # Validasi & penerapan tanpa await di antaranya: katalog tidak berubah di tengah jalan,
+    # semua produk disimpan dalam satu flush dan embed utama cukup di-refresh sekali
+    plan = plan_bulk_update(store.products, rows)
+    plan.errors[:0] = errors
+    applied = not plan.errors and not dry_run and bool(plan.changes)
+    if applied:
+        store.apply_bulk(plan.changes)
+        refresh_main_embed()
+
+    if plan.errors:
+        title, color = "❌ Bulk Update Ditolak (tidak ada yang disimpan)", discord.Color.red()
+    elif dry_run:
+        title, color = "🔍 Bulk Update (dry run, belum disimpan)", discord.Color.blurple()
+    else:
+        title, color = "✅ Bulk Update Disimpan", discord.Color.green()
+    embed = discord.Embed(title=title, color=color)
+    embed.add_field(name="Baru", value=str(plan.created), inline=True)
+    embed.add_field(name="Diupdate", value=str(plan.updated), inline=True)
+    embed.add_field(name="Tidak berubah", value=str(plan.unchanged), inline=True)
+
+    report = plan.errors or plan.diff_lines()
+    if not rows and not plan.errors:
+        embed.description = "File tidak berisi baris produk."
+    elif len(report) <= BULK_DIFF_INLINE_LINES:
+        embed.description = "```diff\n" + "\n".join(report)[:3900] + "\n```" if report else "Tidak ada perubahan."
+    else:
+        embed.description = f"{len(report)} {'error' if plan.errors else 'perubahan'}, lihat lampiran."
+
+    kwargs = {}
+    if len(report) > BULK_DIFF_INLINE_LINES:
+        name = "bulkupdate-errors.txt" if plan.errors else "bulkupdate-diff.txt"
+        kwargs["file"] = discord.File(io.BytesIO("\n".join(report).encode()), filename=name)
+    await interaction.followup.send(embed=embed, ephemeral=True, **kwargs)
+
+
+@bot.tree.command(name="stock", description="Lihat stock semua produk")
+async def stock_cmd(interaction: discord.Interaction):
+    products = store.products
+
+    embed = discord.Embed(
+        title="📦 Informasi Stock Produk",
+        color=discord.Color.from_rgb(88, 101, 242)
+    )
+
+    if not products:
+        embed.description = "Belum ada produk terdaftar."
+    else:
+        for name, pdata in products.items():
+            total = int(pdata.get("stock", 0))
+            price = int(pdata.get("price", 0))
+            pending = store.pending_stock(name)
+            available = total - pending
+
+            embed.add_field(
+                name=f"📦 {name}",
+                value=(
+                    f"Total: **{total}**\n"
+                    f"Pending: **{pending}**\n"
+                    f"Tersedia: **{available}**\n"
+                    f"Harga: **Rp{rupiah(price)}** <:duit:1433825063333003275>"
+                ),
+                inline=False
+            )
+
+    await interaction.response.send_message(embed=embed, ephemeral=True)
+
+
+STATUS_LABELS = {
+    "pending": "⏳ Pending",
+    "success": "✅ Sukses",
+    "cancelled": "❌ Batal",
+    "expired": "⌛ Kedaluwarsa",
+}
+
+
+@bot.tree.command(name="riwayat", description="Lihat riwayat transaksi user (Admin only)")
+@app_commands.describe(
+    user="User yang ingin dilihat riwayatnya"
+)
+async def riwayat(interaction: discord.Interaction, user: discord.User):
+    if interaction.user.id not in settings.ALLOWED_USER_IDS:
+        return await interaction.response.send_message(
+            "❌ Kamu tidak memiliki izin untuk menggunakan command ini!",
+            ephemeral=True
+        )
+
+    history = await store.user_history(user.id, 10)
+
+    embed = discord.Embed(
+        title=f"🧾 Riwayat Transaksi {user.display_name}",
+        color=discord.Color.from_rgb(88, 101, 242)
+    )
+    if not history:
+        embed.description = "Belum ada transaksi."
+    else:
+        lines = []
+        for t in history:
+            created = (t.get("created_at") or "-")[:16].replace("T", " ")
+            status = STATUS_LABELS.get(t.get("reason") or t.get("status"), t.get("status") or "-")
+            lines.append(
+                f"`{created}` **{t.get('product', '-')}** × {t.get('amount', 0)} • "
+                f"Rp{rupiah(int(t.get('total_price', 0)))} • {status}"
+            )
+        embed.description = "\n".join(lines)
+
+    await interaction.response.send_message(embed=embed, ephemeral=True)
+
+
+@bot.tree.command(name="laporan", description="Laporan penjualan sukses per produk (Admin only)")
+@app_commands.describe(
+    hari="Jumlah hari ke belakang (default 7)"
+)
+async def laporan(interaction: discord.Interaction, hari: app_commands.Range[int, 1, 3650] = 7):
+    if interaction.user.id not in settings.ALLOWED_USER_IDS:
+        return await interaction.response.send_message(
+            "❌ Kamu tidak memiliki izin untuk menggunakan command ini!",
+            ephemeral=True
+        )
+
+    since = (datetime.now() - timedelta(days=hari)).isoformat()
+    report = await store.sales_report(since)
+
+    embed = discord.Embed(
+        title=f"📊 Laporan Penjualan {hari} Hari Terakhir",
+        color=discord.Color.green()
+    )
+    if not report:
+        embed.description = "Belum ada transaksi sukses di periode ini."
+    else:
+        rows = sorted(report.items(), key=lambda item: item[1]["total"], reverse=True)
+        for product, row in rows[:24]:
+            embed.add_field(
+                name=f"📦 {product}",
+                value=(
+                    f"Transaksi: **{row['count']}**\n"
+                    f"Terjual: **{row['amount']}**\n"
+                    f"Omzet: **Rp{rupiah(row['total'])}**"
+                ),
+                inline=True
+            )
+        embed.set_footer(text=f"Total omzet: Rp{rupiah(sum(row['total'] for row in report.values()))}")
+
+    await interaction.response.send_message(embed=embed, ephemeral=True)
+
+
+@bot.tree.command(name="ticketpool", description="Status pool channel ticket & latency pembuatan ticket (Admin only)")
+async def ticketpool(interaction: discord.Interaction):
+    if interaction.user.id not in settings.ALLOWED_USER_IDS:
+        return await interaction.response.send_message(
+            "❌ Kamu tidak memiliki izin untuk menggunakan command ini!",
+            ephemeral=True
+        )
+
+    embed = discord.Embed(
+        title="🎫 Pool Channel Ticket",
+        color=discord.Color.blurple()
+    )
+    if not ticket_pool.enabled:
+        embed.description = "Pool nonaktif (set `TICKET_POOL_SIZE` > 0 untuk mengaktifkan)."
+    else:
+        embed.add_field(name="Siap", value=f"{len(ticket_pool.channels)}/{ticket_pool.size}", inline=True)
+        embed.add_field(name="Claim", value=str(ticket_pool.claims), inline=True)
+        embed.add_field(name="Pool kosong", value=str(ticket_pool.misses), inline=True)
+    embed.add_field(name="Latency claim pool", value=ticket_pool.claim_latency.summary(), inline=False)
+    embed.add_field(name="Latency create channel", value=ticket_pool.cold_latency.summary(), inline=False)
+    occupancy = [
+        f"{category.name}: **{ticket_categories.occupancy.get(category.id, 0)}**/{ticket_categories.LIMIT}"
+        for category in ticket_categories.categories(interaction.guild)
+    ]
+    embed.add_field(name="Kategori ticket", value="\n".join(occupancy) or "Belum dipakai", inline=False)
+
+    await interaction.response.send_message(embed=embed, ephemeral=True)
+
+
+@bot.tree.command(
+    name="setuptoko", description="Buka toko di server ini (Admin server)", extras={"scope": "global"}
+)
+@app_commands.describe(
+    channel="Channel untuk embed utama toko",
+    kategori_ticket="Kategori tempat channel ticket dibuat (opsional, default TICKETS)",
+    testimoni="Channel log testimoni (opsional)"
+)
+async def setuptoko(
+    interaction: discord.Interaction,
+    channel: discord.TextChannel,
+    kategori_ticket: Optional[discord.CategoryChannel] = None,
+    testimoni: Optional[discord.TextChannel] = None
+):
+    guild = interaction.guild
+    member = interaction.user
+    is_manager = isinstance(member, discord.Member) and member.guild_permissions.manage_guild
+    if guild is None or not (is_manager or member.id in config.ALLOWED_USER_IDS):
+        return await interaction.response.send_message(
+            "❌ Hanya admin server (Manage Server) yang bisa membuka toko di sini!",
+            ephemeral=True
+        )
+
+    if guild.id == guilds.primary_guild_id:
+        return await interaction.response.send_message(
+            "❌ Toko utama diatur lewat `.env` (CHANNEL_ID dkk), bukan lewat command ini.",
+            ephemeral=True
+        )
+
+    await interaction.response.defer(ephemeral=True, thinking=True)
+
+    old = guilds.settings.get(guild.id)
+    admin_ids = list(old.ADMIN_IDS) if old else []
+    if member.id not in admin_ids:
+        admin_ids.append(member.id)
+    guilds.register(GuildSettings.from_dict(guild.id, {
+        "channel_id": channel.id,
+        "ticket_category_id": kategori_ticket.id if kategori_ticket else 0,
+        "testimoni_channel_id": testimoni.id if testimoni else 0,
+        "admin_ids": admin_ids
+    }))
+
+    ctx = await guilds.acquire(guild.id)
+    await setup_storefront(ctx, channel)
+    await interaction.followup.send(
+        f"✅ Toko aktif di {channel.mention}. Tambah produk pakai `/addproduct`.",
+        ephemeral=True
+    )
+
+
+@bot.tree.command(
+    name="metrics", description="Ringkasan metrik performa bot (Admin only)", extras={"scope": "global"}
+)
+async def metrics_command(interaction: discord.Interaction):
+    if interaction.user.id not in config.ALLOWED_USER_IDS:
+        return await interaction.response.send_message(
+            "❌ Kamu tidak memiliki izin untuk menggunakan command ini!",
+            ephemeral=True
+        )
+
+    lines = metrics.summary_lines()
+    body = "\n".join(lines) if lines else "Belum ada data."
+    if len(body) > 3900:
+        body = body[:3900] + "\n..."
+
+    embed = discord.Embed(
+        title="📈 Metrics",
+        description=f"```\n{body}\n```",
+        color=discord.Color.blurple()
+    )
+    if config.METRICS_PORT:
+        embed.set_footer(text=f"Lengkap (format Prometheus): http://{config.METRICS_HOST}:{config.METRICS_PORT}/metrics")
+
+    await interaction.response.send_message(embed=embed, ephemeral=True)
+
+
+@bot.tree.command(
+    name="profiler", description="Nyalakan/matikan profiler sampling & lihat hasilnya (Admin only)",
+    extras={"scope": "global"}
+)
+@app_commands.describe(
+    aksi="start = mulai sampling, stop = berhenti & simpan profile.folded, report = lihat fungsi terpanas"
+)
+async def profiler_command(interaction: discord.Interaction, aksi: Literal["start", "stop", "report"]):
+    if interaction.user.id not in config.ALLOWED_USER_IDS:
+        return await interaction.response.send_message(
+            "❌ Kamu tidak memiliki izin untuk menggunakan command ini!",
+            ephemeral=True
+        )
+
+    if aksi == "start":
+        profiler.start()
+        return await interaction.response.send_message(
+            f"🔬 Profiler berjalan (sampling tiap {profiler.interval * 1000:g}ms).",
+            ephemeral=True
+        )
+
+    if aksi == "stop":
+        profiler.stop()
+        await asyncio.to_thread(profiler.dump, config.PROFILE_FILE)
+
+    top = profiler.top(15)
+    if not top:
+        body = "Belum ada sample."
+    else:
+        body = "\n".join(f"{count * 100 / profiler.samples:5.1f}%  {frame}" for frame, count in top)
+    status = "berjalan" if profiler.running else "berhenti"
+    await interaction.response.send_message(
+        f"🔬 Profiler {status}, {profiler.samples} sample.\n```\n{body[:1800]}\n```",
+        ephemeral=True
+    )
+
+# ============================================
+# RUN BOT
+# ============================================
+def main():
+    """Entry point: `python -m storebot` (atau `python app.py`)."""
+    if not config.TOKEN:
+        print("DISCORD_TOKEN belum di-set di .env")
+        return
+    if config.SHARD_COUNT:
+        bot.shard_count = config.SHARD_COUNT
+    bot.run(config.TOKEN)
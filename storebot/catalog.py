@@ -0,0 +1,245 @@
+import codecs
+import csv
+import json
+
+from .formatting import rupiah
+
+# ============================================
+# BULK UPDATE KATALOG (CSV / JSON)
+# ============================================
+# Nama kolom yang diterima (huruf kecil) -> field produk
+BULK_COLUMNS = {
+    "name": "name", "nama": "name", "produk": "name", "product": "name",
+    "stock": "stock", "stok": "stock",
+    "price": "price", "harga": "price",
+    "category": "category", "kategori": "category",
+}
+
+# Batas panjang label opsi select Discord
+MAX_NAME_LENGTH = 100
+
+
+def _decoded_lines(chunks):
+    """Decode potongan bytes (UTF-8, BOM dibuang) jadi baris teks satu per satu."""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")(errors="strict")
+    pending = ""
+    for chunk in chunks:
+        pending += decoder.decode(chunk)
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            yield line + "\n"
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending
+
+
+def _normalize(raw: dict) -> dict:
+    row = {}
+    for key, value in raw.items():
+        field = BULK_COLUMNS.get(str(key or "").strip().lower())
+        if field is not None and field not in row:
+            row[field] = value
+    return row
+
+
+def iter_bulk_rows(chunks, filename: str = ""):
+    """
+    Parse file bulk update baris per baris. Yield (nomor baris / item, dict
+    field) atau (nomor, pesan error) untuk baris yang rusak.
+
+    Format dari ekstensi (kalau tidak jelas, ditebak dari karakter pertama):
+    - .csv: header wajib (name/nama, stock/stok, price/harga, category/kategori)
+    - .jsonl / .ndjson: satu object per baris
+    - .json: list object, atau object { "nama": {"stock": .., "price": ..} }
+      (format products.json, jadi hasil export bisa langsung di-import lagi)
+    """
+    lines = _decoded_lines(chunks)
+    name = filename.lower()
+    if name.endswith(".csv"):
+        kind = "csv"
+    elif name.endswith((".jsonl", ".ndjson")):
+        kind = "jsonl"
+    elif name.endswith(".json"):
+        kind = "json"
+    else:
+        kind = None
+
+    head = []
+    if kind is None:
+        for line in lines:
+            head.append(line)
+            if line.strip():
+                first = line.lstrip()[0]
+                kind = "json" if first == "[" else "jsonl" if first == "{" else "csv"
+                break
+        if kind is None:
+            return
+
+    def all_lines():
+        yield from head
+        yield from lines
+
+    if kind == "csv":
+        reader = csv.DictReader(all_lines())
+        for raw in reader:
+            if not any((v or "").strip() for v in raw.values() if isinstance(v, str)):
+                continue
+            yield reader.line_num, _normalize(raw)
+    elif kind == "jsonl":
+        for number, line in enumerate(all_lines(), 1):
+            if not line.strip():
+                continue
+            try:
+                raw = json.loads(line)
+            except ValueError as e:
+                yield number, f"JSON tidak valid ({e.msg})"
+                continue
+            yield number, _normalize(raw) if isinstance(raw, dict) else "harus berupa object"
+    else:
+        try:
+            data = json.loads("".join(all_lines()))
+        except ValueError as e:
+            yield getattr(e, "lineno", 0), f"JSON tidak valid ({getattr(e, 'msg', e)})"
+            return
+        if isinstance(data, dict):
+            data = [dict(value, name=key) if isinstance(value, dict) else None for key, value in data.items()]
+        if not isinstance(data, list):
+            yield 0, "isi file harus list object atau object per nama produk"
+            return
+        for number, raw in enumerate(data, 1):
+            yield number, _normalize(raw) if isinstance(raw, dict) else "harus berupa object"
+
+
+def parse_bulk_file(data: bytes, filename: str = "", max_rows: int = 0, chunk_size: int = 64 * 1024):
+    """
+    Parse seluruh file jadi (rows, errors). rows: [(nomor, dict)], errors:
+    ["baris N: ..."]. Tidak butuh event loop, jadi boleh jalan di thread.
+    """
+    chunks = (data[i:i + chunk_size] for i in range(0, len(data), chunk_size))
+    rows, errors = [], []
+    try:
+        for number, row in iter_bulk_rows(chunks, filename):
+            if isinstance(row, str):
+                errors.append(f"baris {number}: {row}")
+                continue
+            rows.append((number, row))
+            if max_rows and len(rows) > max_rows:
+                return rows, [f"maksimal {max_rows} baris per file"]
+    except UnicodeDecodeError:
+        return [], ["file harus UTF-8"]
+    except csv.Error as e:
+        return [], [f"CSV tidak valid: {e}"]
+    return rows, errors
+
+
+def _parse_int(value, field: str, signed: bool = False, rupiah_format: bool = False):
+    """
+    (angka, relatif?) dari isi kolom. '+5' / '-5' = relatif kalau `signed`.
+    Dengan `rupiah_format`, '15.000' / 'Rp15.000' dibaca 15000.
+    """
+    if isinstance(value, bool):
+        raise ValueError(f"{field} harus angka")
+    if isinstance(value, int):
+        return value, False
+    if isinstance(value, float):
+        if value.is_integer():
+            return int(value), False
+        raise ValueError(f"{field} harus angka bulat (isi: {value})")
+    text = str(value).strip()
+    relative = signed and text[:1] in "+-"
+    if rupiah_format:
+        text = text.replace("Rp", "").replace("rp", "").replace(".", "")
+    try:
+        return int(text.replace("_", "").replace(" ", "")), relative
+    except ValueError:
+        raise ValueError(f"{field} harus angka bulat (isi: {str(value).strip()[:20]!r})") from None
+
+
+class BulkPlan:
+    """
+    Hasil validasi file bulk update terhadap katalog saat ini. `changes`:
+    [(nama, data lama / None, data baru)] hanya untuk produk yang benar-benar
+    berubah. Kalau `errors` tidak kosong, tidak ada yang boleh diterapkan.
+    """
+
+    def __init__(self):
+        self.changes: list = []
+        self.errors: list = []
+        self.unchanged = 0
+
+    @property
+    def created(self) -> int:
+        return sum(1 for _, old, _ in self.changes if old is None)
+
+    @property
+    def updated(self) -> int:
+        return len(self.changes) - self.created
+
+    def diff_lines(self) -> list:
+        lines = []
+        for name, old, new in self.changes:
+            if old is None:
+                category = f", kategori {new['category']}" if new.get("category") else ""
+                lines.append(f"+ {name}: stock {new['stock']}, harga Rp{rupiah(new['price'])}{category}")
+                continue
+            parts = []
+            if old.get("stock") != new["stock"]:
+                parts.append(f"stock {old.get('stock')} -> {new['stock']}")
+            if old.get("price") != new["price"]:
+                parts.append(f"harga Rp{rupiah(int(old.get('price', 0)))} -> Rp{rupiah(new['price'])}")
+            if old.get("category") != new.get("category"):
+                parts.append(f"kategori {old.get('category') or '-'} -> {new.get('category') or '-'}")
+            lines.append(f"~ {name}: " + ", ".join(parts))
+        return lines
+
+
+def plan_bulk_update(products: dict, rows: list) -> BulkPlan:
+    """
+    Validasi semua baris terhadap `products` (tidak diubah). Stock boleh
+    relatif ('+50' restock, '-3'); kolom kosong = nilai lama dipertahankan.
+    Produk baru wajib punya stock & harga.
+    """
+    plan = BulkPlan()
+    seen = {}
+    for number, row in rows:
+        name = str(row.get("name") or "").strip()
+        try:
+            if not name:
+                raise ValueError("nama produk kosong")
+            if len(name) > MAX_NAME_LENGTH:
+                raise ValueError(f"nama produk maks {MAX_NAME_LENGTH} karakter")
+            if name in seen:
+                raise ValueError(f"produk {name} sudah ada di baris {seen[name]}")
+            seen[name] = number
+
+            old = products.get(name)
+            stock_raw, price_raw = row.get("stock"), row.get("price")
+            category = str(row.get("category") or "").strip() or None
+            if old is None and (stock_raw in (None, "") or price_raw in (None, "")):
+                raise ValueError(f"produk baru {name} wajib diisi stock & harga")
+
+            stock = int(old.get("stock", 0)) if old is not None else 0
+            if stock_raw not in (None, ""):
+                value, relative = _parse_int(stock_raw, "stock", signed=True)
+                stock = stock + value if relative else value
+            if stock < 0:
+                raise ValueError(f"stock {name} jadi negatif ({stock})")
+
+            price = int(old.get("price", 0)) if old is not None else 0
+            if price_raw not in (None, ""):
+                price, _ = _parse_int(price_raw, "harga", rupiah_format=True)
+            if price <= 0:
+                raise ValueError("harga harus lebih dari 0")
+        except ValueError as e:
+            plan.errors.append(f"baris {number}: {e}")
+            continue
+
+        new = {"stock": stock, "price": price}
+        category = category if category is not None else (old or {}).get("category")
+        if category:
+            new["category"] = category
+        if old is not None and all(old.get(k) == new.get(k) for k in ("stock", "price", "category")):
+            plan.unchanged += 1
+            continue
+        plan.changes.append((name, old, new))
+    return plan
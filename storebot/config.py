@@ -0,0 +1,114 @@
+import os
+
+from dotenv import load_dotenv
+
+from .lazy import LazyObject
+
+# Emoji
+SOLD_EMOJI = "<:sold:1442214201274794097>"
+
+
+class Config:
+    """
+    Semua setting bot. Dibaca dari environment (dan .env) sekali, saat
+    pertama kali dipakai lewat `config`, bukan saat package di-import.
+    """
+
+    def __init__(self, env=None):
+        env = os.environ if env is None else env
+
+        self.TOKEN = env.get("DISCORD_TOKEN", "").strip()
+        self.CHANNEL_ID = int(env.get("CHANNEL_ID", "0"))
+        self.TICKET_CATEGORY_ID = int(env.get("TICKET_CATEGORY_ID", "0"))
+        self.ALLOWED_USER_IDS = [int(uid) for uid in env.get("ALLOWED_USER_IDS", "").split(",") if uid.strip()]
+        self.TESTIMONI_CHANNEL_ID = int(env.get("TESTIMONI_CHANNEL_ID", "0"))
+        # Guild toko utama (pemilik CHANNEL_ID & file data di working dir). 0 = dicari dari CHANNEL_ID saat ready
+        self.GUILD_ID = int(env.get("GUILD_ID", "0"))
+
+        # ---------- file ----------
+        self.PRODUCTS_FILE = "products.json"       # { "Product Name": { "stock": int, "price": int } }
+        self.MAIN_MESSAGE_FILE = "main_message.json"
+        self.TRANSACTIONS_FILE = "transactions.json"        # snapshot hasil compaction
+        self.TRANSACTIONS_JOURNAL_FILE = "transactions.journal"  # JSON-lines, append-only
+        self.SQLITE_FILE = "store.db"
+        self.SCHEDULED_JOBS_FILE = "scheduled_jobs.json"
+        self.TESTIMONI_QUEUE_FILE = "testimoni_queue.json"
+        self.PROFILE_FILE = "profile.folded"
+        self.COMMAND_SYNC_FILE = "command_sync.json"  # fingerprint command tree yang terakhir di-sync
+        self.ARCHIVE_DIR = "archive"               # transactions-YYYY-MM.jsonl.gz
+        self.GUILDS_FILE = "guilds.json"           # setting toko lain: { "<guild_id>": {...} } (lihat /setuptoko)
+        self.GUILDS_DIR = "guilds"                 # data toko lain: guilds/<guild_id>/products.json, ...
+
+        # Paksa sync slash command walau fingerprint command tree tidak berubah
+        self.FORCE_COMMAND_SYNC = env.get("FORCE_COMMAND_SYNC", "0") == "1"
+
+        # "json" (default, cocok untuk toko kecil) atau "sqlite"
+        self.STORAGE_BACKEND = env.get("STORAGE_BACKEND", "json").strip().lower()
+
+        # Write-behind: data di-flush ke disk tiap N detik, atau lebih cepat kalau perubahan sudah numpuk
+        self.STORE_FLUSH_INTERVAL = float(env.get("STORE_FLUSH_INTERVAL", "2"))
+        self.STORE_DIRTY_THRESHOLD = int(env.get("STORE_DIRTY_THRESHOLD", "25"))
+        # Journal transaksi di-compact ke snapshot setelah sekian event
+        self.JOURNAL_COMPACT_EVERY = int(env.get("JOURNAL_COMPACT_EVERY", "500"))
+        # Transaksi success / cancelled yang lebih tua dari N hari dipindah ke arsip (0 = tidak diarsip),
+        # dicek tiap ARCHIVE_INTERVAL detik
+        self.TRANSACTION_RETENTION_DAYS = int(env.get("TRANSACTION_RETENTION_DAYS", "30"))
+        self.ARCHIVE_INTERVAL = float(env.get("ARCHIVE_INTERVAL", "3600"))
+        # Perubahan produk dalam jendela ini digabung jadi satu edit embed utama
+        self.STOREFRONT_REFRESH_WINDOW = float(env.get("STOREFRONT_REFRESH_WINDOW", "3"))
+        # Ticket pending dibatalkan otomatis (stock dilepas) setelah sekian menit (0 = tidak pernah,
+        # default: opt-in). Bisa diatur per produk lewat /setttl
+        self.TICKET_TTL_MINUTES = int(env.get("TICKET_TTL_MINUTES", "0"))
+        # Maks ticket pending per user (0 = tanpa batas); submit ulang diarahkan ke ticket yang sudah ada
+        self.MAX_OPEN_TICKETS = int(env.get("MAX_OPEN_TICKETS", "1"))
+        # Maks PURCHASE_RATE_LIMIT ticket baru per user tiap PURCHASE_RATE_WINDOW detik (0 = tanpa batas)
+        self.PURCHASE_RATE_LIMIT = int(env.get("PURCHASE_RATE_LIMIT", "3"))
+        self.PURCHASE_RATE_WINDOW = float(env.get("PURCHASE_RATE_WINDOW", "60"))
+        # Kategori overflow ticket (TICKETS-2, ...) yang kosong dihapus setelah sekian detik
+        self.TICKET_CATEGORY_RECLAIM_DELAY = float(env.get("TICKET_CATEGORY_RECLAIM_DELAY", "300"))
+        # Ticket dihapus sekian detik setelah Success / Cancel
+        self.TICKET_CLOSE_DELAY = int(env.get("TICKET_CLOSE_DELAY", "10"))
+        # Batas hapus channel per detik saat banyak ticket ditutup bersamaan
+        self.CHANNEL_DELETE_PER_SECOND = int(env.get("CHANNEL_DELETE_PER_SECOND", "5"))
+        # Budget REST per bucket antrian keluar: {prefix bucket: (jumlah aksi, per detik)}.
+        # Mengikuti rate limit Discord: kirim/edit message 5 per 5 detik per channel,
+        # rename channel 2 per 10 menit per channel.
+        self.OUTBOUND_BUDGETS = {
+            "message": (5, 5.0),
+            "channel_create": (5, 10.0),
+            "channel_edit": (2, 600.0),
+            "channel_delete": (5, 5.0),
+            "default": (10, 1.0)
+        }
+        # Endpoint Prometheus lokal (0 = nonaktif) & profiler sampling saat start (opt-in)
+        self.METRICS_HOST = env.get("METRICS_HOST", "127.0.0.1")
+        self.METRICS_PORT = int(env.get("METRICS_PORT", "0"))
+        self.PROFILER_ENABLED = env.get("PROFILER_ENABLED", "0") == "1"
+        self.PROFILER_INTERVAL = float(env.get("PROFILER_INTERVAL", "0.005"))
+        # Jumlah aksi REST yang boleh jalan bersamaan
+        self.OUTBOUND_CONCURRENCY = int(env.get("OUTBOUND_CONCURRENCY", "8"))
+        # Jendela (detik) pengumpulan testimoni sebelum dikirim sekaligus (maks 10 embed per message)
+        self.TESTIMONI_BATCH_WINDOW = float(env.get("TESTIMONI_BATCH_WINDOW", "5"))
+        # Jumlah channel ticket yang disiapkan duluan (0 = nonaktif) & jeda antar create saat isi ulang
+        self.TICKET_POOL_SIZE = int(env.get("TICKET_POOL_SIZE", "0"))
+        self.TICKET_POOL_REFILL_INTERVAL = float(env.get("TICKET_POOL_REFILL_INTERVAL", "5"))
+        # Data toko (store, storefront, pool, testimoni) di-load saat guild pertama kali dipakai.
+        # Maks GUILD_CACHE_SIZE toko di memory (LRU); toko yang idle GUILD_IDLE_TIMEOUT detik dilepas
+        self.GUILD_CACHE_SIZE = max(1, int(env.get("GUILD_CACHE_SIZE", "50")))
+        self.GUILD_IDLE_TIMEOUT = float(env.get("GUILD_IDLE_TIMEOUT", "1800"))
+        # Jumlah shard gateway (0 = sesuai rekomendasi Discord)
+        self.SHARD_COUNT = int(env.get("SHARD_COUNT", "0"))
+        # Batas file /bulkupdate (byte & jumlah baris produk)
+        self.BULK_UPDATE_MAX_BYTES = int(env.get("BULK_UPDATE_MAX_BYTES", str(1024 * 1024)))
+        self.BULK_UPDATE_MAX_ROWS = int(env.get("BULK_UPDATE_MAX_ROWS", "5000"))
+        # Jumlah produk per halaman storefront (maks 25, batas opsi select Discord). Halaman dengan
+        # nama produk panjang bisa berisi lebih sedikit supaya embed tetap di bawah 4096 karakter
+        self.STOREFRONT_PAGE_SIZE = max(1, min(25, int(env.get("STOREFRONT_PAGE_SIZE", "10"))))
+
+    @classmethod
+    def from_env(cls) -> "Config":
+        load_dotenv()
+        return cls(os.environ)
+
+
+config = LazyObject(Config.from_env, "config")
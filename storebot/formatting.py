@@ -0,0 +1,6 @@
+# ============================================
+# HELPER FORMAT
+# ============================================
+def rupiah(n: int) -> str:
+    """Format angka ke Rp style: 5000 -> '5.000'."""
+    return f"{n:,}".replace(",", ".")
@@ -0,0 +1,499 @@
+import asyncio
+import collections
+import contextlib
+import contextvars
+import functools
+import json
+import os
+import time
+
+import discord
+
+from .config import config
+from .lazy import LazyObject
+from .metrics import metrics
+from .storage import write_json_atomic
+from .store import create_store
+from .storefront import StorefrontPages, StorefrontRefresher
+from .tickets import TicketCategoryManager, TicketChannelPool, TicketExpiry, create_testimoni_publisher
+
+# Key toko utama: setting dari .env, file data di working dir (mode satu guild)
+DEFAULT_GUILD = 0
+# Toko yang baru saja dipakai tidak dilepas walau cache penuh
+MIN_IDLE_BEFORE_EVICT = 60.0
+EVICT_CHECK_INTERVAL = 60.0
+
+
+# ============================================
+# SETTING & STATE PER TOKO (GUILD)
+# ============================================
+class GuildSettings:
+    """
+    Setting satu toko. Toko utama memakai Config (CHANNEL_ID dst, file data
+    di working dir); toko lain terdaftar di GUILDS_FILE lewat /setuptoko dan
+    datanya di GUILDS_DIR/<guild_id>/ dengan nama file yang sama.
+    """
+
+    def __init__(self, guild_id, channel_id: int = 0, ticket_category_id: int = 0,
+                 testimoni_channel_id: int = 0, admin_ids=(), data_dir: str = ""):
+        self.GUILD_ID = guild_id
+        self.CHANNEL_ID = channel_id
+        self.TICKET_CATEGORY_ID = ticket_category_id
+        self.TESTIMONI_CHANNEL_ID = testimoni_channel_id
+        self.ADMIN_IDS = list(admin_ids)
+        self.DATA_DIR = data_dir
+
+        def path(name: str) -> str:
+            return os.path.join(data_dir, os.path.basename(name))
+
+        self.PRODUCTS_FILE = path(config.PRODUCTS_FILE)
+        self.MAIN_MESSAGE_FILE = path(config.MAIN_MESSAGE_FILE)
+        self.TRANSACTIONS_FILE = path(config.TRANSACTIONS_FILE)
+        self.TRANSACTIONS_JOURNAL_FILE = path(config.TRANSACTIONS_JOURNAL_FILE)
+        self.SQLITE_FILE = path(config.SQLITE_FILE)
+        self.TESTIMONI_QUEUE_FILE = path(config.TESTIMONI_QUEUE_FILE)
+        self.ARCHIVE_DIR = path(config.ARCHIVE_DIR)
+
+    @property
+    def ALLOWED_USER_IDS(self) -> list:
+        # Admin global (ALLOWED_USER_IDS di .env) selalu boleh mengelola semua toko
+        return config.ALLOWED_USER_IDS + self.ADMIN_IDS
+
+    @classmethod
+    def primary(cls) -> "GuildSettings":
+        return cls(config.GUILD_ID or None, config.CHANNEL_ID, config.TICKET_CATEGORY_ID, config.TESTIMONI_CHANNEL_ID)
+
+    @classmethod
+    def from_dict(cls, guild_id: int, data: dict) -> "GuildSettings":
+        return cls(
+            guild_id,
+            int(data.get("channel_id", 0)),
+            int(data.get("ticket_category_id", 0)),
+            int(data.get("testimoni_channel_id", 0)),
+            [int(uid) for uid in data.get("admin_ids", [])],
+            os.path.join(config.GUILDS_DIR, str(guild_id))
+        )
+
+    def to_dict(self) -> dict:
+        return {
+            "channel_id": self.CHANNEL_ID,
+            "ticket_category_id": self.TICKET_CATEGORY_ID,
+            "testimoni_channel_id": self.TESTIMONI_CHANNEL_ID,
+            "admin_ids": self.ADMIN_IDS
+        }
+
+
+class GuildContext:
+    """
+    Semua state satu toko: DataStore, storefront (halaman + refresher),
+    kategori & pool channel ticket, expiry ticket pending & antrian testimoni. Dibuat GuildRegistry saat guild itu
+    pertama kali dipakai, ditutup (flush ke disk) saat dilepas dari cache.
+    """
+
+    def __init__(self, key: int, settings: GuildSettings):
+        self.key = key
+        self.settings = settings
+        self.store = None
+        self.storefront_pages = None
+        self.storefront_refresher = None
+        self.ticket_categories = None
+        self.ticket_pool = None
+        self.ticket_expiry = None
+        self.testimoni_publisher = None
+        self.started = False
+        self.last_used = time.monotonic()
+
+    def load(self):
+        """Baca data toko dari disk. Tidak menyentuh event loop, jadi boleh jalan di thread."""
+        if self.settings.DATA_DIR:
+            os.makedirs(self.settings.DATA_DIR, exist_ok=True)
+        self.store = create_store(self.settings)
+        self.storefront_pages = StorefrontPages(self.store, config.STOREFRONT_PAGE_SIZE)
+        self.storefront_refresher = StorefrontRefresher(
+            self.storefront_pages, self.settings.MAIN_MESSAGE_FILE, config.STOREFRONT_REFRESH_WINDOW
+        )
+        self.ticket_categories = TicketCategoryManager(self.settings.TICKET_CATEGORY_ID, config.TICKET_CATEGORY_RECLAIM_DELAY)
+        self.ticket_pool = TicketChannelPool(
+            config.TICKET_POOL_SIZE, config.TICKET_POOL_REFILL_INTERVAL, self.ticket_categories
+        )
+        self.ticket_expiry = TicketExpiry(self.store, self.storefront_refresher, config.TICKET_CLOSE_DELAY)
+        self.testimoni_publisher = create_testimoni_publisher(self.settings)
+
+    def apply_settings(self, settings: GuildSettings):
+        """Pakai setting baru (mis. /setuptoko ulang) tanpa load ulang data."""
+        self.settings = settings
+        if self.ticket_categories.category_id != settings.TICKET_CATEGORY_ID:
+            self.ticket_categories.reset(settings.TICKET_CATEGORY_ID)
+        self.testimoni_publisher.set_channel(settings.TESTIMONI_CHANNEL_ID)
+
+    def guild(self, client: discord.Client):
+        if self.settings.GUILD_ID:
+            return client.get_guild(self.settings.GUILD_ID)
+        channel = client.get_channel(self.settings.CHANNEL_ID)
+        return getattr(channel, "guild", None)
+
+    def start(self, client: discord.Client):
+        """Jalankan background task toko (flush store, refresh storefront, expiry, pool, testimoni)."""
+        if self.started:
+            return
+        self.started = True
+        self.store.start()
+        self.storefront_refresher.start(client)
+        self.ticket_expiry.start(client)
+        self.testimoni_publisher.start(client)
+        guild = self.guild(client)
+        if guild is not None:
+            self.ticket_pool.start(guild)
+
+    def touch(self):
+        self.last_used = time.monotonic()
+
+    @property
+    def idle_seconds(self) -> float:
+        return time.monotonic() - self.last_used
+
+    @property
+    def busy(self) -> bool:
+        """
+        Masih ada kerja yang belum selesai (stock ditahan pembelian, ticket
+        pending yang menunggu kedaluwarsa, testimoni antre). Testimoni yang
+        diparkir tidak dihitung: tersimpan di file dan ikut ter-load lagi.
+        """
+        return (
+            bool(self.store.holds)
+            or self.store.next_expiry() is not None
+            or bool(self.testimoni_publisher.entries)
+        )
+
+    async def close(self):
+        for component in (self.testimoni_publisher, self.ticket_pool, self.ticket_expiry, self.storefront_refresher, self.store):
+            await component.close()
+
+# ============================================
+# REGISTRY TOKO (LAZY LOAD + LRU)
+# ============================================
+# Metrik komponen per toko, dijumlah untuk semua toko yang sedang di memory:
+# (nama, jenis, fungsi(ctx) -> angka / list (labels, angka), keterangan)
+GUILD_METRICS = (
+    ("products", "gauge", lambda ctx: len(ctx.store.products), "Jumlah produk di katalog"),
+    ("pending_stock", "gauge", lambda ctx: sum(ctx.store.pending.values()), "Total stock yang tertahan transaksi pending"),
+    (
+        "name_index_cache_total", "counter",
+        lambda ctx: [
+            ({"result": "hit"}, ctx.store.name_index.cache_hits),
+            ({"result": "miss"}, ctx.store.name_index.cache_misses)
+        ],
+        "Lookup cache autocomplete nama produk"
+    ),
+    ("transactions_active", "gauge", lambda ctx: len(ctx.store.transactions), "Transaksi di working set (belum diarsip)"),
+    ("transactions_archived_total", "counter", lambda ctx: ctx.store.archived, None),
+    (
+        "storefront_page_cache_total", "counter",
+        lambda ctx: [({"result": "hit"}, ctx.storefront_pages.hits), ({"result": "build"}, ctx.storefront_pages.builds)],
+        "Render halaman storefront dari cache vs build ulang"
+    ),
+    ("storefront_edits_saved_total", "counter", lambda ctx: ctx.storefront_pages.edits_saved, None),
+    (
+        "storefront_refresh_total", "counter",
+        lambda ctx: [
+            ({"result": "edited"}, ctx.storefront_refresher.edits),
+            ({"result": "skipped"}, ctx.storefront_refresher.skipped)
+        ],
+        None
+    ),
+    ("ticket_categories", "gauge", lambda ctx: len(ctx.ticket_categories.category_ids), "Kategori ticket (utama + overflow)"),
+    (
+        "ticket_category_channels", "gauge",
+        lambda ctx: sum(ctx.ticket_categories.occupancy.values()),
+        "Channel di kategori ticket (maks 50 per kategori)"
+    ),
+    ("ticket_pool_ready", "gauge", lambda ctx: len(ctx.ticket_pool.channels), "Channel pool siap di-claim"),
+    (
+        "ticket_pool_claims_total", "counter",
+        lambda ctx: [({"result": "claimed"}, ctx.ticket_pool.claims), ({"result": "empty"}, ctx.ticket_pool.misses)],
+        None
+    ),
+    ("testimoni_queue", "gauge", lambda ctx: len(ctx.testimoni_publisher.entries), "Testimoni yang belum terkirim"),
+    (
+        "testimoni_parked", "gauge", lambda ctx: len(ctx.testimoni_publisher.parked),
+        "Testimoni yang diparkir karena channel testimoni tidak ditemukan"
+    ),
+    (
+        "testimoni_sent_total", "counter",
+        lambda ctx: [
+            ({"unit": "message"}, ctx.testimoni_publisher.sent_messages),
+            ({"unit": "entry"}, ctx.testimoni_publisher.sent_entries)
+        ],
+        None
+    ),
+)
+
+
+def _series(value) -> list:
+    return [({}, value)] if isinstance(value, (int, float)) else value
+
+
+class GuildRegistry:
+    """
+    Peta guild -> GuildContext. Data toko di-load (di thread) saat guild itu
+    pertama kali dipakai, disimpan berurutan LRU, dan dilepas kalau idle lebih
+    dari `idle_timeout` detik atau jumlah toko di memory melebihi `capacity`.
+    Toko utama (DEFAULT_GUILD) tidak pernah dilepas. Memory & waktu startup
+    mengikuti jumlah toko yang aktif, bukan jumlah guild.
+    """
+
+    def __init__(self, path: str, capacity: int, idle_timeout: float):
+        self.path = path
+        self.capacity = capacity
+        self.idle_timeout = idle_timeout
+        self.settings: dict = {}
+        self.primary_guild_id = config.GUILD_ID or None
+        self.contexts = collections.OrderedDict()
+        self.loads = 0
+        self.evictions = 0
+        # Nilai counter dari toko yang sudah dilepas, supaya metrik agregat tidak turun
+        self.retired: dict = {}
+        self._client = None
+        self._loading: dict = {}
+        self._closing: dict = {}
+        self._task = None
+
+    # ---------- setting ----------
+    def load_settings(self):
+        try:
+            with open(self.path, "r") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            data = {}
+        except Exception as e:
+            print(f"[GuildRegistry] Gagal baca {self.path}: {e}")
+            data = {}
+        if isinstance(data, dict):
+            self.settings = {int(gid): GuildSettings.from_dict(int(gid), entry) for gid, entry in data.items()}
+
+    def register(self, settings: GuildSettings):
+        """Daftarkan / update toko di guild lain. Toko yang sedang di memory langsung memakai setting baru."""
+        self.settings[settings.GUILD_ID] = settings
+        payload = {str(gid): s.to_dict() for gid, s in self.settings.items()}
+        write_json_atomic(self.path, json.dumps(payload, indent=4))
+        ctx = self.contexts.get(settings.GUILD_ID)
+        if ctx is not None:
+            ctx.apply_settings(settings)
+
+    def key_for(self, guild_id):
+        """Key GuildContext untuk guild ini, atau None kalau guild ini belum punya toko."""
+        if guild_id in self.settings:
+            return guild_id
+        if self.primary_guild_id is not None:
+            return DEFAULT_GUILD if guild_id == self.primary_guild_id else None
+        # Guild utama belum diketahui (belum ready / tanpa CHANNEL_ID): mode satu guild
+        # selama belum ada toko lain yang terdaftar
+        return DEFAULT_GUILD if not self.settings else None
+
+    def loaded(self, guild_id):
+        """GuildContext guild ini kalau sedang di memory (tanpa load), atau None."""
+        key = self.key_for(guild_id)
+        return self.contexts.get(key) if key is not None else None
+
+    # ---------- load ----------
+    def _create(self, key: int) -> GuildContext:
+        ctx = GuildContext(key, GuildSettings.primary() if key == DEFAULT_GUILD else self.settings[key])
+        with metrics.timer("guild_load_seconds"):
+            ctx.load()
+        return ctx
+
+    def _insert(self, ctx: GuildContext):
+        self.contexts[ctx.key] = ctx
+        self.loads += 1
+        if self._client is not None:
+            ctx.start(self._client)
+
+    def default(self) -> GuildContext:
+        """Toko utama, di-load sinkron kalau belum. Dipakai di luar interaction (startup, script, bench)."""
+        ctx = self.contexts.get(DEFAULT_GUILD)
+        if ctx is None:
+            ctx = self._create(DEFAULT_GUILD)
+            self._insert(ctx)
+        ctx.touch()
+        return ctx
+
+    async def acquire(self, guild_id):
+        """GuildContext untuk guild ini (di-load kalau belum), atau None kalau guild belum punya toko."""
+        key = self.key_for(guild_id)
+        if key is None:
+            return None
+
+        ctx = self.contexts.get(key)
+        if ctx is None:
+            closing = self._closing.get(key)
+            if closing is not None:
+                # Toko ini sedang dilepas: tunggu flush-nya selesai sebelum dibaca ulang dari disk
+                await asyncio.gather(asyncio.shield(closing), return_exceptions=True)
+
+            loading = self._loading.get(key)
+            if loading is None:
+                loading = self._loading[key] = asyncio.ensure_future(asyncio.to_thread(self._create, key))
+            try:
+                created = await asyncio.shield(loading)
+            finally:
+                self._loading.pop(key, None)
+
+            ctx = self.contexts.get(key)
+            if ctx is None:
+                ctx = created
+                self._insert(ctx)
+            elif ctx is not created:
+                # Sudah di-load lewat default() selagi thread ini jalan
+                created.store.backend.close()
+
+        self.contexts.move_to_end(key)
+        ctx.touch()
+        return ctx
+
+    # ---------- evict ----------
+    def _retire(self, ctx: GuildContext):
+        for name, kind, func, _ in GUILD_METRICS:
+            if kind != "counter":
+                continue
+            retired = self.retired.setdefault(name, {})
+            for labels, value in _series(func(ctx)):
+                key = tuple(sorted(labels.items()))
+                retired[key] = retired.get(key, 0) + value
+
+    async def evict(self, key: int):
+        ctx = self.contexts.pop(key, None)
+        if ctx is None:
+            return
+        self._retire(ctx)
+        closing = self._closing[key] = asyncio.ensure_future(ctx.close())
+        try:
+            await closing
+        finally:
+            self._closing.pop(key, None)
+        self.evictions += 1
+
+    async def evict_idle(self) -> int:
+        """Lepas toko yang idle terlalu lama, atau yang paling lama tidak dipakai kalau cache penuh."""
+        over = len(self.contexts) - self.capacity
+        evicted = 0
+        for key, ctx in list(self.contexts.items()):
+            if key == DEFAULT_GUILD or ctx.busy:
+                continue
+            idle = ctx.idle_seconds
+            if idle >= self.idle_timeout or (over > 0 and idle >= MIN_IDLE_BEFORE_EVICT):
+                await self.evict(key)
+                over -= 1
+                evicted += 1
+        return evicted
+
+    async def _evict_loop(self):
+        while True:
+            await asyncio.sleep(EVICT_CHECK_INTERVAL)
+            try:
+                evicted = await self.evict_idle()
+            except Exception as e:
+                print(f"[GuildRegistry] Error evict: {e}")
+                continue
+            if evicted:
+                print(f"[GuildRegistry] {evicted} toko dilepas dari memory, {len(self.contexts)} toko aktif")
+
+    # ---------- lifecycle ----------
+    def start(self, client: discord.Client):
+        self._client = client
+        for ctx in self.contexts.values():
+            ctx.start(client)
+        if self._task is not None and not self._task.done():
+            return
+        self._task = asyncio.create_task(self._evict_loop())
+
+    async def close(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for key in list(self.contexts):
+            ctx = self.contexts.pop(key)
+            await ctx.close()
+
+    def collect(self, name: str, kind: str, func) -> list:
+        totals = dict(self.retired.get(name, {})) if kind == "counter" else {}
+        for ctx in self.contexts.values():
+            for labels, value in _series(func(ctx)):
+                key = tuple(sorted(labels.items()))
+                totals[key] = totals.get(key, 0) + value
+        return [(dict(key), value) for key, value in totals.items()]
+
+
+def create_guild_registry() -> GuildRegistry:
+    registry = GuildRegistry(config.GUILDS_FILE, config.GUILD_CACHE_SIZE, config.GUILD_IDLE_TIMEOUT)
+    registry.load_settings()
+    for name, kind, func, help_text in GUILD_METRICS:
+        metrics.collector(name, kind, functools.partial(registry.collect, name, kind, func), help_text)
+    metrics.collector("guilds_loaded", "gauge", lambda: len(registry.contexts), "Toko yang sedang di memory")
+    metrics.collector(
+        "guild_loads_total", "counter",
+        lambda: [({"result": "load"}, registry.loads), ({"result": "evict"}, registry.evictions)]
+    )
+    return registry
+
+
+guilds = LazyObject(create_guild_registry, "guilds")
+
+# ============================================
+# TOKO AKTIF (PER INTERACTION)
+# ============================================
+current_guild = contextvars.ContextVar("current_guild", default=None)
+
+
+def current_context() -> GuildContext:
+    """Toko yang sedang melayani interaction ini; di luar interaction: toko utama."""
+    ctx = current_guild.get()
+    return ctx if ctx is not None else guilds.default()
+
+
+@contextlib.contextmanager
+def guild_scope(ctx: GuildContext):
+    token = current_guild.set(ctx)
+    try:
+        yield ctx
+    finally:
+        current_guild.reset(token)
+
+
+class GuildLocal:
+    """
+    Proxy ke komponen milik toko aktif (lihat guild_scope). Handler tetap
+    menulis `store.products`, `ticket_pool.claim(...)`, dst; yang dipakai
+    otomatis data guild tempat interaction itu terjadi.
+    """
+
+    __slots__ = ("_attr",)
+
+    def __init__(self, attr: str):
+        object.__setattr__(self, "_attr", attr)
+
+    def __getattr__(self, name):
+        return getattr(getattr(current_context(), self._attr), name)
+
+    def __setattr__(self, name, value):
+        setattr(getattr(current_context(), self._attr), name, value)
+
+    def __repr__(self) -> str:
+        return f"<GuildLocal {self._attr}>"
+
+
+settings = GuildLocal("settings")
+store = GuildLocal("store")
+storefront_pages = GuildLocal("storefront_pages")
+storefront_refresher = GuildLocal("storefront_refresher")
+ticket_categories = GuildLocal("ticket_categories")
+ticket_pool = GuildLocal("ticket_pool")
+testimoni_publisher = GuildLocal("testimoni_publisher")
+
+
+def refresh_main_embed():
+    """Tandai embed utama (stock/harga) & view select toko aktif perlu di-refresh. Edit-nya dilakukan StorefrontRefresher."""
+    current_context().storefront_refresher.mark_dirty()
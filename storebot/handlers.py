@@ -0,0 +1,78 @@
+import functools
+import time
+
+import discord
+
+from .guilds import guild_scope, guilds
+from .metrics import metrics
+
+NOT_SET_UP_MESSAGE = "❌ Toko belum di-setup di server ini. Admin server bisa memakai `/setuptoko`."
+
+
+# ============================================
+# HANDLER INTERACTION (DEFER-FIRST)
+# ============================================
+async def call_in_guild(func, self, interaction: discord.Interaction, *args):
+    """Jalankan callback dengan toko milik guild interaction ini sebagai toko aktif (lihat guilds.py)."""
+    ctx = await guilds.acquire(interaction.guild_id)
+    if ctx is None:
+        if interaction.response.is_done():
+            return await interaction.followup.send(NOT_SET_UP_MESSAGE, ephemeral=True)
+        return await interaction.response.send_message(NOT_SET_UP_MESSAGE, ephemeral=True)
+    with guild_scope(ctx):
+        return await func(self, interaction, *args)
+
+
+def instrumented(name: str, scoped: bool = True):
+    """
+    Decorator callback modal/tombol/select: catat durasi & hasil (ok/error) ke
+    metrics. scoped=True sekalian memasang toko guild interaction sebagai toko aktif.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(self, interaction: discord.Interaction, *args):
+            started = time.perf_counter()
+            outcome = "ok"
+            try:
+                if scoped:
+                    return await call_in_guild(func, self, interaction, *args)
+                return await func(self, interaction, *args)
+            except Exception:
+                outcome = "error"
+                raise
+            finally:
+                metrics.observe("interaction_seconds", time.perf_counter() - started, handler=name)
+                metrics.inc("interactions_total", handler=name, outcome=outcome)
+        return wrapper
+    return decorator
+
+
+def defer_first(name: str, ephemeral: bool = False, thinking: bool = False):
+    """
+    Decorator callback modal/tombol: interaction langsung di-ack dengan defer
+    sebelum kerja berat (disk, create channel, edit message), jadi tidak pernah
+    lewat batas ack 3 detik Discord. Semua balasan di handler lewat
+    `interaction.followup.send`. Durasi ack & selesai dicatat ke metrics.
+
+    thinking=True menampilkan "Bot sedang berpikir..." (ephemeral mengikuti
+    `ephemeral`), defer biasa di tombol tidak menampilkan apa-apa.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(self, interaction: discord.Interaction, *args):
+            started = time.perf_counter()
+            if not interaction.response.is_done():
+                await interaction.response.defer(ephemeral=ephemeral, thinking=thinking)
+            metrics.observe("interaction_ack_seconds", time.perf_counter() - started, handler=name)
+            try:
+                # Toko guild di-load setelah ack: load dari disk tidak ikut dihitung batas 3 detik
+                return await call_in_guild(func, self, interaction, *args)
+            except Exception:
+                # Sudah di-defer: tanpa followup user cuma lihat loading terus
+                try:
+                    await interaction.followup.send("❌ Terjadi kesalahan, silakan coba lagi.", ephemeral=True)
+                except Exception:
+                    pass
+                raise
+        return instrumented(name, scoped=False)(wrapper)
+    return decorator
@@ -0,0 +1,60 @@
+import contextlib
+import time
+
+# Dicatat saat package pertama di-import, dasar perhitungan waktu startup
+PROCESS_STARTED = time.perf_counter()
+
+# {fase: detik} untuk semua inisialisasi yang diukur (config, store, ...)
+startup_timings: dict = {}
+
+
+@contextlib.contextmanager
+def startup_phase(name: str):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        startup_timings[name] = startup_timings.get(name, 0.0) + time.perf_counter() - started
+
+
+class LazyObject:
+    """
+    Proxy yang baru membuat object aslinya (lewat `factory`) saat atributnya
+    pertama kali dipakai. Import package tidak membaca file / environment
+    apa pun; biaya load store, scheduler, dll dibayar saat benar-benar
+    dibutuhkan dan waktunya dicatat di `startup_timings`.
+    """
+
+    __slots__ = ("_factory", "_name", "_instance")
+
+    def __init__(self, factory, name: str):
+        object.__setattr__(self, "_factory", factory)
+        object.__setattr__(self, "_name", name)
+        object.__setattr__(self, "_instance", None)
+
+    def __getattr__(self, attr):
+        return getattr(resolve(self), attr)
+
+    def __setattr__(self, attr, value):
+        setattr(resolve(self), attr, value)
+
+    def __repr__(self) -> str:
+        state = "loaded" if is_loaded(self) else "lazy"
+        return f"<LazyObject {self._name} ({state})>"
+
+
+def resolve(obj):
+    """Object asli di balik LazyObject (dibuat kalau belum). Object biasa dikembalikan apa adanya."""
+    if not isinstance(obj, LazyObject):
+        return obj
+    instance = object.__getattribute__(obj, "_instance")
+    if instance is None:
+        name = object.__getattribute__(obj, "_name")
+        with startup_phase(name):
+            instance = object.__getattribute__(obj, "_factory")()
+        object.__setattr__(obj, "_instance", instance)
+    return instance
+
+
+def is_loaded(obj) -> bool:
+    return not isinstance(obj, LazyObject) or object.__getattribute__(obj, "_instance") is not None
@@ -0,0 +1,312 @@
+import bisect
+import collections
+import contextlib
+import os
+import sys
+import threading
+import time
+
+from aiohttp import web
+
+from .config import config
+from .lazy import LazyObject, startup_timings
+
+
+# ============================================
+# HISTOGRAM LATENCY
+# ============================================
+class LatencyHistogram:
+    """Histogram latency (detik) dengan bucket tetap, ala Prometheus. Quantile diperkirakan dari bucket."""
+
+    BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, float("inf"))
+
+    def __init__(self):
+        self.counts = [0] * len(self.BUCKETS)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float):
+        self.counts[bisect.bisect_left(self.BUCKETS, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+        self.max = max(self.max, seconds)
+
+    def quantile(self, q: float) -> float:
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        seen = 0
+        for bound, n in zip(self.BUCKETS, self.counts):
+            seen += n
+            if seen >= target:
+                return min(bound, self.max)
+        return self.max
+
+    def summary(self) -> str:
+        if not self.count:
+            return "belum ada data"
+        avg = self.sum / self.count
+        return (
+            f"n={self.count} avg={avg * 1000:.0f}ms "
+            f"p50≤{self.quantile(0.5) * 1000:.0f}ms p99≤{self.quantile(0.99) * 1000:.0f}ms "
+            f"max={self.max * 1000:.0f}ms"
+        )
+
+# ============================================
+# METRIK, ENDPOINT PROMETHEUS & PROFILER
+# ============================================
+class MetricsRegistry:
+    """
+    Registry metrik in-process. Counter & histogram di-update langsung di hot
+    path; collector adalah fungsi yang membaca counter milik komponen lain
+    (cache storefront, antrian REST, pool, ...) saat dirender, jadi komponen
+    tersebut tidak perlu tahu soal registry.
+
+    Dirender ke format teks Prometheus (endpoint HTTP) atau ringkasan
+    (command /metrics).
+    """
+
+    PREFIX = "store_"
+
+    def __init__(self):
+        self._counters = {}
+        self._histograms = {}
+        self._collectors = []
+        self._help = {}
+
+    @staticmethod
+    def _key(labels: dict) -> tuple:
+        return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+    def describe(self, name: str, help_text: str):
+        self._help[name] = help_text
+
+    def inc(self, name: str, value: float = 1, **labels):
+        series = self._counters.setdefault(name, {})
+        key = self._key(labels)
+        series[key] = series.get(key, 0) + value
+
+    def histogram(self, name: str, **labels) -> LatencyHistogram:
+        series = self._histograms.setdefault(name, {})
+        key = self._key(labels)
+        hist = series.get(key)
+        if hist is None:
+            hist = series[key] = LatencyHistogram()
+        return hist
+
+    def register_histogram(self, name: str, hist: LatencyHistogram, **labels):
+        """Daftarkan histogram yang sudah dimiliki komponen lain."""
+        self._histograms.setdefault(name, {})[self._key(labels)] = hist
+
+    def observe(self, name: str, seconds: float, **labels):
+        self.histogram(name, **labels).observe(seconds)
+
+    @contextlib.contextmanager
+    def timer(self, name: str, **labels):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started, **labels)
+
+    def collector(self, name: str, kind: str, func, help_text: str = None):
+        """func() -> angka, atau list (labels_dict, angka). kind: "counter" / "gauge"."""
+        self._collectors.append((name, kind, func))
+        if help_text:
+            self._help[name] = help_text
+
+    def _collect(self):
+        for name, kind, func in self._collectors:
+            try:
+                value = func()
+            except Exception as e:
+                print(f"[MetricsRegistry] Collector {name} error: {e}")
+                continue
+            if isinstance(value, (int, float)):
+                value = [({}, value)]
+            yield name, kind, [(self._key(labels), v) for labels, v in value]
+
+    @staticmethod
+    def _labels(key: tuple, extra: tuple = ()) -> str:
+        pairs = key + extra
+        if not pairs:
+            return ""
+        body = ",".join(
+            '{}="{}"'.format(k, v.replace("\\", "\\\\").replace('"', '\\"'))
+            for k, v in pairs
+        )
+        return "{" + body + "}"
+
+    def render_prometheus(self) -> str:
+        lines = []
+
+        def header(name: str, kind: str) -> str:
+            full = self.PREFIX + name
+            if name in self._help:
+                lines.append(f"# HELP {full} {self._help[name]}")
+            lines.append(f"# TYPE {full} {kind}")
+            return full
+
+        for name, series in sorted(self._counters.items()):
+            full = header(name, "counter")
+            for key, value in series.items():
+                lines.append(f"{full}{self._labels(key)} {value}")
+
+        for name, kind, series in self._collect():
+            full = header(name, kind)
+            for key, value in series:
+                lines.append(f"{full}{self._labels(key)} {value}")
+
+        for name, series in sorted(self._histograms.items()):
+            full = header(name, "histogram")
+            for key, hist in series.items():
+                cumulative = 0
+                for bound, n in zip(hist.BUCKETS, hist.counts):
+                    cumulative += n
+                    le = "+Inf" if bound == float("inf") else repr(bound)
+                    lines.append(f"{full}_bucket{self._labels(key, (('le', le),))} {cumulative}")
+                lines.append(f"{full}_sum{self._labels(key)} {hist.sum}")
+                lines.append(f"{full}_count{self._labels(key)} {hist.count}")
+
+        return "\n".join(lines) + "\n"
+
+    def summary_lines(self) -> list:
+        """Ringkasan singkat (tanpa bucket) untuk ditampilkan di Discord."""
+        lines = []
+        for name, series in sorted(self._counters.items()):
+            for key, value in series.items():
+                lines.append(f"{name}{self._labels(key)} = {value:g}")
+        for name, _, series in self._collect():
+            for key, value in series:
+                lines.append(f"{name}{self._labels(key)} = {value:g}")
+        for name, series in sorted(self._histograms.items()):
+            for key, hist in series.items():
+                if hist.count:
+                    lines.append(f"{name}{self._labels(key)}: {hist.summary()}")
+        return lines
+
+
+metrics = MetricsRegistry()
+metrics.describe("interaction_seconds", "Durasi handler interaction sampai selesai")
+metrics.describe("interaction_ack_seconds", "Durasi sampai interaction di-ack (defer)")
+metrics.describe("interactions_total", "Jumlah interaction per handler & hasil")
+metrics.describe("json_write_seconds", "Durasi tulis file JSON (atomic)")
+metrics.describe("json_load_seconds", "Durasi baca & parse file JSON")
+metrics.describe("record_seconds", "Durasi mencatat perubahan transaksi / stock ke storage")
+metrics.describe("flush_seconds", "Durasi flush write-behind per langkah")
+metrics.describe("rest_seconds", "Durasi panggilan REST lewat antrian keluar")
+metrics.describe("rest_calls_total", "Jumlah panggilan REST lewat antrian keluar")
+metrics.describe("tickets_expired_total", "Ticket pending yang dibatalkan otomatis karena kedaluwarsa")
+metrics.describe("purchase_rejected_total", "Submit pembelian yang ditolak (ticket masih terbuka / terlalu cepat)")
+
+
+class MetricsServer:
+    """Endpoint HTTP lokal GET /metrics (format teks Prometheus). Nonaktif kalau port 0."""
+
+    def __init__(self, registry: MetricsRegistry, host: str, port: int):
+        self.registry = registry
+        self.host = host
+        self.port = port
+        self._runner = None
+
+    async def start(self):
+        if not self.port or self._runner is not None:
+            return
+        app = web.Application()
+        app.router.add_get("/metrics", self._handle)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, self.host, self.port).start()
+        print(f"Metrics tersedia di http://{self.host}:{self.port}/metrics")
+
+    async def close(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def _handle(self, request):
+        return web.Response(text=self.registry.render_prometheus(), content_type="text/plain")
+
+
+class SamplingProfiler:
+    """
+    Profiler sampling opt-in: thread terpisah mengambil stack thread event
+    loop tiap `interval` detik lewat sys._current_frames() lalu menghitung
+    stack yang sama. Overhead kecil dan tidak mengubah kode yang diukur, jadi
+    aman dinyalakan sebentar di production saat mengejar regresi latency.
+    """
+
+    MAX_DEPTH = 40
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.samples = 0
+        self.started_at = None
+        self.leaves = collections.Counter()
+        self.stacks = collections.Counter()
+        self._lock = threading.Lock()
+        self._stop = None
+        self._thread = None
+        self._target = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """Mulai sampling thread pemanggil (panggil dari event loop)."""
+        if self.running:
+            return
+        with self._lock:
+            self.samples = 0
+            self.leaves.clear()
+            self.stacks.clear()
+        self.started_at = time.time()
+        self._target = threading.get_ident()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._sample_loop, name="sampling-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if not self.running:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+
+    def _sample_loop(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._target)
+            if frame is None:
+                continue
+            leaf = f"{os.path.basename(frame.f_code.co_filename)}:{frame.f_code.co_name}:{frame.f_lineno}"
+            stack = []
+            while frame is not None and len(stack) < self.MAX_DEPTH:
+                stack.append(f"{os.path.basename(frame.f_code.co_filename)}:{frame.f_code.co_name}")
+                frame = frame.f_back
+            with self._lock:
+                self.samples += 1
+                self.leaves[leaf] += 1
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def top(self, n: int = 15) -> list:
+        with self._lock:
+            return self.leaves.most_common(n)
+
+    def dump(self, path: str):
+        """Simpan stack format 'folded' (bisa langsung dipakai flamegraph.pl / speedscope)."""
+        with self._lock:
+            payload = "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+        with open(path, "w") as f:
+            f.write(payload)
+
+
+metrics.collector(
+    "startup_seconds", "gauge",
+    lambda: [({"phase": phase}, round(seconds, 6)) for phase, seconds in startup_timings.items()],
+    "Durasi inisialisasi per fase saat startup"
+)
+
+metrics_server = LazyObject(lambda: MetricsServer(metrics, config.METRICS_HOST, config.METRICS_PORT), "metrics_server")
+profiler = LazyObject(lambda: SamplingProfiler(config.PROFILER_INTERVAL), "profiler")
@@ -0,0 +1,223 @@
+import asyncio
+import collections
+import time
+
+from .config import config
+from .lazy import LazyObject
+from .metrics import LatencyHistogram, metrics
+
+
+# ============================================
+# ANTRIAN AKSI KELUAR (REST)
+# ============================================
+class TokenBucket:
+    """Token bucket sederhana: `capacity` token, terisi penuh lagi dalam `per` detik."""
+
+    def __init__(self, capacity: int, per: float):
+        self.capacity = capacity
+        self.rate = capacity / per
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def try_take(self) -> bool:
+        self._refill(time.monotonic())
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+    def refund(self):
+        """Kembalikan satu token yang sudah diambil (aksi batal sebelum jalan)."""
+        self._refill(time.monotonic())
+        self.tokens = min(self.capacity, self.tokens + 1)
+
+    def wait_time(self) -> float:
+        """Detik sampai satu token tersedia."""
+        self._refill(time.monotonic())
+        return max(0.0, (1 - self.tokens) / self.rate)
+
+    @property
+    def full(self) -> bool:
+        self._refill(time.monotonic())
+        return self.tokens >= self.capacity
+
+
+class OutboundAction:
+    __slots__ = ("lane", "bucket", "factory", "key", "future", "enqueued_at")
+
+    def __init__(self, lane: str, bucket: str, factory, key: str, future: asyncio.Future):
+        self.lane = lane
+        self.bucket = bucket
+        self.factory = factory
+        self.key = key
+        self.future = future
+        self.enqueued_at = time.perf_counter()
+
+
+class OutboundQueue:
+    """
+    Semua panggilan REST dari bot (send, edit, create/delete channel) lewat
+    satu antrian dengan lane prioritas: "buyer" (ticket pembeli) dulu, lalu
+    "ticket" (update status ticket / tutup ticket), terakhir "background"
+    (refresh storefront, log testimoni, isi pool).
+
+    Tiap aksi punya bucket, mis. "message:<channel_id>"; budget bucket diambil
+    dari prefix sebelum ":" di `budgets` ({prefix: (kapasitas, per_detik)}).
+    Aksi yang bucket-nya habis menunggu tanpa menahan aksi di bucket lain, jadi
+    rate limit refresh storefront tidak ikut memperlambat pembeli.
+
+    Aksi dengan `key` yang sama dan belum jalan digabung (yang terbaru menang),
+    mis. beberapa edit ke message yang sama cukup dikirim sekali. Hasil gabungan
+    naik ke lane prioritas tertinggi di antara keduanya.
+
+    Sebelum start() (mis. di bench tanpa bot) aksi langsung dijalankan.
+    """
+
+    LANES = ("buyer", "ticket", "background")
+
+    def __init__(self, budgets: dict, concurrency: int):
+        self.budgets = budgets
+        self.concurrency = max(1, concurrency)
+        self.buckets: dict = {}
+        self.executed = collections.Counter()
+        self.merged = 0
+        self.wait_latency = {lane: LatencyHistogram() for lane in self.LANES}
+        self._lanes = {lane: collections.deque() for lane in self.LANES}
+        self._keys: dict = {}
+        self._slots = None
+        self._wakeup = None
+        self._task = None
+
+    def depth(self) -> dict:
+        return {lane: len(actions) for lane, actions in self._lanes.items()}
+
+    def _bucket(self, name: str) -> TokenBucket:
+        bucket = self.buckets.get(name)
+        if bucket is None:
+            if len(self.buckets) > 1024:
+                # Buang bucket yang sudah penuh lagi (tidak dipakai) supaya dict tidak terus tumbuh
+                self.buckets = {k: b for k, b in self.buckets.items() if not b.full}
+            capacity, per = self.budgets.get(name.split(":", 1)[0], self.budgets["default"])
+            bucket = self.buckets[name] = TokenBucket(capacity, per)
+        return bucket
+
+    def submit(self, lane: str, bucket: str, factory, key: str = None) -> asyncio.Future:
+        """
+        Antrikan `factory()` (fungsi yang mengembalikan coroutine REST).
+        Return future hasil aksi; error dari Discord diteruskan lewat future.
+        """
+        if self._task is None:
+            return asyncio.ensure_future(factory())
+
+        if key is not None:
+            queued = self._keys.get(key)
+            if queued is not None:
+                queued.factory = factory
+                if self.LANES.index(lane) < self.LANES.index(queued.lane):
+                    # Edit dari lane "buyer" tidak boleh ikut menunggu di belakang antrian background
+                    self._lanes[queued.lane].remove(queued)
+                    self._lanes[lane].append(queued)
+                    queued.lane = lane
+                    self._wakeup.set()
+                self.merged += 1
+                return queued.future
+
+        action = OutboundAction(lane, bucket, factory, key, asyncio.get_running_loop().create_future())
+        self._lanes[lane].append(action)
+        if key is not None:
+            self._keys[key] = action
+        self._wakeup.set()
+        return action.future
+
+    def start(self):
+        if self._task is not None and not self._task.done():
+            return
+        self._slots = asyncio.Semaphore(self.concurrency)
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+
+    async def close(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for actions in self._lanes.values():
+            while actions:
+                actions.popleft().future.cancel()
+        self._keys.clear()
+
+    def _next(self):
+        """Aksi berikutnya (lane prioritas tertinggi yang bucket-nya ada token), atau (None, detik_tunggu)."""
+        wait = None
+        for lane in self.LANES:
+            actions = self._lanes[lane]
+            blocked = set()
+            for action in actions:
+                if action.bucket in blocked:
+                    continue
+                bucket = self._bucket(action.bucket)
+                if bucket.try_take():
+                    actions.remove(action)
+                    if action.key is not None:
+                        self._keys.pop(action.key, None)
+                    return action, None
+                blocked.add(action.bucket)
+                delay = bucket.wait_time()
+                wait = delay if wait is None else min(wait, delay)
+        return None, wait
+
+    async def _run(self):
+        while True:
+            action, wait = self._next()
+            if action is None:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=wait)
+                except asyncio.TimeoutError:
+                    pass
+                self._wakeup.clear()
+                continue
+
+            await self._slots.acquire()
+            asyncio.create_task(self._execute(action))
+
+    async def _execute(self, action: OutboundAction):
+        self.wait_latency[action.lane].observe(time.perf_counter() - action.enqueued_at)
+        bucket = action.bucket.split(":", 1)[0]
+        outcome = "ok"
+        started = time.perf_counter()
+        try:
+            result = await action.factory()
+        except asyncio.CancelledError:
+            action.future.cancel()
+            raise
+        except Exception as e:
+            outcome = "error"
+            if not action.future.done():
+                action.future.set_exception(e)
+        else:
+            if not action.future.done():
+                action.future.set_result(result)
+        finally:
+            metrics.observe("rest_seconds", time.perf_counter() - started, lane=action.lane, bucket=bucket)
+            metrics.inc("rest_calls_total", lane=action.lane, bucket=bucket, outcome=outcome)
+            self.executed[action.lane] += 1
+            self._slots.release()
+
+
+def create_outbound() -> OutboundQueue:
+    queue = OutboundQueue(config.OUTBOUND_BUDGETS, config.OUTBOUND_CONCURRENCY)
+    metrics.collector("outbound_queue_depth", "gauge", lambda: [({"lane": lane}, n) for lane, n in queue.depth().items()])
+    metrics.collector("outbound_merged_total", "counter", lambda: queue.merged, "Aksi REST yang digabung dengan aksi antre")
+    for lane, hist in queue.wait_latency.items():
+        metrics.register_histogram("outbound_wait_seconds", hist, lane=lane)
+    return queue
+
+
+outbound = LazyObject(create_outbound, "outbound")
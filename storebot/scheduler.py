@@ -0,0 +1,218 @@
+import asyncio
+import heapq
+import itertools
+import json
+import time
+import uuid
+
+from .config import config
+from .lazy import LazyObject
+from .metrics import metrics
+from .storage import write_json_atomic
+
+
+# ============================================
+# SCHEDULER (AKSI TERTUNDA, PERSISTENT)
+# ============================================
+class JobScheduler:
+    """
+    Antrian aksi tertunda (mis. hapus channel ticket) dengan satu timer untuk
+    semua job: job disimpan di min-heap berdasarkan waktu jatuh tempo, satu
+    background task tidur sampai job terdekat. Semua job yang belum jalan
+    disimpan ke file, jadi kalau bot restart job dimuat ulang (yang sudah
+    lewat waktunya langsung dijalankan).
+
+    Dengan `client`, job baru dijalankan setelah gateway READY: sebelum itu
+    cache channel masih kosong, jadi job yang lewat waktunya saat restart
+    (mis. hapus channel) akan mengira channel-nya sudah tidak ada.
+
+    Tiap jenis aksi punya batas `per_second`: job yang jatuh tempo bersamaan
+    dijalankan per batch, sisanya digeser ke detik berikutnya supaya tidak
+    menabrak rate limit (mis. admin menutup puluhan ticket sekaligus).
+
+    File job tidak ditulis ulang tiap schedule / retry / job selesai: perubahan
+    cukup menandai dirty, lalu background task menulisnya sekali per putaran
+    (di thread), jadi menutup N ticket sekaligus tetap satu-dua kali tulis.
+    """
+
+    MAX_ATTEMPTS = 3
+
+    def __init__(self, path: str):
+        self.path = path
+        self.jobs: dict = {}
+        self._handlers: dict = {}
+        self._heap: list = []
+        self._usage: dict = {}
+        self._seq = itertools.count()
+        self._dirty = False
+        self._client = None
+        self._wakeup = None
+        self._task = None
+
+    def register(self, action: str, handler, per_second: int = 5):
+        """handler(job) -> coroutine. Dipanggil maksimal `per_second` job per detik."""
+        self._handlers[action] = (handler, max(1, per_second))
+
+    def load(self):
+        try:
+            with open(self.path, "r") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            data = {}
+        except Exception as e:
+            print(f"[JobScheduler] Gagal baca {self.path}: {e}")
+            data = {}
+        if isinstance(data, dict):
+            for job in data.values():
+                self._push(job)
+
+    def _mark_dirty(self):
+        self._dirty = True
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def _save_if_dirty(self):
+        if not self._dirty:
+            return
+        self._dirty = False
+        # Serialize di event loop (snapshot konsisten), tulis + fsync di thread
+        payload = json.dumps(self.jobs, indent=4)
+        try:
+            await asyncio.to_thread(write_json_atomic, self.path, payload)
+        except Exception as e:
+            self._dirty = True
+            print(f"[JobScheduler] Gagal simpan job: {e}")
+
+    def _save_now(self):
+        try:
+            write_json_atomic(self.path, json.dumps(self.jobs, indent=4))
+            self._dirty = False
+        except Exception as e:
+            print(f"[JobScheduler] Gagal simpan job: {e}")
+
+    def _push(self, job: dict):
+        self.jobs[job["id"]] = job
+        heapq.heappush(self._heap, (job["due"], next(self._seq), job["id"]))
+
+    def schedule(self, action: str, delay: float, key: str = None, **args) -> str:
+        """Jadwalkan `action` dalam `delay` detik. Job dengan `key` yang sama ditimpa."""
+        job_id = f"{action}:{key}" if key is not None else f"{action}:{uuid.uuid4().hex}"
+        self._push({
+            "id": job_id,
+            "action": action,
+            "due": time.time() + delay,
+            "args": args,
+            "attempts": 0
+        })
+        self._mark_dirty()
+        return job_id
+
+    def cancel(self, job_id: str):
+        if self.jobs.pop(job_id, None) is not None:
+            self._mark_dirty()
+
+    def start(self, client=None):
+        if self._task is not None and not self._task.done():
+            return
+        self._client = client
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+
+    async def close(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._dirty:
+            self._save_now()
+
+    def _pop_due(self, now: float) -> list:
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            due_at, _, job_id = heapq.heappop(self._heap)
+            job = self.jobs.get(job_id)
+            # Entry basi: job sudah dibatalkan / dijadwal ulang dengan waktu lain
+            if job is None or job["due"] != due_at:
+                continue
+            due.append(job)
+        return due
+
+    async def _run(self):
+        if self._client is not None:
+            await self._client.wait_until_ready()
+        while True:
+            await self._save_if_dirty()
+            timeout = None
+            if self._heap:
+                timeout = max(0.0, self._heap[0][0] - time.time())
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+            due = self._pop_due(time.time())
+            if due:
+                await self._run_batch(due)
+
+    async def _run_batch(self, due: list):
+        by_action = {}
+        for job in due:
+            by_action.setdefault(job["action"], []).append(job)
+
+        runs = []
+        deferred = False
+        for action, jobs in by_action.items():
+            handler, per_second = self._handlers.get(action, (None, 1))
+            if handler is None:
+                print(f"[JobScheduler] Aksi '{action}' tidak dikenal, job {len(jobs)} dibuang")
+                for job in jobs:
+                    self.jobs.pop(job["id"], None)
+                deferred = True
+                continue
+            # Lewat batas per detik: geser ke detik berikutnya
+            second = int(time.time())
+            window, used = self._usage.get(action, (second, 0))
+            if window != second:
+                used = 0
+            allowed = max(0, per_second - used)
+            for job in jobs[allowed:]:
+                job["due"] = second + 1
+                self._push(job)
+                deferred = True
+            self._usage[action] = (second, used + min(allowed, len(jobs)))
+            runs.extend(self._run_job(handler, job) for job in jobs[:allowed])
+
+        if deferred:
+            self._mark_dirty()
+        await asyncio.gather(*runs)
+
+    async def _run_job(self, handler, job: dict):
+        try:
+            await handler(job)
+        except Exception as e:
+            job["attempts"] = job.get("attempts", 0) + 1
+            if job["attempts"] < self.MAX_ATTEMPTS:
+                print(f"[JobScheduler] Job {job['id']} gagal ({e}), dicoba lagi")
+                job["due"] = time.time() + 5 * job["attempts"]
+                self._push(job)
+                self._mark_dirty()
+                return
+            print(f"[JobScheduler] Job {job['id']} gagal {job['attempts']}x, dibuang: {e}")
+
+        if self.jobs.get(job["id"]) is job:
+            del self.jobs[job["id"]]
+            self._mark_dirty()
+
+
+def create_scheduler() -> JobScheduler:
+    job_scheduler = JobScheduler(config.SCHEDULED_JOBS_FILE)
+    job_scheduler.load()
+    metrics.collector("scheduled_jobs", "gauge", lambda: len(job_scheduler.jobs), "Job tertunda di scheduler")
+    return job_scheduler
+
+
+scheduler = LazyObject(create_scheduler, "scheduler")
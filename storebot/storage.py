@@ -0,0 +1,713 @@
+import functools
+import gzip
+import heapq
+import json
+import os
+import shutil
+import sqlite3
+import threading
+from datetime import datetime
+
+from .config import config
+from .metrics import metrics
+
+
+# ============================================
+# JSON HELPERS
+# ============================================
+def write_json_atomic(path: str, payload: str):
+    """Tulis ke file sementara lalu os.replace, supaya file tidak pernah setengah jadi."""
+    tmp_path = f"{path}.tmp"
+    with metrics.timer("json_write_seconds", file=os.path.basename(path)):
+        with open(tmp_path, "w") as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+
+def load_products(path: str) -> dict:
+    """
+    Struktur:
+    {
+        "Nama Produk": {
+            "stock": int,
+            "price": int,
+            "category": str,     # opsional
+            "ttl_minutes": int,  # opsional, batas waktu ticket pending (0 = tidak kedaluwarsa)
+            "last_sale": str     # opsional, id transaksi sukses terakhir yang sudah masuk ke stock
+        },
+        ...
+    }
+    """
+    try:
+        with metrics.timer("json_load_seconds", file=os.path.basename(path)), open(path, "r") as f:
+            data = json.load(f)
+            if isinstance(data, dict):
+                return data
+            return {}
+    except FileNotFoundError:
+        return {}
+    except Exception:
+        return {}
+
+
+def save_products(data: dict, path: str):
+    write_json_atomic(path, json.dumps(data, indent=4))
+
+
+def load_transactions(path: str) -> dict:
+    try:
+        with metrics.timer("json_load_seconds", file=os.path.basename(path)), open(path, "r") as f:
+            data = json.load(f)
+            if isinstance(data, dict):
+                return data
+            return {}
+    except FileNotFoundError:
+        return {}
+    except Exception:
+        return {}
+
+
+def save_transactions(data: dict, path: str):
+    write_json_atomic(path, json.dumps(data, indent=4))
+
+
+def load_main_message(path: str):
+    try:
+        with open(path, "r") as f:
+            data = json.load(f)
+            if isinstance(data, dict):
+                return data
+            return None
+    except FileNotFoundError:
+        return None
+    except Exception:
+        return None
+
+
+def save_main_message(path: str, channel_id: int, message_id: int, fingerprint: str = None):
+    data = {"channel_id": channel_id, "message_id": message_id}
+    if fingerprint:
+        # Hash tampilan yang terakhir terkirim; restart tanpa perubahan tidak perlu edit ulang
+        data["fingerprint"] = fingerprint
+    write_json_atomic(path, json.dumps(data, indent=4))
+
+
+def load_command_sync():
+    """{"application_id": int, "fingerprint": str} dari sync slash command terakhir, atau None."""
+    try:
+        with open(config.COMMAND_SYNC_FILE, "r") as f:
+            data = json.load(f)
+            if isinstance(data, dict):
+                return data
+            return None
+    except FileNotFoundError:
+        return None
+    except Exception:
+        return None
+
+
+def save_command_sync(application_id: int, fingerprint: str):
+    write_json_atomic(config.COMMAND_SYNC_FILE, json.dumps({"application_id": application_id, "fingerprint": fingerprint}, indent=4))
+
+# ============================================
+# JOURNAL TRANSAKSI (APPEND-ONLY)
+# ============================================
+def apply_transaction_event(transactions: dict, event: dict):
+    """
+    Terapkan satu event journal ke dict transaksi. Event bersifat idempotent
+    (set, bukan increment), jadi aman di-replay ulang di atas snapshot yang
+    lebih baru.
+
+    {"event": "created", "id": "<channel_id>", "tx": {...}}
+    {"event": "success" | "cancelled", "id": "<channel_id>", "processed_by": int, "processed_at": str,
+     "reason": str,      # opsional, mis. "expired" untuk ticket yang dibatalkan otomatis
+     "stock_after": int} # success: stock produk setelah penjualan ini (lihat replay_sale_stock)
+    """
+    kind = event.get("event")
+    tx_id = str(event.get("id"))
+
+    if kind == "created":
+        transactions[tx_id] = dict(event.get("tx", {}))
+        return
+
+    tx = transactions.get(tx_id)
+    if tx is None:
+        return
+    tx["status"] = kind
+    tx["processed_by"] = event.get("processed_by")
+    tx["processed_at"] = event.get("processed_at")
+    if event.get("reason"):
+        tx["reason"] = event["reason"]
+
+
+def build_pending_index(transactions: dict) -> dict:
+    """Full scan: {nama produk: total amount transaksi pending}."""
+    pending = {}
+    for t in transactions.values():
+        if t.get("status") == "pending":
+            product = t.get("product")
+            pending[product] = pending.get(product, 0) + int(t.get("amount", 0))
+    return {name: total for name, total in pending.items() if total}
+
+
+def sale_stock_of(event: dict, transactions: dict):
+    """(produk, id transaksi, stock_after) kalau `event` penjualan yang membawa stock, selain itu None."""
+    if event.get("event") != "success" or event.get("stock_after") is None:
+        return None
+    tx = transactions.get(str(event.get("id"))) or {}
+    return tx.get("product"), str(event.get("id")), int(event["stock_after"])
+
+
+def replay_sale_stock(products: dict, sales: list) -> set:
+    """
+    Stock produk ditulis write-behind, jadi products.json bisa tertinggal dari
+    journal. `sales` [(produk, id transaksi, stock_after)] urut journal; stock
+    diambil dari penjualan terakhir yang lebih baru dari `last_sale` produk
+    (kalau `last_sale` tidak ada di journal, semua penjualan di journal lebih
+    baru). Return nama produk yang stock-nya diperbaiki.
+    """
+    by_product = {}
+    for product, tx_id, stock_after in sales:
+        by_product.setdefault(product, []).append((tx_id, stock_after))
+
+    changed = set()
+    for name, product_sales in by_product.items():
+        pdata = products.get(name)
+        if pdata is None:
+            continue
+        ids = [tx_id for tx_id, _ in product_sales]
+        last_sale = pdata.get("last_sale")
+        newer = product_sales[ids.index(last_sale) + 1:] if last_sale in ids else product_sales
+        if newer:
+            pdata["last_sale"], pdata["stock"] = newer[-1]
+            changed.add(name)
+    return changed
+
+
+class StockReservation:
+    """
+    Stock yang ditahan untuk satu pembelian selama ticket channel dibuat.
+    commit() mengubahnya jadi transaksi pending, rollback() melepasnya lagi.
+    """
+
+    def __init__(self, store, product_name: str, amount: int, user_id: int = None):
+        self.store = store
+        self.product_name = product_name
+        self.amount = amount
+        self.user_id = user_id
+        self.active = True
+
+    def commit(self, tx_id, tx: dict):
+        if not self.active:
+            raise RuntimeError("Reservasi sudah di-commit / di-rollback")
+        self.active = False
+        self.store._release_hold(self.product_name, self.amount, self.user_id)
+        self.store.create_transaction(tx_id, tx)
+
+    def rollback(self):
+        if self.active:
+            self.active = False
+            self.store._release_hold(self.product_name, self.amount, self.user_id)
+
+
+class TransactionJournal:
+    """
+    Journal JSON-lines untuk transaksi. Setiap perubahan cuma append satu baris
+    (biaya tetap, tidak tergantung jumlah histori). Saat compaction, journal
+    aktif di-rotate ke `<path>.compacting`, snapshot ditulis, lalu file rotate
+    dihapus. Urutan replay: snapshot -> .compacting -> journal aktif.
+    """
+
+    def __init__(self, path: str, snapshot_path: str):
+        self.path = path
+        self.snapshot_path = snapshot_path
+        self.rotated_path = f"{path}.compacting"
+        self.events_since_compact = 0
+        self._file = None
+
+    def replay(self, apply_event):
+        """Baca ulang semua event setelah snapshot, panggil apply_event(event) untuk tiap event."""
+        for path in (self.rotated_path, self.path):
+            self.events_since_compact += self._replay_file(path, apply_event)
+
+    @staticmethod
+    def _replay_file(path: str, apply_event) -> int:
+        count = 0
+        try:
+            with open(path, "r") as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        event = json.loads(line)
+                    except ValueError:
+                        # Baris terakhir bisa terpotong kalau proses mati saat menulis
+                        print(f"[TransactionJournal] Skip baris rusak di {path}")
+                        continue
+                    apply_event(event)
+                    count += 1
+        except FileNotFoundError:
+            pass
+        return count
+
+    def append(self, event: dict):
+        if self._file is None:
+            self._file = open(self.path, "a")
+        self._file.write(json.dumps(event, separators=(",", ":")) + "\n")
+        self._file.flush()
+        self.events_since_compact += 1
+
+    def rotate(self):
+        """Pindahkan journal aktif ke file .compacting; event baru masuk ke journal kosong."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if os.path.exists(self.path):
+            if os.path.exists(self.rotated_path):
+                # Compaction sebelumnya gagal: gabungkan supaya tidak ada event yang hilang
+                with open(self.rotated_path, "a") as dst, open(self.path, "r") as src:
+                    dst.write(src.read())
+                os.remove(self.path)
+            else:
+                os.replace(self.path, self.rotated_path)
+        self.events_since_compact = 0
+
+    def finish_compaction(self, snapshot_payload: str):
+        write_json_atomic(self.snapshot_path, snapshot_payload)
+        try:
+            os.remove(self.rotated_path)
+        except FileNotFoundError:
+            pass
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+# ============================================
+# ARSIP TRANSAKSI (GZIP PER BULAN)
+# ============================================
+class TransactionArchive:
+    """
+    Transaksi selesai (success / cancelled) yang sudah lewat masa retensi
+    dipindah ke sini, supaya working set di memory & snapshot hanya berisi
+    ticket yang masih aktif / baru.
+
+    Satu file per bulan `created_at`: `<directory>/transactions-YYYY-MM.jsonl.gz`,
+    isinya JSON-lines {"id": ..., "tx": {...}}. Tiap penulisan menambah satu
+    member gzip baru (isi lama disalin byte-per-byte, tidak di-kompres ulang)
+    lalu os.replace, jadi partisi tidak pernah setengah jadi. Pembacaan selalu
+    streaming per baris dan hanya membuka partisi yang relevan dengan query.
+    """
+
+    PREFIX = "transactions-"
+    SUFFIX = ".jsonl.gz"
+
+    def __init__(self, directory: str):
+        self.directory = directory
+
+    @staticmethod
+    def partition_of(tx: dict) -> str:
+        return (tx.get("created_at") or tx.get("processed_at") or "0000-00")[:7]
+
+    def _path(self, month: str) -> str:
+        return os.path.join(self.directory, f"{self.PREFIX}{month}{self.SUFFIX}")
+
+    def partitions(self) -> list:
+        """[(bulan "YYYY-MM", path)], terurut dari yang paling lama."""
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return []
+        months = sorted(
+            name[len(self.PREFIX):-len(self.SUFFIX)]
+            for name in names
+            if name.startswith(self.PREFIX) and name.endswith(self.SUFFIX)
+        )
+        return [(month, self._path(month)) for month in months]
+
+    def write(self, transactions: dict) -> int:
+        """Append {tx_id: tx} ke partisi masing-masing. Dipanggil di thread (tidak menyentuh state DataStore)."""
+        by_month = {}
+        for tx_id, tx in transactions.items():
+            line = json.dumps({"id": str(tx_id), "tx": tx}, separators=(",", ":"))
+            by_month.setdefault(self.partition_of(tx), []).append(line + "\n")
+
+        os.makedirs(self.directory, exist_ok=True)
+        for month, lines in by_month.items():
+            path = self._path(month)
+            tmp_path = f"{path}.tmp"
+            with metrics.timer("json_write_seconds", file=os.path.basename(path)):
+                if os.path.exists(path):
+                    shutil.copyfile(path, tmp_path)
+                with open(tmp_path, "ab") as raw:
+                    with gzip.GzipFile(fileobj=raw, mode="wb") as gz:
+                        gz.write("".join(lines).encode())
+                    raw.flush()
+                    os.fsync(raw.fileno())
+                os.replace(tmp_path, path)
+        return len(transactions)
+
+    @staticmethod
+    def _read_partition(path: str, skip_ids=frozenset(), contains: str = None):
+        """
+        Yield (tx_id, tx) dari satu partisi. Id yang sama bisa tertulis dua kali
+        kalau proses mati di antara tulis arsip & compaction snapshot; yang
+        dipakai cukup yang pertama. `contains` menyaring baris mentah sebelum
+        di-parse (format baris dari write() selalu compact, tanpa spasi).
+        """
+        seen = set()
+        try:
+            with gzip.open(path, "rt") as f:
+                for line in f:
+                    if contains is not None and contains not in line:
+                        continue
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue
+                    tx_id = record.get("id")
+                    if tx_id in seen or tx_id in skip_ids:
+                        continue
+                    seen.add(tx_id)
+                    yield tx_id, record.get("tx") or {}
+        except FileNotFoundError:
+            return
+        except (EOFError, gzip.BadGzipFile, OSError) as e:
+            # Member terakhir terpotong (proses mati saat append): baris sebelumnya tetap terbaca
+            print(f"[TransactionArchive] Berhenti membaca {path}: {e}")
+
+    def iter_transactions(self, since: str = None, newest_first: bool = False, skip_ids=frozenset(), contains: str = None):
+        """Stream (tx_id, tx) dari partisi yang bulannya >= bulan `since` (ISO datetime)."""
+        partitions = self.partitions()
+        if since:
+            partitions = [(month, path) for month, path in partitions if month >= since[:7]]
+        if newest_first:
+            partitions.reverse()
+        for _, path in partitions:
+            yield from self._read_partition(path, skip_ids, contains)
+
+    def user_history(self, user_id: int, limit: int, since: str = None, skip_ids=frozenset()) -> list:
+        """`limit` transaksi terbaru milik user. Berhenti begitu partisi yang lebih lama tidak mungkin masuk."""
+        found = []
+        for month, path in reversed(self.partitions()):
+            # Partisi lebih lama hanya berisi transaksi yang lebih lama dari semua yang sudah ketemu
+            if len(found) >= limit or (since and month < since[:7]):
+                break
+            for _, tx in self._read_partition(path, skip_ids, f'"user_id":{int(user_id)}'):
+                if tx.get("user_id") == user_id:
+                    found.append(tx)
+        return heapq.nlargest(limit, found, key=lambda t: t.get("created_at") or "")
+
+    def sales_report(self, since: str, report: dict = None, skip_ids=frozenset()) -> dict:
+        """Tambahkan transaksi sukses sejak `since` ke `report` ({produk: {count, amount, total}})."""
+        report = {} if report is None else report
+        for _, t in self.iter_transactions(since, skip_ids=skip_ids, contains='"status":"success"'):
+            if t.get("status") != "success" or (t.get("created_at") or "") < since:
+                continue
+            row = report.setdefault(t.get("product"), {"count": 0, "amount": 0, "total": 0})
+            row["count"] += 1
+            row["amount"] += int(t.get("amount", 0))
+            row["total"] += int(t.get("total_price", 0))
+        return report
+
+# ============================================
+# STORAGE BACKEND (JSON / SQLITE)
+# ============================================
+# Interface yang dipakai DataStore:
+#   load_products() -> dict, load_transactions() -> dict
+#   pending_by_product(transactions) -> dict, replay(apply_event)
+#   record(event, tx)                      -> persist satu event transaksi
+#   prepare_products_save(products, changed) -> fungsi untuk dijalankan di thread
+#   compact_due() -> bool, prepare_compaction(transactions) -> fungsi / None
+#   prepare_archive(transactions, archived_ids) -> fungsi yang membuang transaksi
+#                                             yang sudah diarsip dari storage
+#   user_history(user_id, limit) -> list, sales_report(since) -> dict
+#   close()
+# Semua prepare_* dipanggil di event loop (snapshot konsisten); fungsi yang
+# dikembalikan boleh jalan di thread lain.
+class JsonStorage:
+    """Backend default: products.json + journal transaksi. Cukup untuk toko kecil."""
+
+    name = "json"
+
+    def __init__(self, products_file: str, transactions_file: str, journal_file: str, compact_every: int):
+        self.products_file = products_file
+        self.transactions_file = transactions_file
+        self.compact_every = max(1, compact_every)
+        self.journal = TransactionJournal(journal_file, transactions_file)
+        self.transactions: dict = {}
+
+    def load_products(self) -> dict:
+        return load_products(self.products_file)
+
+    def load_transactions(self) -> dict:
+        self.transactions = load_transactions(self.transactions_file)
+        return self.transactions
+
+    def pending_by_product(self, transactions: dict) -> dict:
+        return build_pending_index(transactions)
+
+    def replay(self, apply_event):
+        self.journal.replay(apply_event)
+
+    def record(self, event: dict, tx: dict):
+        self.journal.append(event)
+
+    def prepare_products_save(self, products: dict, changed: set):
+        return functools.partial(write_json_atomic, self.products_file, json.dumps(products, indent=4))
+
+    def compact_due(self) -> bool:
+        return self.journal.events_since_compact >= self.compact_every
+
+    def prepare_compaction(self, transactions: dict):
+        """Rotate journal + serialize transaksi tanpa await di antaranya, supaya snapshot dan rotate konsisten."""
+        if not self.journal.events_since_compact:
+            return None
+        self.journal.rotate()
+        return functools.partial(self.journal.finish_compaction, json.dumps(transactions, indent=4))
+
+    def prepare_archive(self, transactions: dict, archived_ids: set):
+        """Transaksi yang diarsip sudah tidak ada di `transactions`; cukup paksa compaction (snapshot tanpa mereka)."""
+        self.journal.rotate()
+        return functools.partial(self.journal.finish_compaction, json.dumps(transactions, indent=4))
+
+    def user_history(self, user_id: int, limit: int) -> list:
+        history = [t for t in self.transactions.values() if t.get("user_id") == user_id]
+        history.sort(key=lambda t: t.get("created_at") or "", reverse=True)
+        return history[:limit]
+
+    def sales_report(self, since: str) -> dict:
+        report = {}
+        for t in self.transactions.values():
+            if t.get("status") != "success" or (t.get("created_at") or "") < since:
+                continue
+            row = report.setdefault(t.get("product"), {"count": 0, "amount": 0, "total": 0})
+            row["count"] += 1
+            row["amount"] += int(t.get("amount", 0))
+            row["total"] += int(t.get("total_price", 0))
+        return report
+
+    def close(self):
+        self.journal.close()
+
+
+_SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS products (
+    name TEXT PRIMARY KEY,
+    stock INTEGER NOT NULL,
+    price INTEGER NOT NULL,
+    category TEXT,
+    ttl_minutes INTEGER
+);
+CREATE TABLE IF NOT EXISTS transactions (
+    id TEXT PRIMARY KEY,
+    user_id INTEGER,
+    product TEXT,
+    amount INTEGER NOT NULL DEFAULT 0,
+    total_price INTEGER NOT NULL DEFAULT 0,
+    status TEXT,
+    created_at TEXT,
+    processed_at TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_transactions_status_product ON transactions (status, product);
+CREATE INDEX IF NOT EXISTS idx_transactions_user_created ON transactions (user_id, created_at);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+# Query dibuat konstan supaya di-cache sebagai prepared statement oleh sqlite3
+_SQL_UPSERT_PRODUCT = (
+    "INSERT INTO products (name, stock, price, category, ttl_minutes) VALUES (?, ?, ?, ?, ?) "
+    "ON CONFLICT(name) DO UPDATE SET stock = excluded.stock, price = excluded.price, "
+    "category = excluded.category, ttl_minutes = excluded.ttl_minutes"
+)
+_SQL_DELETE_PRODUCT = "DELETE FROM products WHERE name = ?"
+_SQL_SET_STOCK = "UPDATE products SET stock = ? WHERE name = ?"
+_SQL_UPSERT_TRANSACTION = (
+    "INSERT INTO transactions (id, user_id, product, amount, total_price, status, created_at, processed_at, data) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) "
+    "ON CONFLICT(id) DO UPDATE SET user_id = excluded.user_id, product = excluded.product, "
+    "amount = excluded.amount, total_price = excluded.total_price, status = excluded.status, "
+    "created_at = excluded.created_at, processed_at = excluded.processed_at, data = excluded.data"
+)
+_SQL_DELETE_TRANSACTION = "DELETE FROM transactions WHERE id = ?"
+_SQL_PENDING_BY_PRODUCT = "SELECT product, SUM(amount) FROM transactions WHERE status = 'pending' GROUP BY product"
+_SQL_USER_HISTORY = "SELECT data FROM transactions WHERE user_id = ? ORDER BY created_at DESC LIMIT ?"
+_SQL_SALES_REPORT = (
+    "SELECT product, COUNT(*), SUM(amount), SUM(total_price) FROM transactions "
+    "WHERE status = 'success' AND created_at >= ? GROUP BY product"
+)
+
+
+class SqliteStorage:
+    """
+    Backend SQLite (WAL mode). Perubahan transaksi langsung di-upsert per
+    baris, produk yang berubah di-upsert saat flush. Pending stock, riwayat
+    user & laporan dijawab lewat query ber-index, bukan scan di Python.
+    Saat pertama dibuka, data JSON lama (products.json, transactions.json +
+    journal) dimigrasi sekali.
+    """
+
+    name = "sqlite"
+
+    def __init__(self, path: str, products_file: str, transactions_file: str, journal_file: str):
+        self.path = path
+        self.products_file = products_file
+        self.transactions_file = transactions_file
+        self.journal_file = journal_file
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(_SQLITE_SCHEMA)
+        self._migrate_schema()
+        self._migrate_from_json()
+
+    def _migrate_schema(self):
+        """Tambah kolom yang belum ada di database lama."""
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(products)")}
+        if "ttl_minutes" not in columns:
+            with self.conn:
+                self.conn.execute("ALTER TABLE products ADD COLUMN ttl_minutes INTEGER")
+
+    def _migrate_from_json(self):
+        row = self.conn.execute("SELECT value FROM meta WHERE key = 'json_migrated'").fetchone()
+        if row is not None:
+            return
+
+        products = load_products(self.products_file)
+        transactions = load_transactions(self.transactions_file)
+        sales = []
+
+        def apply_event(event):
+            apply_transaction_event(transactions, event)
+            sale = sale_stock_of(event, transactions)
+            if sale is not None:
+                sales.append(sale)
+
+        TransactionJournal(self.journal_file, self.transactions_file).replay(apply_event)
+        replay_sale_stock(products, sales)
+        with self.conn:
+            self.conn.executemany(_SQL_UPSERT_PRODUCT, [self._product_row(n, p) for n, p in products.items()])
+            self.conn.executemany(_SQL_UPSERT_TRANSACTION, [self._tx_row(i, t) for i, t in transactions.items()])
+            self.conn.execute(
+                "INSERT INTO meta (key, value) VALUES ('json_migrated', ?)",
+                (datetime.now().isoformat(),)
+            )
+        if products or transactions:
+            print(f"[SqliteStorage] Migrasi JSON -> {self.path}: {len(products)} produk, {len(transactions)} transaksi")
+
+    @staticmethod
+    def _product_row(name: str, pdata: dict) -> tuple:
+        return (
+            name, int(pdata.get("stock", 0)), int(pdata.get("price", 0)),
+            pdata.get("category"), pdata.get("ttl_minutes")
+        )
+
+    @staticmethod
+    def _tx_row(tx_id: str, tx: dict) -> tuple:
+        return (
+            str(tx_id),
+            tx.get("user_id"),
+            tx.get("product"),
+            int(tx.get("amount", 0)),
+            int(tx.get("total_price", 0)),
+            tx.get("status"),
+            tx.get("created_at"),
+            tx.get("processed_at"),
+            json.dumps(tx)
+        )
+
+    def load_products(self) -> dict:
+        products = {}
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT name, stock, price, category, ttl_minutes FROM products ORDER BY rowid"
+            ).fetchall()
+        for name, stock, price, category, ttl_minutes in rows:
+            pdata = {"stock": stock, "price": price}
+            if category:
+                pdata["category"] = category
+            if ttl_minutes is not None:
+                pdata["ttl_minutes"] = ttl_minutes
+            products[name] = pdata
+        return products
+
+    def load_transactions(self) -> dict:
+        with self._lock:
+            rows = self.conn.execute("SELECT id, data FROM transactions").fetchall()
+        return {tx_id: json.loads(data) for tx_id, data in rows}
+
+    def pending_by_product(self, transactions: dict) -> dict:
+        with self._lock:
+            rows = self.conn.execute(_SQL_PENDING_BY_PRODUCT).fetchall()
+        return {product: int(total) for product, total in rows if total}
+
+    def replay(self, apply_event):
+        pass
+
+    def record(self, event: dict, tx: dict):
+        if tx is None:
+            return
+        with self._lock, self.conn:
+            self.conn.execute(_SQL_UPSERT_TRANSACTION, self._tx_row(event.get("id"), tx))
+            # Stock penjualan ikut transaksi SQL yang sama dengan status success
+            if event.get("stock_after") is not None:
+                self.conn.execute(_SQL_SET_STOCK, (int(event["stock_after"]), tx.get("product")))
+
+    def prepare_products_save(self, products: dict, changed: set):
+        upserts = [self._product_row(name, products[name]) for name in changed if name in products]
+        deletes = [(name,) for name in changed if name not in products]
+
+        def save():
+            with self._lock, self.conn:
+                self.conn.executemany(_SQL_UPSERT_PRODUCT, upserts)
+                self.conn.executemany(_SQL_DELETE_PRODUCT, deletes)
+        return save
+
+    def compact_due(self) -> bool:
+        return False
+
+    def prepare_compaction(self, transactions: dict):
+        return None
+
+    def prepare_archive(self, transactions: dict, archived_ids: set):
+        rows = [(tx_id,) for tx_id in archived_ids]
+
+        def purge():
+            with self._lock, self.conn:
+                self.conn.executemany(_SQL_DELETE_TRANSACTION, rows)
+        return purge
+
+    def user_history(self, user_id: int, limit: int) -> list:
+        with self._lock:
+            rows = self.conn.execute(_SQL_USER_HISTORY, (user_id, limit)).fetchall()
+        return [json.loads(data) for (data,) in rows]
+
+    def sales_report(self, since: str) -> dict:
+        with self._lock:
+            rows = self.conn.execute(_SQL_SALES_REPORT, (since,)).fetchall()
+        return {
+            product: {"count": count, "amount": int(amount or 0), "total": int(total or 0)}
+            for product, count, amount, total in rows
+        }
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+
+def make_storage(settings):
+    """Backend storage untuk satu toko; path file diambil dari `settings` (GuildSettings)."""
+    if config.STORAGE_BACKEND == "sqlite":
+        return SqliteStorage(settings.SQLITE_FILE, settings.PRODUCTS_FILE, settings.TRANSACTIONS_FILE, settings.TRANSACTIONS_JOURNAL_FILE)
+    if config.STORAGE_BACKEND != "json":
+        print(f"[make_storage] STORAGE_BACKEND '{config.STORAGE_BACKEND}' tidak dikenal, pakai json.")
+    return JsonStorage(settings.PRODUCTS_FILE, settings.TRANSACTIONS_FILE, settings.TRANSACTIONS_JOURNAL_FILE, config.JOURNAL_COMPACT_EVERY)
@@ -0,0 +1,643 @@
+import asyncio
+import bisect
+import functools
+import heapq
+import itertools
+import time
+from datetime import datetime, timedelta
+
+from .config import config
+from .metrics import metrics
+from .storage import (
+    StockReservation,
+    TransactionArchive,
+    apply_transaction_event,
+    build_pending_index,
+    make_storage,
+    replay_sale_stock,
+    sale_stock_of
+)
+
+
+# ============================================
+# INDEX NAMA PRODUK (AUTOCOMPLETE & PENCARIAN)
+# ============================================
+class ProductNameIndex:
+    """
+    Index nama produk di memory, di-update incremental saat produk ditambah /
+    dihapus / di-rename:
+    - list nama (lowercase) terurut untuk prefix match lewat bisect
+    - n-gram (1-3 karakter) -> set nama, untuk substring match
+
+    search() mengurutkan prefix match di depan substring match, hasilnya
+    di-cache per query sampai index berubah.
+    """
+
+    MAX_GRAM = 3
+    CACHE_SIZE = 1024
+
+    def __init__(self, names=()):
+        self._order = {}
+        self._sorted = []
+        self._grams = {}
+        self._cache = {}
+        self.cache_hits = 0
+        self.cache_misses = 0
+        for name in names:
+            self.add(name)
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    @classmethod
+    def _grams_of(cls, lowered: str) -> set:
+        return {
+            lowered[i:i + n]
+            for n in range(1, cls.MAX_GRAM + 1)
+            for i in range(len(lowered) - n + 1)
+        }
+
+    def add(self, name: str):
+        if name in self._order:
+            return
+        self._order[name] = None
+        lowered = name.lower()
+        bisect.insort(self._sorted, (lowered, name))
+        for gram in self._grams_of(lowered):
+            self._grams.setdefault(gram, set()).add(name)
+        self._cache.clear()
+
+    def remove(self, name: str):
+        if name not in self._order:
+            return
+        del self._order[name]
+        lowered = name.lower()
+        i = bisect.bisect_left(self._sorted, (lowered, name))
+        if i < len(self._sorted) and self._sorted[i][1] == name:
+            del self._sorted[i]
+        for gram in self._grams_of(lowered):
+            names = self._grams.get(gram)
+            if names is not None:
+                names.discard(name)
+                if not names:
+                    del self._grams[gram]
+        self._cache.clear()
+
+    def rename(self, old: str, new: str):
+        self.remove(old)
+        self.add(new)
+
+    def _substring_matches(self, q: str) -> set:
+        if len(q) <= self.MAX_GRAM:
+            return self._grams.get(q, set())
+
+        grams = []
+        for i in range(len(q) - self.MAX_GRAM + 1):
+            names = self._grams.get(q[i:i + self.MAX_GRAM])
+            if not names:
+                return set()
+            grams.append(names)
+        grams.sort(key=len)
+        candidates = grams[0].intersection(*grams[1:])
+        return {name for name in candidates if q in name.lower()}
+
+    def search(self, query: str, limit: int = 25) -> list:
+        q = query.strip().lower()
+        key = (q, limit)
+        cached = self._cache.get(key)
+        if cached is not None:
+            self.cache_hits += 1
+            return cached
+        self.cache_misses += 1
+
+        if not q:
+            result = list(itertools.islice(self._order, limit))
+        else:
+            result = []
+            i = bisect.bisect_left(self._sorted, (q,))
+            while i < len(self._sorted) and len(result) < limit:
+                lowered, name = self._sorted[i]
+                if not lowered.startswith(q):
+                    break
+                result.append(name)
+                i += 1
+
+            if len(result) < limit:
+                prefix = set(result)
+                contains = (name for name in self._substring_matches(q) if name not in prefix)
+                result.extend(heapq.nsmallest(limit - len(result), contains, key=lambda n: (n.lower(), n)))
+
+        if len(self._cache) >= self.CACHE_SIZE:
+            self._cache.clear()
+        self._cache[key] = result
+        return result
+
+# ============================================
+# DATA STORE (IN-MEMORY + WRITE-BEHIND)
+# ============================================
+class DataStore:
+    """
+    Satu-satunya sumber data products & transactions selama bot jalan.
+    Data dibaca sekali dari storage backend (JsonStorage / SqliteStorage)
+    saat startup, semua read dilayani dari memory.
+
+    - Products: ubah lewat put_product() / update_product() / delete_product();
+      flush ke backend dilakukan background task tiap `flush_interval` detik atau
+      begitu jumlah perubahan mencapai `dirty_threshold`. Untuk cache tampilan:
+      `product_revs[nama]` naik tiap produk itu berubah, `catalog_version`
+      naik kalau produk ditambah/dihapus/ganti kategori. `name_index` dipakai
+      untuk autocomplete & pencarian nama produk.
+    - Transactions: ubah lewat create_transaction() / set_transaction_status(),
+      yang langsung di-persist ke backend (JSON: append event ke journal,
+      snapshot transactions.json hanya ditulis ulang saat compaction). Event
+      success membawa `stock_after`, jadi stock hasil penjualan ikut tersimpan
+      atomik bersama statusnya walau produk sendiri ditulis write-behind.
+    - `pending` adalah index {nama produk: total amount transaksi pending},
+      di-update tiap event transaksi, jadi cek stock tersedia cukup O(1).
+    - `holds` adalah stock yang sedang ditahan pembelian yang ticket-nya belum
+      jadi (lihat reserve()). Ikut dihitung sebagai pending.
+    - Transaksi selesai yang lebih tua dari `retention_days` dipindah ke
+      `archive` (TransactionArchive) tiap `archive_interval` detik dari flush
+      loop. `transactions` hanya berisi ticket aktif & yang baru selesai;
+      user_history() & sales_report() ikut membaca arsip secara streaming.
+    - Ticket pending punya `expires_at` (TTL per produk, default
+      `ticket_ttl_minutes`). Deadline-nya disimpan di min-heap (lazy delete:
+      entry yang transaksinya sudah diproses dibuang saat sampai di puncak),
+      jadi TicketExpiry cukup melihat next_expiry() tanpa scan transaksi.
+    """
+
+    def __init__(self, backend, flush_interval: float, dirty_threshold: int,
+                 archive: TransactionArchive = None, retention_days: int = 0, archive_interval: float = 3600,
+                 ticket_ttl_minutes: int = 0):
+        self.backend = backend
+        self.flush_interval = flush_interval
+        self.dirty_threshold = max(1, dirty_threshold)
+        self.products: dict = {}
+        self.catalog_version = 0
+        self.product_revs: dict = {}
+        self.name_index = ProductNameIndex()
+        self.transactions: dict = {}
+        self.pending: dict = {}
+        self.holds: dict = {}
+        # Ticket pending per pembeli {user_id: {tx_id}} & pembelian yang channel-nya sedang dibuat {user_id: n}
+        self.open_tickets: dict = {}
+        self.opening: dict = {}
+        self.archive = archive
+        self.retention_days = retention_days
+        self.archive_interval = archive_interval
+        self.archived = 0
+        self._next_archive = 0.0
+        self.ticket_ttl_minutes = ticket_ttl_minutes
+        # Min-heap (deadline epoch, tx_id) ticket pending; di-set saat deadline terdekat berubah
+        self._expiry: list = []
+        self.expiry_wakeup = None
+        # Waktu load (epoch): TTL ticket lama yang belum punya expires_at dihitung dari sini
+        self.loaded_at = time.time()
+        self._changed_products: set = set()
+        self._dirty_count = 0
+        self._wakeup = None
+        self._task = None
+
+    def load(self):
+        self.products = self.backend.load_products()
+        self.name_index = ProductNameIndex(self.products)
+        self.transactions = self.backend.load_transactions()
+        self.pending = self.backend.pending_by_product(self.transactions)
+        sales = []
+
+        def apply_event(event):
+            self._apply(event)
+            sale = sale_stock_of(event, self.transactions)
+            if sale is not None:
+                sales.append(sale)
+
+        self.backend.replay(apply_event)
+        # Stock dari penjualan yang belum sempat masuk products.json; ikut flush berikutnya
+        self._changed_products |= replay_sale_stock(self.products, sales)
+        self.verify_pending_index()
+        self._expiry = []
+        self.open_tickets = {}
+        self.loaded_at = time.time()
+        for tx_id, tx in self.transactions.items():
+            self._index_expiry(tx_id, tx)
+            self._index_open(tx_id, tx, 1)
+
+    # ---------- products ----------
+    def put_product(self, name: str, stock: int, price: int, category: str = None) -> bool:
+        """Tambah / timpa produk. Kategori lama dipertahankan kalau `category` None. Return True kalau produk baru."""
+        old = self.products.get(name)
+        is_new = old is None
+        if category is None and old is not None:
+            category = old.get("category")
+
+        pdata = {"stock": stock, "price": price}
+        if category:
+            pdata["category"] = category
+        for key in ("ttl_minutes", "last_sale"):
+            if old is not None and key in old:
+                pdata[key] = old[key]
+        self.products[name] = pdata
+        if is_new:
+            self.name_index.add(name)
+        self._product_changed(name, structural=is_new or (old.get("category") != category))
+        return is_new
+
+    def update_product(self, name: str, **fields):
+        self.products[name].update(fields)
+        self._product_changed(name, structural="category" in fields)
+
+    def apply_bulk(self, changes: list):
+        """
+        Terapkan hasil plan_bulk_update() [(nama, lama, baru)] sekaligus. Tidak
+        ada await di tengahnya (handler lain tidak melihat katalog setengah jadi)
+        dan semua produk ikut satu flush ke disk.
+        """
+        for name, _, new in changes:
+            self.put_product(name, new["stock"], new["price"], new.get("category"))
+        if changes:
+            self._wake()
+
+    def set_ticket_ttl(self, name: str, minutes: int = None):
+        """TTL ticket pending untuk produk ini (menit, 0 = tidak kedaluwarsa). None = ikut default."""
+        if minutes is None:
+            self.products[name].pop("ttl_minutes", None)
+        else:
+            self.products[name]["ttl_minutes"] = max(0, int(minutes))
+        self._product_changed(name)
+
+    def ticket_ttl(self, name: str) -> int:
+        """TTL ticket pending produk ini dalam detik (0 = tidak kedaluwarsa)."""
+        minutes = (self.products.get(name) or {}).get("ttl_minutes")
+        if minutes is None:
+            minutes = self.ticket_ttl_minutes
+        return max(0, int(minutes)) * 60
+
+    def delete_product(self, name: str):
+        del self.products[name]
+        self.product_revs.pop(name, None)
+        self.name_index.remove(name)
+        self._product_changed(name, structural=True)
+
+    def _product_changed(self, name: str, structural: bool = False):
+        if name in self.products:
+            self.product_revs[name] = self.product_revs.get(name, 0) + 1
+        if structural:
+            self.catalog_version += 1
+        self._changed_products.add(name)
+        self._dirty_count += 1
+        if self._dirty_count >= self.dirty_threshold:
+            self._wake()
+
+    # ---------- transactions ----------
+    def ticket_expires_at(self, product_name: str):
+        """expires_at (ISO) untuk ticket pending baru produk ini, atau None kalau tidak kedaluwarsa."""
+        ttl = self.ticket_ttl(product_name)
+        return (datetime.now() + timedelta(seconds=ttl)).isoformat() if ttl else None
+
+    def create_transaction(self, tx_id, tx: dict):
+        if tx.get("status") == "pending" and "expires_at" not in tx:
+            expires_at = self.ticket_expires_at(tx.get("product"))
+            if expires_at:
+                tx["expires_at"] = expires_at
+        self._record({"event": "created", "id": str(tx_id), "tx": tx})
+
+    def set_transaction_status(self, tx_id, status: str, processed_by: int = None, reason: str = None,
+                               stock_after: int = None):
+        event = {
+            "event": status,
+            "id": str(tx_id),
+            "processed_by": processed_by,
+            "processed_at": datetime.now().isoformat()
+        }
+        if reason:
+            event["reason"] = reason
+        if stock_after is not None:
+            event["stock_after"] = stock_after
+        self._record(event)
+
+    def _record(self, event: dict):
+        self._apply(event)
+        with metrics.timer("record_seconds", backend=type(self.backend).__name__):
+            self.backend.record(event, self.transactions.get(str(event.get("id"))))
+        if self.backend.compact_due():
+            self._wake()
+
+    def _apply(self, event: dict):
+        tx_id = str(event.get("id"))
+        self._index_pending(self.transactions.get(tx_id), -1)
+        self._index_open(tx_id, self.transactions.get(tx_id), -1)
+        apply_transaction_event(self.transactions, event)
+        tx = self.transactions.get(tx_id)
+        self._index_pending(tx, 1)
+        self._index_open(tx_id, tx, 1)
+        if event.get("event") == "created":
+            self._index_expiry(tx_id, tx)
+
+    # ---------- expiry ticket pending ----------
+    def _deadline(self, tx: dict):
+        """Deadline (epoch) ticket pending, atau None kalau tidak kedaluwarsa."""
+        expires_at = tx.get("expires_at")
+        try:
+            if expires_at:
+                return datetime.fromisoformat(expires_at).timestamp()
+            # Ticket lama (sebelum ada expires_at): TTL mulai dihitung saat store di-load, bukan dari
+            # created_at, supaya upgrade tidak langsung membatalkan semua ticket pending yang sudah lama
+            ttl = self.ticket_ttl(tx.get("product"))
+            if ttl:
+                return self.loaded_at + ttl
+        except ValueError:
+            pass
+        return None
+
+    def _index_expiry(self, tx_id: str, tx: dict):
+        if not tx or tx.get("status") != "pending":
+            return
+        deadline = self._deadline(tx)
+        if deadline is None:
+            return
+        heapq.heappush(self._expiry, (deadline, tx_id))
+        if self._expiry[0][1] == tx_id and self.expiry_wakeup is not None:
+            self.expiry_wakeup.set()
+
+    def next_expiry(self):
+        """Deadline (epoch) ticket pending terdekat, atau None. Entry yang sudah tidak pending dibuang."""
+        heap = self._expiry
+        while heap:
+            tx = self.transactions.get(heap[0][1])
+            if tx is not None and tx.get("status") == "pending":
+                return heap[0][0]
+            heapq.heappop(heap)
+        return None
+
+    def pop_expired(self, now: float) -> list:
+        """Keluarkan id ticket pending yang deadline-nya <= now (epoch) dari heap."""
+        expired = []
+        while True:
+            deadline = self.next_expiry()
+            if deadline is None or deadline > now:
+                return expired
+            expired.append(heapq.heappop(self._expiry)[1])
+
+    # ---------- pending index ----------
+    def _index_pending(self, tx, sign: int):
+        if not tx or tx.get("status") != "pending":
+            return
+        product = tx.get("product")
+        total = self.pending.get(product, 0) + sign * int(tx.get("amount", 0))
+        if total:
+            self.pending[product] = total
+        else:
+            self.pending.pop(product, None)
+
+    def _index_open(self, tx_id: str, tx, sign: int):
+        if not tx or tx.get("status") != "pending" or tx.get("user_id") is None:
+            return
+        user_id = int(tx["user_id"])
+        tickets = self.open_tickets.setdefault(user_id, set())
+        if sign > 0:
+            tickets.add(tx_id)
+        else:
+            tickets.discard(tx_id)
+            if not tickets:
+                del self.open_tickets[user_id]
+
+    def open_ticket_ids(self, user_id: int) -> list:
+        """Id ticket (channel) pending milik pembeli ini, urut dari yang paling lama."""
+        return sorted(self.open_tickets.get(user_id, ()), key=int)
+
+    def pending_stock(self, product_name: str) -> int:
+        return self.pending.get(product_name, 0) + self.holds.get(product_name, 0)
+
+    def available_stock(self, product_name: str) -> int:
+        product = self.products.get(product_name) or {}
+        return int(product.get("stock", 0)) - self.pending_stock(product_name)
+
+    # ---------- reservasi stock ----------
+    # Semua method di bawah sinkron (tidak ada await di dalamnya), jadi di
+    # event loop asyncio cek + ubah data selalu terjadi sebagai satu langkah
+    # atomik: dua pembelian bersamaan tidak bisa lolos cek stock yang sama.
+    def reserve(self, product_name: str, amount: int, user_id: int = None):
+        """
+        Tahan `amount` stock produk. Return StockReservation, atau None kalau
+        stock tidak cukup. Dengan `user_id`, pembelian ini ikut dihitung di
+        `opening` sampai di-commit / di-rollback.
+        """
+        if amount <= 0 or product_name not in self.products:
+            return None
+        if self.available_stock(product_name) < amount:
+            return None
+        self.holds[product_name] = self.holds.get(product_name, 0) + amount
+        if user_id is not None:
+            self.opening[user_id] = self.opening.get(user_id, 0) + 1
+        return StockReservation(self, product_name, amount, user_id)
+
+    def _release_hold(self, product_name: str, amount: int, user_id: int = None):
+        total = self.holds.get(product_name, 0) - amount
+        if total > 0:
+            self.holds[product_name] = total
+        else:
+            self.holds.pop(product_name, None)
+        if user_id is not None:
+            opening = self.opening.get(user_id, 0) - 1
+            if opening > 0:
+                self.opening[user_id] = opening
+            else:
+                self.opening.pop(user_id, None)
+
+    def complete_sale(self, tx_id, processed_by: int) -> int:
+        """
+        Tandai transaksi sukses & kurangi stock produk. Sisa stock ikut di event
+        success (satu append / satu transaksi SQL), jadi kalau proses mati
+        sebelum flush produk, reload tetap melihat stock yang sudah berkurang.
+        Return sisa stock.
+        """
+        tx = self.transactions[str(tx_id)]
+        product_name = tx.get("product")
+        product = self.products.get(product_name)
+        if product is None:
+            self.set_transaction_status(tx_id, "success", processed_by)
+            return 0
+        remaining = max(0, int(product.get("stock", 0)) - int(tx.get("amount", 0)))
+        self.set_transaction_status(tx_id, "success", processed_by, stock_after=remaining)
+        self.update_product(product_name, stock=remaining, last_sale=str(tx_id))
+        return remaining
+
+    def verify_pending_index(self) -> dict:
+        """
+        Bangun ulang index pending dari transaksi lalu bandingkan dengan index
+        yang di-maintain incremental. Drift dilaporkan lalu index diganti
+        dengan hasil rebuild. Return {produk: (index_lama, seharusnya)}.
+        """
+        rebuilt = build_pending_index(self.transactions)
+        drift = {
+            name: (self.pending.get(name, 0), rebuilt.get(name, 0))
+            for name in set(self.pending) | set(rebuilt)
+            if self.pending.get(name, 0) != rebuilt.get(name, 0)
+        }
+        for name, (indexed, actual) in drift.items():
+            print(f"[DataStore] Drift pending index {name}: index={indexed}, transaksi={actual}")
+        self.pending = rebuilt
+        return drift
+
+    # ---------- arsip ----------
+    def take_archivable(self, cutoff: str) -> dict:
+        """Keluarkan transaksi success / cancelled yang selesai sebelum `cutoff` dari working set."""
+        batch = {
+            tx_id: tx for tx_id, tx in self.transactions.items()
+            if tx.get("status") in ("success", "cancelled")
+            and (tx.get("processed_at") or tx.get("created_at") or "") < cutoff
+        }
+        for tx_id in batch:
+            del self.transactions[tx_id]
+        return batch
+
+    async def archive_completed(self) -> int:
+        """Pindahkan transaksi selesai yang lewat masa retensi ke arsip. Return jumlah yang dipindah."""
+        if self.archive is None or self.retention_days <= 0:
+            return 0
+        cutoff = (datetime.now() - timedelta(days=self.retention_days)).isoformat()
+        batch = self.take_archivable(cutoff)
+        if not batch:
+            return 0
+
+        # Snapshot / purge disiapkan di event loop, setelah batch keluar dari working set.
+        # Produk di-snapshot di titik yang sama: journal yang di-rotate ikut membuang stock_after
+        changed, save_products = self._take_products_snapshot()
+        purge = self.backend.prepare_archive(self.transactions, set(batch))
+        try:
+            with metrics.timer("flush_seconds", step="archive"):
+                await asyncio.to_thread(self._run_steps, save_products, functools.partial(self.archive.write, batch))
+        except Exception:
+            # Arsip gagal ditulis: transaksi tetap di working set (dan di storage)
+            self.transactions.update(batch)
+            if changed:
+                self._changed_products |= changed
+            raise
+        with metrics.timer("flush_seconds", step="archive_purge"):
+            await asyncio.to_thread(purge)
+        self.archived += len(batch)
+        return len(batch)
+
+    # ---------- query / laporan ----------
+    async def user_history(self, user_id: int, limit: int = 10) -> list:
+        history = self.backend.user_history(user_id, limit)
+        if self.archive is None:
+            return history
+
+        # Kalau working set sudah cukup, arsip hanya dibaca sampai bulan transaksi tertua yang ketemu
+        since = None
+        if len(history) >= limit:
+            since = min(t.get("created_at") or "" for t in history) or None
+        archived = await asyncio.to_thread(
+            self.archive.user_history, user_id, limit, since, frozenset(self.transactions)
+        )
+        history.extend(archived)
+        history.sort(key=lambda t: t.get("created_at") or "", reverse=True)
+        return history[:limit]
+
+    async def sales_report(self, since: str) -> dict:
+        report = self.backend.sales_report(since)
+        if self.archive is None:
+            return report
+        return await asyncio.to_thread(self.archive.sales_report, since, report, frozenset(self.transactions))
+
+    # ---------- flush ----------
+    def _wake(self):
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def _take_products_snapshot(self):
+        """Snapshot produk yang berubah di event loop (data tidak berubah di tengah serialize)."""
+        if not self._changed_products:
+            return None, None
+        changed, self._changed_products = self._changed_products, set()
+        self._dirty_count = 0
+        return changed, self.backend.prepare_products_save(self.products, changed)
+
+    @staticmethod
+    def _run_steps(*steps):
+        for step in steps:
+            if step is not None:
+                step()
+
+    def flush_now(self):
+        """Flush + compaction sinkron, dipakai saat shutdown."""
+        _, save = self._take_products_snapshot()
+        if save is not None:
+            save()
+        compact = self.backend.prepare_compaction(self.transactions)
+        if compact is not None:
+            compact()
+        self.backend.close()
+
+    async def flush(self):
+        changed, save = self._take_products_snapshot()
+        if save is not None:
+            try:
+                with metrics.timer("flush_seconds", step="products"):
+                    await asyncio.to_thread(save)
+            except Exception:
+                # Gagal tulis: tandai dirty lagi supaya dicoba di flush berikutnya
+                self._changed_products |= changed
+                raise
+
+        if self.backend.compact_due():
+            # Stock dari event success di journal yang di-rotate harus sudah di products.json
+            # sebelum snapshot transaksi menggantikan journal itu: produk ditulis dulu
+            changed, save = self._take_products_snapshot()
+            compact = self.backend.prepare_compaction(self.transactions)
+            try:
+                with metrics.timer("flush_seconds", step="compaction"):
+                    await asyncio.to_thread(self._run_steps, save, compact)
+            except Exception:
+                if changed:
+                    self._changed_products |= changed
+                raise
+
+        if self.archive is not None and time.monotonic() >= self._next_archive:
+            self._next_archive = time.monotonic() + self.archive_interval
+            archived = await self.archive_completed()
+            if archived:
+                print(f"[DataStore] {archived} transaksi diarsip, {len(self.transactions)} transaksi aktif")
+
+    def start(self):
+        if self._task is not None and not self._task.done():
+            return
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._flush_loop())
+
+    async def _flush_loop(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+            try:
+                await self.flush()
+            except Exception as e:
+                print(f"[DataStore] Error flush: {e}")
+
+    async def close(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self.flush_now()
+
+
+def create_store(settings) -> DataStore:
+    """Buat & load DataStore satu toko. Metrik agregat semua toko didaftarkan di guilds.py."""
+    data_store = DataStore(
+        make_storage(settings), config.STORE_FLUSH_INTERVAL, config.STORE_DIRTY_THRESHOLD,
+        archive=TransactionArchive(settings.ARCHIVE_DIR),
+        retention_days=config.TRANSACTION_RETENTION_DAYS,
+        archive_interval=config.ARCHIVE_INTERVAL,
+        ticket_ttl_minutes=config.TICKET_TTL_MINUTES
+    )
+    data_store.load()
+    return data_store
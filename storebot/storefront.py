@@ -0,0 +1,338 @@
+import asyncio
+import hashlib
+import json
+
+import discord
+
+from .config import SOLD_EMOJI
+from .formatting import rupiah
+from .outbound import outbound
+from .storage import load_main_message, save_main_message
+
+
+# ============================================
+# EMBED UTAMA MULTI-PRODUK (PER HALAMAN)
+# ============================================
+STOREFRONT_TITLE = "<a:ToaJoget:1442231853007507567> STORE ITEM FISH IT BY KAEPBLOX <a:ToaJoget:1442231853007507567>"
+STOREFRONT_FOOTER = "KaepBlox • Ikan Secret Tumbal"
+# Batas description embed Discord
+EMBED_DESCRIPTION_LIMIT = 4096
+# Stock & harga terbesar yang diperhitungkan saat memotong halaman (12 digit)
+WORST_CASE_NUMBER = 10 ** 12 - 1
+
+
+def product_lines(name: str, pdata: dict) -> list:
+    """Baris description satu produk di embed storefront (termasuk baris kosong pemisah)."""
+    stock = int(pdata.get("stock", 0))
+    price = int(pdata.get("price", 0))
+
+    stock_display = SOLD_EMOJI if stock <= 0 else str(stock)
+    price_display = rupiah(price)
+
+    return [
+        f"**{name}**",
+        f"<a:PANAHBIRU:1437484514921283676>  Stock : {stock_display}",
+        f"<a:PANAHBIRU:1437484514921283676>  Price : Rp{price_display} <:duit:1433825063333003275>",
+        ""
+    ]
+
+
+def product_block_length(name: str) -> int:
+    """Panjang maksimum blok satu produk di description, berapa pun stock & harganya (sampai 12 digit)."""
+    worst = {"stock": WORST_CASE_NUMBER, "price": WORST_CASE_NUMBER}
+    return sum(len(line) + 1 for line in product_lines(name, worst))
+
+
+def build_product_embed(products: dict, names: list, footer: str = STOREFRONT_FOOTER,
+                        title: str = STOREFRONT_TITLE) -> discord.Embed:
+    embed = discord.Embed(
+        title=title,
+        color=discord.Color.from_rgb(15, 15, 25)
+    )
+
+    if not names:
+        embed.description = (
+            "Belum ada produk terdaftar.\n"
+            "Admin bisa menambahkan produk dengan command `/addproduct`."
+        )
+        embed.set_footer(text=footer)
+        return embed
+
+    lines = []
+    for name in names:
+        lines.extend(product_lines(name, products[name]))
+
+    embed.description = "\n".join(lines).strip()
+    embed.set_footer(text=footer)
+
+    return embed
+
+
+def build_product_options(products: dict, names: list) -> list:
+    options = []
+    for name in names:
+        pdata = products[name]
+        stock = int(pdata.get("stock", 0))
+        price = int(pdata.get("price", 0))
+        options.append(
+            discord.SelectOption(
+                label=name[:100],
+                value=name,
+                description=f"Stock: {stock} • Rp{rupiah(price)}"
+            )
+        )
+    return options
+
+
+class StorefrontPage:
+    """Satu halaman storefront yang sudah di-render (embed + opsi select)."""
+
+    def __init__(self, category, index: int, total_pages: int, names: list, signature: tuple,
+                 embed: discord.Embed, options: list, navigable: bool = True):
+        self.category = category
+        self.index = index
+        self.total_pages = total_pages
+        self.names = names
+        self.signature = signature
+        self.embed = embed
+        self.options = options
+        self.navigable = navigable
+
+
+class StorefrontPages:
+    """
+    Render storefront per halaman: maks `page_size` produk (batas 25 opsi
+    select), dan halaman ditutup lebih awal kalau blok produk berikutnya bisa
+    membuat description lewat 4096 karakter. Batas halaman dihitung dari nama
+    produk dengan stock & harga terpanjang, jadi hanya berubah bersama
+    catalog_version, bukan tiap stock berubah. Halaman di-render lazy saat
+    diminta dan di-cache per (kategori, index). Signature halaman adalah
+    revisi produk-produk di dalamnya, jadi kalau stock satu produk berubah
+    hanya halaman yang memuat produk itu yang di-render ulang.
+    Tambah/hapus produk atau ganti kategori (catalog_version) mereset semua.
+    Satu instance per toko, membaca DataStore toko itu.
+    """
+
+    def __init__(self, store, page_size: int):
+        self.store = store
+        self.page_size = page_size
+        self.builds = 0
+        self.hits = 0
+        self.edits_saved = 0
+        self._catalog_version = None
+        self._categories = []
+        self._names = {}
+        self._starts = {}
+        self._pages = {}
+        self._main_view = None
+        self._main_view_page = None
+
+    def _sync_catalog(self):
+        store = self.store
+        if self._catalog_version == store.catalog_version:
+            return
+        self._catalog_version = store.catalog_version
+        self._names = {}
+        self._starts = {}
+        self._pages = {}
+        categories = {pdata.get("category") for pdata in store.products.values()}
+        self._categories = sorted(c for c in categories if c)
+
+    def categories(self) -> list:
+        self._sync_catalog()
+        return self._categories
+
+    def names(self, category: str = None) -> list:
+        self._sync_catalog()
+        names = self._names.get(category)
+        if names is None:
+            products = self.store.products
+            if category is None:
+                names = list(products)
+            else:
+                names = [n for n, pdata in products.items() if pdata.get("category") == category]
+            self._names[category] = names
+        return names
+
+    def fit(self, names: list) -> int:
+        """Jumlah produk dari awal `names` yang muat di satu halaman."""
+        length = 0
+        for count, name in enumerate(names[:self.page_size]):
+            length += product_block_length(name)
+            if count and length > EMBED_DESCRIPTION_LIMIT:
+                return count
+        return min(len(names), self.page_size)
+
+    def _page_starts(self, category: str = None) -> list:
+        starts = self._starts.get(category)
+        if starts is None:
+            names = self.names(category)
+            starts = [0]
+            while True:
+                end = starts[-1] + self.fit(names[starts[-1]:])
+                if end >= len(names):
+                    break
+                starts.append(end)
+            self._starts[category] = starts
+        return starts
+
+    def page_count(self, category: str = None) -> int:
+        return len(self._page_starts(category))
+
+    def page(self, category: str = None, index: int = 0) -> StorefrontPage:
+        names = self.names(category)
+        starts = self._page_starts(category)
+        total_pages = len(starts)
+        index %= total_pages
+        end = starts[index + 1] if index + 1 < total_pages else len(names)
+        page_names = names[starts[index]:end]
+        signature = tuple(self.store.product_revs.get(n, 0) for n in page_names)
+
+        cached = self._pages.get((category, index))
+        if cached is not None and cached.signature == signature:
+            self.hits += 1
+            return cached
+
+        footer = STOREFRONT_FOOTER
+        if category:
+            footer += f" • {category}"
+        if total_pages > 1:
+            footer += f" • Halaman {index + 1}/{total_pages}"
+
+        page = StorefrontPage(
+            category, index, total_pages, page_names, signature,
+            embed=build_product_embed(self.store.products, page_names, footer=footer),
+            options=build_product_options(self.store.products, page_names)
+        )
+        self._pages[(category, index)] = page
+        self.builds += 1
+        return page
+
+    def search_page(self, query: str) -> StorefrontPage:
+        """Halaman hasil pencarian (tidak di-cache). Prefix match dulu, lalu yang mengandung query."""
+        names = self.store.name_index.search(query, self.page_size)
+        names = names[:self.fit(names)]
+        return StorefrontPage(
+            None, 0, 1, names, (),
+            embed=build_product_embed(self.store.products, names, title=f"🔍 Hasil pencarian: {query}"[:256]),
+            options=build_product_options(self.store.products, names),
+            navigable=False
+        )
+
+    def main_view(self) -> discord.ui.View:
+        """View persistent untuk message utama (halaman pertama), dibangun ulang hanya kalau halamannya berubah."""
+        page = self.page(None, 0)
+        if self._main_view is None or self._main_view_page is not page:
+            # Import di sini: views juga memakai storefront
+            from .views import StorefrontView
+            self._main_view = StorefrontView(page, persistent=True, categories=self.categories())
+            self._main_view_page = page
+        return self._main_view
+
+
+def storefront_fingerprint(embed: discord.Embed, view: discord.ui.View) -> str:
+    """Hash isi embed + komponen view, untuk skip edit kalau tampilan tidak berubah."""
+    payload = json.dumps([embed.to_dict(), view.to_components()], sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode()).hexdigest()
+
+
+class StorefrontRefresher:
+    """
+    Refresh embed utama di background. Perubahan produk cukup memanggil
+    mark_dirty(); semua perubahan dalam `window` detik digabung jadi satu edit.
+    Object discord.Message di-cache (tidak fetch ulang tiap refresh) dan edit
+    di-skip kalau hasil render sama dengan yang terakhir dikirim. Fingerprint
+    itu ikut disimpan di file main message toko (`path`) supaya tetap berlaku
+    setelah restart.
+    """
+
+    def __init__(self, pages: StorefrontPages, path: str, window: float):
+        self.pages = pages
+        self.path = path
+        self.window = window
+        self.message = None
+        self.last_fingerprint = None
+        self.edits = 0
+        self.skipped = 0
+        self._client = None
+        self._dirty = None
+        self._task = None
+
+    def start(self, client: discord.Client):
+        self._client = client
+        if self._task is not None and not self._task.done():
+            return
+        self._dirty = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+
+    async def close(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def set_message(self, message: discord.Message, fingerprint: str = None):
+        self.message = message
+        self.last_fingerprint = fingerprint
+
+    def mark_dirty(self):
+        if self._dirty is not None:
+            self._dirty.set()
+
+    async def _run(self):
+        while True:
+            await self._dirty.wait()
+            await asyncio.sleep(self.window)
+            self._dirty.clear()
+            try:
+                await self.refresh_now()
+            except Exception as e:
+                print(f"[StorefrontRefresher] Error: {e}")
+
+    async def _resolve_message(self):
+        if self.message is not None:
+            return self.message
+
+        state = load_main_message(self.path)
+        if not state or self._client is None:
+            return None
+        channel = self._client.get_channel(state.get("channel_id"))
+        if not channel:
+            return None
+        try:
+            self.message = await outbound.submit(
+                "background", f"message:{channel.id}",
+                lambda: channel.fetch_message(state.get("message_id"))
+            )
+        except discord.HTTPException:
+            return None
+        return self.message
+
+    async def refresh_now(self):
+        embed = self.pages.page(None, 0).embed
+        view = self.pages.main_view()
+        fingerprint = storefront_fingerprint(embed, view)
+        if fingerprint == self.last_fingerprint:
+            self.skipped += 1
+            return
+
+        msg = await self._resolve_message()
+        if msg is None:
+            return
+        try:
+            await outbound.submit(
+                "background", f"message:{msg.channel.id}",
+                lambda: msg.edit(embed=embed, view=view),
+                key=f"edit:{msg.id}"
+            )
+        except discord.NotFound:
+            # Message utama dihapus: buang cache, nanti di-resolve ulang
+            self.message = None
+            self.last_fingerprint = None
+            return
+        self.last_fingerprint = fingerprint
+        self.edits += 1
+        save_main_message(self.path, msg.channel.id, msg.id, fingerprint)
@@ -0,0 +1,743 @@
+import asyncio
+import functools
+import json
+import time
+import uuid
+from datetime import datetime
+
+import discord
+
+from .config import config
+from .formatting import rupiah
+from .lazy import LazyObject
+from .metrics import metrics
+from .outbound import TokenBucket, outbound
+from .scheduler import scheduler
+from .storage import write_json_atomic
+
+
+# ============================================
+# KATEGORI & POOL CHANNEL TICKET
+# ============================================
+class TicketCategoryManager:
+    """
+    Kategori ticket satu toko. Discord membatasi 50 channel per kategori,
+    jadi kalau kategori utama (TICKET_CATEGORY_ID / "TICKETS") penuh, ticket
+    baru tumpah ke kategori overflow "TICKETS-2", "TICKETS-3", ... yang dibuat
+    otomatis. Kategori cukup dicari sekali (lalu di-cache per id, dicek
+    lewat get_channel yang O(1)) dan isinya dihitung sendiri: +1 saat channel
+    dibuat lewat create_channel(), -1 saat channel dihapus (forget()), jadi
+    jalur pembelian tidak pernah men-scan guild.categories / category.channels.
+
+    Kategori overflow yang kosong dijadwalkan dihapus `reclaim_delay` detik
+    kemudian (job "reclaim_ticket_category"), dicek ulang dulu sebelum dihapus.
+    """
+
+    BASE_NAME = "TICKETS"
+    LIMIT = 50
+
+    def __init__(self, category_id: int = 0, reclaim_delay: float = 300):
+        self.category_id = category_id
+        self.reclaim_delay = reclaim_delay
+        self.guild = None
+        # Urutan isi: kategori utama dulu, lalu overflow sesuai nomor
+        self.category_ids: list = []
+        self.occupancy: dict = {}
+        self.created = 0
+        self.reclaimed = 0
+        self._lock = asyncio.Lock()
+
+    def reset(self, category_id: int = None):
+        """Lupakan cache (mis. setting kategori diganti); dicari ulang saat ticket berikutnya."""
+        if category_id is not None:
+            self.category_id = category_id
+        self.guild = None
+        self.category_ids = []
+        self.occupancy = {}
+
+    def overflow_number(self, category: discord.abc.GuildChannel):
+        """Nomor overflow dari nama "TICKETS-<n>" (n >= 2), atau None kalau bukan kategori overflow."""
+        prefix = f"{self.BASE_NAME}-"
+        if not isinstance(category, discord.CategoryChannel) or not category.name.startswith(prefix):
+            return None
+        suffix = category.name[len(prefix):]
+        return int(suffix) if suffix.isdigit() and int(suffix) >= 2 else None
+
+    def categories(self, guild: discord.Guild) -> list:
+        """Kategori ticket yang masih ada (dari cache, tanpa scan guild)."""
+        if guild != self.guild:
+            return []
+        found = []
+        for category_id in self.category_ids:
+            category = guild.get_channel(category_id)
+            if isinstance(category, discord.CategoryChannel):
+                found.append(category)
+        return found
+
+    def _track(self, category: discord.CategoryChannel):
+        self.category_ids.append(category.id)
+        self.occupancy[category.id] = len(category.channels)
+
+    async def _discover(self, guild: discord.Guild):
+        """Cari kategori utama & overflow yang sudah ada (sekali per guild, atau kalau kategori utama hilang)."""
+        self.guild = guild
+        self.category_ids = []
+        self.occupancy = {}
+
+        primary = guild.get_channel(self.category_id) if self.category_id else None
+        if not isinstance(primary, discord.CategoryChannel):
+            primary = discord.utils.get(guild.categories, name=self.BASE_NAME)
+        if primary is None:
+            primary = await outbound.submit(
+                "buyer", f"channel_create:{guild.id}", lambda: guild.create_category(self.BASE_NAME)
+            )
+        self._track(primary)
+
+        overflow = [(self.overflow_number(c), c) for c in guild.categories if c.id != primary.id]
+        # Urut nomor saja: dua kategori bernomor sama (mis. dua TICKETS-2) tidak boleh membandingkan object
+        for _, category in sorted(((n, c) for n, c in overflow if n is not None), key=lambda item: item[0]):
+            self._track(category)
+
+    def _take_slot(self, guild: discord.Guild):
+        for category in self.categories(guild):
+            if self.occupancy.get(category.id, 0) < self.LIMIT:
+                self.occupancy[category.id] = self.occupancy.get(category.id, 0) + 1
+                return category
+        return None
+
+    def _resolved(self, guild: discord.Guild) -> bool:
+        return guild == self.guild and bool(self.category_ids) and guild.get_channel(self.category_ids[0]) is not None
+
+    async def resolve(self, guild: discord.Guild) -> list:
+        """Kategori ticket guild ini (dicari sekali, setelah itu dari cache)."""
+        if not self._resolved(guild):
+            async with self._lock:
+                if not self._resolved(guild):
+                    await self._discover(guild)
+        return self.categories(guild)
+
+    async def acquire(self, guild: discord.Guild) -> discord.CategoryChannel:
+        """Kategori yang masih punya slot, slot-nya langsung dipakai. Kembalikan lewat release() kalau batal."""
+        await self.resolve(guild)
+        # Ambil slot tanpa await: dua pembeli bersamaan tidak bisa mengambil slot terakhir yang sama
+        category = self._take_slot(guild)
+        if category is not None:
+            return category
+
+        async with self._lock:
+            # Pembeli lain mungkin sudah membuat overflow selagi menunggu lock
+            category = self._take_slot(guild)
+            if category is None:
+                category = await self._create_overflow(guild)
+                self.occupancy[category.id] += 1
+            return category
+
+    async def _create_overflow(self, guild: discord.Guild) -> discord.CategoryChannel:
+        existing = self.categories(guild)
+        primary = existing[0]
+        numbers = {self.overflow_number(c) for c in existing[1:]}
+        number = 2
+        while number in numbers:
+            number += 1
+        category = await outbound.submit(
+            "buyer", f"channel_create:{guild.id}",
+            lambda: guild.create_category(
+                f"{self.BASE_NAME}-{number}",
+                overwrites=primary.overwrites,
+                position=existing[-1].position + 1
+            )
+        )
+        self._track(category)
+        self.created += 1
+        metrics.inc("ticket_categories_total", event="created")
+        print(f"[TicketCategoryManager] Kategori ticket penuh, ticket baru tumpah ke {category.name}")
+        return category
+
+    def release(self, category_id: int):
+        """Slot dari acquire() tidak jadi dipakai / channel di kategori ini dihapus."""
+        if category_id not in self.occupancy:
+            return
+        self.occupancy[category_id] = max(0, self.occupancy[category_id] - 1)
+        if self.occupancy[category_id] == 0 and category_id != self.category_ids[0]:
+            # Overflow kosong: hapus nanti saja, supaya tidak bolak-balik create / delete saat ramai
+            scheduler.schedule(
+                "reclaim_ticket_category", self.reclaim_delay,
+                key=str(category_id), category_id=category_id
+            )
+
+    def forget(self, channel: discord.abc.GuildChannel):
+        """Channel dihapus (event gateway): kurangi isi kategorinya."""
+        if channel.guild == self.guild and not isinstance(channel, discord.CategoryChannel):
+            self.release(channel.category_id)
+
+    async def create_channel(self, guild: discord.Guild, name: str, overwrites: dict, lane: str = "buyer"):
+        """create_text_channel di kategori yang masih punya slot (tumpah ke overflow kalau penuh)."""
+        category = await self.acquire(guild)
+        try:
+            return await outbound.submit(
+                lane, f"channel_create:{guild.id}",
+                lambda: category.create_text_channel(name=name, overwrites=overwrites)
+            )
+        except discord.HTTPException:
+            # Mis. kategori ternyata penuh karena channel yang dibuat manual: hitung ulang dari cache
+            if category.id in self.occupancy:
+                self.occupancy[category.id] = len(category.channels)
+            raise
+        except BaseException:
+            self.release(category.id)
+            raise
+
+    async def reclaim(self, category: discord.CategoryChannel) -> bool:
+        """Hapus kategori overflow kalau masih kosong. Return True kalau dihapus."""
+        async with self._lock:
+            if self.overflow_number(category) is None or category.channels:
+                return False
+            if category.id in self.occupancy:
+                if self.occupancy[category.id] > 0 or category.id == self.category_ids[0]:
+                    return False
+                self.category_ids.remove(category.id)
+                del self.occupancy[category.id]
+            try:
+                await outbound.submit("background", f"channel_delete:{category.guild.id}", category.delete)
+            except discord.NotFound:
+                pass
+        self.reclaimed += 1
+        metrics.inc("ticket_categories_total", event="reclaimed")
+        return True
+
+
+class TicketChannelPool:
+    """
+    Pool channel ticket yang sudah dibuat duluan (tersembunyi dari member)
+    di kategori ticket. Saat ada pembelian, satu channel di-claim: di-rename &
+    diberi overwrite pembeli dalam satu edit, jauh lebih cepat daripada
+    create_text_channel saat banyak pembeli antre di rate limit create channel.
+    Background task mengisi ulang pool pelan-pelan.
+
+    Channel pool ikut memakai slot kategori (TicketCategoryManager), jadi pool
+    juga tumpah ke kategori overflow kalau kategori utama penuh.
+
+    Aktif kalau TICKET_POOL_SIZE > 0, satu pool per toko. Latency claim vs
+    create biasa dicatat di `claim_latency` / `cold_latency` (histogram
+    bersama semua toko).
+    """
+
+    PREFIX = "pool-"
+
+    def __init__(self, size: int, refill_interval: float, categories: TicketCategoryManager):
+        self.size = size
+        self.refill_interval = refill_interval
+        self.categories = categories
+        self.guild = None
+        self.channels: list = []
+        self.claims = 0
+        self.misses = 0
+        self.claim_latency = metrics.histogram("ticket_channel_seconds", source="pool")
+        self.cold_latency = metrics.histogram("ticket_channel_seconds", source="create")
+        self._need = None
+        self._task = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.size > 0
+
+    def start(self, guild: discord.Guild):
+        if not self.enabled or (self._task is not None and not self._task.done()):
+            return
+        self.guild = guild
+        self._need = asyncio.Event()
+        self._task = asyncio.create_task(self._refill_loop())
+
+    async def close(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _refill_loop(self):
+        # Channel pool dari proses sebelumnya dipakai lagi
+        self.channels = [
+            c
+            for category in await self.categories.resolve(self.guild)
+            for c in category.text_channels
+            if c.name.startswith(self.PREFIX)
+        ]
+        self._need.set()
+
+        while True:
+            await self._need.wait()
+            self._need.clear()
+            while len(self.channels) < self.size:
+                try:
+                    # Lane background: create channel pembeli selalu didahulukan
+                    channel = await self.categories.create_channel(
+                        self.guild,
+                        f"{self.PREFIX}{uuid.uuid4().hex[:8]}",
+                        {
+                            self.guild.default_role: discord.PermissionOverwrite(read_messages=False),
+                            self.guild.me: discord.PermissionOverwrite(read_messages=True, send_messages=True)
+                        },
+                        lane="background"
+                    )
+                except Exception as e:
+                    print(f"[TicketChannelPool] Gagal isi pool: {e}")
+                    await asyncio.sleep(30)
+                    continue
+                self.channels.append(channel)
+                await asyncio.sleep(self.refill_interval)
+
+    async def claim(self, guild: discord.Guild, name: str, overwrites: dict):
+        """Ambil channel dari pool & jadikan ticket. Return None kalau pool kosong / tidak aktif."""
+        if not self.enabled or guild != self.guild:
+            return None
+
+        started = time.perf_counter()
+        while self.channels:
+            channel = self.channels.pop()
+            self._need.set()
+            try:
+                await outbound.submit(
+                    "buyer", f"channel_edit:{channel.id}",
+                    functools.partial(channel.edit, name=name, overwrites=overwrites)
+                )
+            except discord.NotFound:
+                # Channel pool dihapus manual, coba yang lain
+                continue
+            self.claims += 1
+            self.claim_latency.observe(time.perf_counter() - started)
+            return channel
+
+        self.misses += 1
+        return None
+
+
+# ============================================
+# BATAS PEMBELIAN PER USER
+# ============================================
+class PurchaseLimiter:
+    """
+    Token bucket per user untuk submit pembelian: maks `capacity` ticket baru
+    per `per` detik, supaya satu user yang spam submit tidak menghabiskan
+    budget create channel guild & stock untuk pembeli lain. Bucket yang
+    sudah penuh lagi (user idle) dibuang saat jumlah bucket melewati
+    `max_users`, jadi memory tidak ikut jumlah semua user yang pernah beli.
+    """
+
+    def __init__(self, capacity: int, per: float, max_users: int = 10000):
+        self.capacity = capacity
+        self.per = per
+        self.max_users = max_users
+        self.buckets: dict = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self.capacity > 0
+
+    def try_take(self, user_id: int) -> bool:
+        if not self.enabled:
+            return True
+        bucket = self.buckets.get(user_id)
+        if bucket is None:
+            if len(self.buckets) >= self.max_users:
+                self.buckets = {uid: b for uid, b in self.buckets.items() if not b.full}
+            bucket = self.buckets[user_id] = TokenBucket(self.capacity, self.per)
+        return bucket.try_take()
+
+    def refund(self, user_id: int):
+        """Token dikembalikan kalau submit gagal jadi ticket (stock kurang / create gagal)."""
+        bucket = self.buckets.get(user_id)
+        if bucket is not None:
+            bucket.refund()
+
+    def retry_after(self, user_id: int) -> float:
+        bucket = self.buckets.get(user_id)
+        return bucket.wait_time() if bucket is not None else 0.0
+
+
+def create_purchase_limiter() -> PurchaseLimiter:
+    return PurchaseLimiter(config.PURCHASE_RATE_LIMIT, config.PURCHASE_RATE_WINDOW)
+
+
+purchase_limiter = LazyObject(create_purchase_limiter, "purchase_limiter")
+
+# ============================================
+# EXPIRY TICKET PENDING
+# ============================================
+class TicketExpiry:
+    """
+    Batalkan ticket pending yang lewat `expires_at` supaya stock yang
+    ditahannya kembali bisa dibeli. Tidak ada polling: task tidur sampai
+    deadline terdekat di heap DataStore (store.next_expiry()) dan dibangunkan
+    lewat store.expiry_wakeup kalau ada ticket baru dengan deadline lebih awal.
+    Ticket dibatalkan dengan reason "expired" (processed_by kosong), embed-nya
+    di-update lalu channel dijadwalkan dihapus seperti Cancel biasa.
+    """
+
+    def __init__(self, store, refresher, close_delay: float):
+        self.store = store
+        self.refresher = refresher
+        self.close_delay = close_delay
+        self._client = None
+        self._task = None
+
+    def start(self, client: discord.Client):
+        if self._task is not None and not self._task.done():
+            return
+        self._client = client
+        self.store.expiry_wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+
+    async def close(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self.store.expiry_wakeup = None
+
+    async def _run(self):
+        await self._client.wait_until_ready()
+        wakeup = self.store.expiry_wakeup
+        while True:
+            wakeup.clear()
+            deadline = self.store.next_expiry()
+            timeout = None if deadline is None else max(0.0, deadline - time.time())
+            if timeout is None or timeout > 0:
+                try:
+                    await asyncio.wait_for(wakeup.wait(), timeout)
+                    continue
+                except asyncio.TimeoutError:
+                    pass
+
+            for tx_id in self.store.pop_expired(time.time()):
+                try:
+                    await self.expire(tx_id)
+                except Exception as e:
+                    print(f"[TicketExpiry] Gagal expire ticket {tx_id}: {e}")
+
+    async def expire(self, tx_id: str):
+        tx = self.store.transactions.get(tx_id)
+        if tx is None or tx.get("status") != "pending":
+            return
+        self.store.set_transaction_status(tx_id, "cancelled", reason="expired")
+        metrics.inc("tickets_expired_total")
+        self.refresher.mark_dirty()
+
+        channel = self._client.get_channel(int(tx_id))
+        if not isinstance(channel, discord.TextChannel):
+            # Channel sudah tidak ada: cukup lepas stock-nya
+            return
+        await update_ticket_message(channel, tx)
+        await outbound.submit(
+            "background", f"message:{channel.id}",
+            lambda: channel.send(
+                f"⌛ Ticket kedaluwarsa karena tidak diproses, stock dikembalikan. "
+                f"Ticket akan ditutup dalam {self.close_delay} detik..."
+            )
+        )
+        scheduler.schedule("delete_channel", self.close_delay, key=str(channel.id), channel_id=channel.id)
+
+
+# ============================================
+# LOG TESTIMONI (BATCH)
+# ============================================
+def build_testimoni_embed(entry: dict) -> discord.Embed:
+    try:
+        timestamp = datetime.fromisoformat(entry.get("processed_at"))
+    except (TypeError, ValueError):
+        timestamp = datetime.now()
+
+    log_embed = discord.Embed(
+        title="✅ Testimoni Pembelian Ikan Tumbal",
+        color=discord.Color.green(),
+        timestamp=timestamp
+    )
+    # Mention langsung dari id: tidak perlu get_member
+    log_embed.add_field(name="👤 Pembeli", value=f"<@{entry['user_id']}>", inline=True)
+    log_embed.add_field(name="🧾 Produk", value=entry.get("product") or "-", inline=True)
+    log_embed.add_field(name="📦 Jumlah", value=f"**{entry.get('amount', 0)}** Ikan", inline=True)
+    log_embed.add_field(
+        name="💰 Total",
+        value=f"**Rp{rupiah(entry.get('total_price', 0))}**",
+        inline=False
+    )
+    processed_by = entry.get("processed_by")
+    log_embed.add_field(
+        name="🛠 Diproses oleh",
+        value=f"<@{processed_by}>" if processed_by else "Sistem",
+        inline=True
+    )
+    log_embed.set_footer(text="KaepBlox • Log sukses otomatis")
+    return log_embed
+
+
+class TestimoniPublisher:
+    """
+    Antrian log testimoni ke TESTIMONI_CHANNEL_ID. Entry dikumpulkan selama
+    `window` detik lalu dikirim maksimal 10 embed per message, di luar jalur
+    klik admin. Entry yang belum terkirim disimpan ke file supaya tidak hilang
+    kalau bot restart; 429 / error server dicoba lagi dengan backoff. Kalau
+    channel testimoni tidak ketemu MAX_ATTEMPTS kali berturut-turut, entry
+    diparkir (tetap di file, tidak dicoba lagi) sampai channel diganti.
+    """
+
+    BATCH_SIZE = 10
+    MAX_BACKOFF = 300
+    MAX_ATTEMPTS = 8
+
+    def __init__(self, path: str, channel_id: int, window: float):
+        self.path = path
+        self.channel_id = channel_id
+        self.window = window
+        self.entries: list = []
+        self.parked: list = []
+        self.missing_attempts = 0
+        self.sent_messages = 0
+        self.sent_entries = 0
+        self._client = None
+        self._wakeup = None
+        self._task = None
+
+    def load(self):
+        try:
+            with open(self.path, "r") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            data = []
+        except Exception as e:
+            print(f"[TestimoniPublisher] Gagal baca {self.path}: {e}")
+            data = []
+        if isinstance(data, list):
+            self.entries = [entry for entry in data if not entry.get("parked")]
+            self.parked = [entry for entry in data if entry.get("parked")]
+
+    def _save(self):
+        try:
+            write_json_atomic(self.path, json.dumps(self.entries + self.parked, indent=4))
+        except Exception as e:
+            print(f"[TestimoniPublisher] Gagal simpan antrian: {e}")
+
+    def publish(self, tx: dict):
+        """Masukkan transaksi sukses ke antrian log testimoni."""
+        if not self.channel_id:
+            return
+        self.entries.append({
+            "user_id": tx.get("user_id"),
+            "product": tx.get("product"),
+            "amount": tx.get("amount", 0),
+            "total_price": tx.get("total_price", 0),
+            "processed_by": tx.get("processed_by"),
+            "processed_at": tx.get("processed_at")
+        })
+        self._save()
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def set_channel(self, channel_id: int):
+        """Ganti channel testimoni; entry yang diparkir dicoba kirim lagi ke channel baru."""
+        if channel_id == self.channel_id:
+            return
+        self.channel_id = channel_id
+        self.missing_attempts = 0
+        if self.parked:
+            for entry in self.parked:
+                entry.pop("parked", None)
+            self.entries = self.parked + self.entries
+            self.parked = []
+            self._save()
+        if self.entries and self._wakeup is not None:
+            self._wakeup.set()
+
+    def _park(self):
+        for entry in self.entries:
+            entry["parked"] = True
+        self.parked.extend(self.entries)
+        self.entries = []
+        self._save()
+
+    def start(self, client: discord.Client):
+        if self._task is not None and not self._task.done():
+            return
+        self._client = client
+        self._wakeup = asyncio.Event()
+        if self.entries:
+            self._wakeup.set()
+        self._task = asyncio.create_task(self._run())
+
+    async def close(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        await self._client.wait_until_ready()
+        backoff = 0
+        while True:
+            if backoff:
+                await asyncio.sleep(backoff)
+            else:
+                await self._wakeup.wait()
+                # Tunggu sebentar supaya testimoni lain ikut satu message
+                await asyncio.sleep(self.window)
+            self._wakeup.clear()
+
+            if await self._drain():
+                backoff = 0
+            else:
+                backoff = min(self.MAX_BACKOFF, max(1, backoff * 2))
+
+    async def _drain(self) -> bool:
+        """Kirim semua entry yang antre. Return False kalau perlu dicoba lagi nanti."""
+        channel = self._client.get_channel(self.channel_id)
+        if not isinstance(channel, discord.TextChannel):
+            self.missing_attempts += 1
+            if self.missing_attempts < self.MAX_ATTEMPTS:
+                print(f"[TestimoniPublisher] Channel testimoni {self.channel_id} tidak ditemukan")
+                return False
+            # Berhenti retry: entry diparkir supaya guild tidak dianggap sibuk selamanya
+            print(
+                f"[TestimoniPublisher] WARNING: channel testimoni {self.channel_id} tetap tidak ditemukan, "
+                f"{len(self.entries)} testimoni diparkir sampai channel diganti"
+            )
+            self._park()
+            return True
+        self.missing_attempts = 0
+
+        while self.entries:
+            batch = self.entries[:self.BATCH_SIZE]
+            try:
+                embeds = [build_testimoni_embed(entry) for entry in batch]
+                await outbound.submit("background", f"message:{channel.id}", lambda: channel.send(embeds=embeds))
+            except discord.HTTPException as e:
+                if e.status == 429 or e.status >= 500:
+                    print(f"[TestimoniPublisher] Kena {e.status}, dicoba lagi nanti")
+                    return False
+                # Error permanen (mis. izin): batch dibuang supaya antrian tidak macet
+                print(f"[TestimoniPublisher] Batch testimoni dibuang: {e}")
+            except Exception as e:
+                print(f"[TestimoniPublisher] Gagal kirim testimoni: {e}")
+                return False
+            else:
+                self.sent_messages += 1
+                self.sent_entries += len(batch)
+
+            del self.entries[:len(batch)]
+            self._save()
+        return True
+
+
+def create_testimoni_publisher(settings) -> TestimoniPublisher:
+    publisher = TestimoniPublisher(settings.TESTIMONI_QUEUE_FILE, settings.TESTIMONI_CHANNEL_ID, config.TESTIMONI_BATCH_WINDOW)
+    publisher.load()
+    return publisher
+
+# ============================================
+# EMBED TICKET
+# ============================================
+TICKET_STATUS_DISPLAY = {
+    "pending": ("⏳ **Menunggu konfirmasi admin**", None),
+    "success": ("✅ **Transaksi Berhasil**", "Diproses oleh"),
+    "cancelled": ("❌ **Transaksi Dibatalkan**", "Dibatalkan oleh"),
+}
+
+TICKET_STATUS_COLORS = {
+    "pending": discord.Color.orange(),
+    "success": discord.Color.green(),
+    "cancelled": discord.Color.red(),
+}
+
+TICKET_DESCRIPTION = (
+    "👤 Pembeli: <@{user_id}>\n"
+    "🧾 Produk: **{product}**\n\n"
+    "Silakan tunggu admin untuk memproses pesanan kamu.\n\n"
+    "📌 **Reminder:**\n"
+    "• Jangan spam chat.\n"
+    "• Proses manual oleh admin.\n"
+    "• Tag <@1005129829370318999> / <@1190606903911403650> jika ingin beli.\n"
+)
+
+
+@functools.lru_cache(maxsize=None)
+def ticket_embed_template() -> dict:
+    """Bagian statis embed ticket, dibangun sekali. Field & status diisi build_ticket_embed()."""
+    embed = discord.Embed(title="🎫 Ticket Pembelian SC Tumbal")
+    embed.set_footer(text="KaepBlox — Ticket otomatis ditutup setelah transaksi selesai / dibatalkan")
+    return embed.to_dict()
+
+
+def build_ticket_embed(tx: dict) -> discord.Embed:
+    """Render embed ticket langsung dari data transaksi (tanpa membaca embed lama di channel)."""
+    status = tx.get("status", "pending")
+    status_text, actor_label = TICKET_STATUS_DISPLAY.get(status, TICKET_STATUS_DISPLAY["pending"])
+
+    template = ticket_embed_template()
+    embed = discord.Embed(
+        title=template["title"],
+        description=TICKET_DESCRIPTION.format(user_id=tx.get("user_id"), product=tx.get("product")),
+        color=TICKET_STATUS_COLORS.get(status, discord.Color.orange()),
+        timestamp=datetime.fromisoformat(tx["created_at"]) if tx.get("created_at") else None
+    )
+    embed.set_footer(text=template["footer"]["text"])
+    embed.add_field(
+        name="📦 Jumlah Ikan Tumbal",
+        value=f"**{tx.get('amount', 0)}** Ikan",
+        inline=True
+    )
+    embed.add_field(
+        name="💰 Total Harga",
+        value=f"**Rp{rupiah(int(tx.get('total_price', 0)))}** <:duit:1433825063333003275>",
+        inline=True
+    )
+    if status == "cancelled" and tx.get("reason") == "expired":
+        status_text, actor_label = "⌛ **Ticket Kedaluwarsa** (stock dikembalikan)", None
+    embed.add_field(name="Status", value=status_text, inline=False)
+    if status == "pending" and tx.get("expires_at"):
+        try:
+            deadline = int(datetime.fromisoformat(tx["expires_at"]).timestamp())
+        except ValueError:
+            deadline = None
+        if deadline:
+            embed.add_field(name="⌛ Kedaluwarsa", value=f"<t:{deadline}:R>", inline=False)
+    if actor_label:
+        processed_by = tx.get("processed_by")
+        embed.add_field(
+            name=actor_label,
+            value=f"<@{processed_by}>" if processed_by else "Sistem",
+            inline=False
+        )
+    return embed
+
+
+async def update_ticket_message(channel: discord.TextChannel, tx: dict):
+    """Edit embed ticket sesuai status transaksi & hapus tombolnya, lewat message_id yang disimpan."""
+    embed = build_ticket_embed(tx)
+    message_id = tx.get("message_id")
+    if message_id:
+        message = channel.get_partial_message(int(message_id))
+    else:
+        # Transaksi lama (sebelum message_id disimpan): cari message bot di history,
+        # fetch history juga lewat antrian supaya ikut budget rate limit channel ini
+        async def find_ticket_message():
+            async for msg in channel.history(limit=10):
+                if msg.author.id == channel.guild.me.id and msg.embeds:
+                    return msg
+            return None
+
+        message = await outbound.submit("ticket", f"message:{channel.id}", find_ticket_message)
+        if message is None:
+            return
+
+    await outbound.submit(
+        "ticket", f"message:{channel.id}",
+        lambda: message.edit(embed=embed, view=None),
+        key=f"edit:{message.id}"
+    )
@@ -0,0 +1,519 @@
+import math
+import time
+from datetime import datetime
+
+import discord
+
+from .config import SOLD_EMOJI, config
+from .handlers import defer_first, instrumented
+from .guilds import (
+    refresh_main_embed,
+    settings,
+    store,
+    storefront_pages,
+    testimoni_publisher,
+    ticket_categories,
+    ticket_pool
+)
+from .metrics import metrics
+from .outbound import outbound
+from .scheduler import scheduler
+from .storefront import StorefrontPage
+from .tickets import build_ticket_embed, purchase_limiter, update_ticket_message
+
+
+def open_ticket_redirect(guild: discord.Guild, user_id: int):
+    """
+    Pesan untuk pembeli yang sudah mencapai MAX_OPEN_TICKETS (diarahkan ke
+    ticket yang masih terbuka), atau None kalau boleh buat ticket baru.
+    Ticket pending yang channel-nya sudah dihapus tidak dihitung.
+    """
+    if not config.MAX_OPEN_TICKETS:
+        return None
+    channels = [guild.get_channel(int(tx_id)) for tx_id in store.open_ticket_ids(user_id)]
+    channels = [ch for ch in channels if ch is not None]
+    opening = store.opening.get(user_id, 0)
+    if len(channels) + opening < config.MAX_OPEN_TICKETS:
+        return None
+
+    metrics.inc("purchase_rejected_total", reason="open_ticket")
+    if not channels:
+        return "⏳ Ticket kamu sedang dibuat, tunggu sebentar ya."
+    mentions = ", ".join(ch.mention for ch in channels)
+    return (
+        f"ℹ️ Kamu masih punya ticket yang belum selesai: {mentions}\n"
+        "Lanjutkan di sana atau tunggu admin memprosesnya sebelum membeli lagi."
+    )
+
+
+# ============================================
+# MODAL PEMBELIAN PER PRODUK
+# ============================================
+class PurchaseModal(discord.ui.Modal, title="Pembelian SC Tumbal"):
+    amount = discord.ui.TextInput(
+        label="Mau beli berapa SC?",
+        placeholder="Contoh: 5",
+        required=True,
+        max_length=10
+    )
+
+    def __init__(self, product_name: str):
+        super().__init__()
+        self.product_name = product_name
+
+    @defer_first("purchase_modal", ephemeral=True, thinking=True)
+    async def on_submit(self, interaction: discord.Interaction):
+        try:
+            amount = int(self.amount.value)
+        except ValueError:
+            return await interaction.followup.send(
+                "❌ Masukkan angka yang valid!",
+                ephemeral=True
+            )
+
+        if amount <= 0:
+            return await interaction.followup.send(
+                "❌ Jumlah harus lebih dari 0!",
+                ephemeral=True
+            )
+
+        # Cek produk
+        products = store.products
+        product = products.get(self.product_name)
+        if not product:
+            return await interaction.followup.send(
+                "❌ Produk tidak ditemukan (mungkin sudah dihapus admin).",
+                ephemeral=True
+            )
+
+        unit_price = int(product.get("price", 0))
+
+        guild = interaction.guild
+        if guild is None:
+            return await interaction.followup.send(
+                "❌ Guild tidak ditemukan.",
+                ephemeral=True
+            )
+
+        # Submit ulang diarahkan ke ticket yang sudah ada, bukan bikin channel baru
+        user_id = interaction.user.id
+        redirect = open_ticket_redirect(guild, user_id)
+        if redirect is not None:
+            return await interaction.followup.send(redirect, ephemeral=True)
+
+        if not purchase_limiter.try_take(user_id):
+            metrics.inc("purchase_rejected_total", reason="rate_limited")
+            return await interaction.followup.send(
+                "⏳ Terlalu banyak pembelian dalam waktu singkat. "
+                f"Coba lagi dalam **{math.ceil(purchase_limiter.retry_after(user_id))} detik**.",
+                ephemeral=True
+            )
+
+        # Cek & tahan stock sekaligus, supaya pembeli lain tidak bisa ambil stock yang sama
+        reservation = store.reserve(self.product_name, amount, user_id)
+        if reservation is None:
+            purchase_limiter.refund(user_id)
+            pending_stock = store.pending_stock(self.product_name)
+            available_stock = int(product.get("stock", 0)) - pending_stock
+            return await interaction.followup.send(
+                f"❌ **Stock {self.product_name} tidak mencukupi!**\n"
+                f"Stock tersedia: **{available_stock}**\n"
+                f"Stock dalam transaksi: **{pending_stock}**\n"
+                f"Kamu minta: **{amount}**",
+                ephemeral=True
+            )
+
+        tx = {
+            "user_id": interaction.user.id,
+            "product": self.product_name,
+            "amount": amount,
+            "unit_price": unit_price,
+            "total_price": amount * unit_price,
+            "status": "pending",
+            "created_at": datetime.now().isoformat()
+        }
+        # Diisi sebelum embed ticket dikirim, supaya field "Kedaluwarsa" ikut tampil
+        expires_at = store.ticket_expires_at(self.product_name)
+        if expires_at:
+            tx["expires_at"] = expires_at
+
+        ticket_channel = None
+        try:
+            overwrites = {
+                guild.default_role: discord.PermissionOverwrite(read_messages=False),
+                interaction.user: discord.PermissionOverwrite(read_messages=True, send_messages=True),
+                guild.me: discord.PermissionOverwrite(read_messages=True, send_messages=True)
+            }
+
+            safe_name = self.product_name.replace(" ", "-").lower()
+            ticket_name = f"ticket-{safe_name}-{interaction.user.name}"
+
+            # Pakai channel dari pool kalau ada, kalau tidak buat baru (tumpah ke TICKETS-2, ... kalau penuh)
+            ticket_channel = await ticket_pool.claim(guild, ticket_name, overwrites)
+            if ticket_channel is None:
+                started = time.perf_counter()
+                ticket_channel = await ticket_categories.create_channel(guild, ticket_name, overwrites)
+                ticket_pool.cold_latency.observe(time.perf_counter() - started)
+
+            view = TicketView(ticket_channel.id)
+            ticket_message = await outbound.submit(
+                "buyer", f"message:{ticket_channel.id}",
+                lambda: ticket_channel.send(
+                    content=interaction.user.mention,
+                    embed=build_ticket_embed(tx),
+                    view=view
+                )
+            )
+        except BaseException:
+            # Ticket gagal dibuat: lepas lagi stock yang ditahan, channel setengah jadi dibuang
+            reservation.rollback()
+            purchase_limiter.refund(user_id)
+            if ticket_channel is not None:
+                scheduler.schedule("delete_channel", 0, key=str(ticket_channel.id), channel_id=ticket_channel.id)
+            raise
+
+        # Simpan transaksi (stock yang ditahan berubah jadi transaksi pending).
+        # message_id disimpan supaya update status bisa langsung edit message ini.
+        tx["message_id"] = ticket_message.id
+        reservation.commit(ticket_channel.id, tx)
+
+        await interaction.followup.send(
+            f"✅ Ticket untuk **{self.product_name}** berhasil dibuat! Silakan menuju ke {ticket_channel.mention}",
+            ephemeral=True
+        )
+
+# ============================================
+# VIEW EPHEMERAL: BELI SEKARANG (SETELAH PILIH PRODUK)
+# ============================================
+class EphemeralBuyView(discord.ui.View):
+    def __init__(self, product_name: str):
+        super().__init__(timeout=120)
+        self.product_name = product_name
+
+    @discord.ui.button(
+        label="Beli Sekarang",
+        style=discord.ButtonStyle.green,
+        emoji="🛒"
+    )
+    @instrumented("buy_button")
+    async def beli_button(self, interaction: discord.Interaction, button: discord.ui.Button):
+        # Cek produk & stock
+        products = store.products
+        product = products.get(self.product_name)
+        if not product:
+            return await interaction.response.send_message(
+                "❌ Produk tidak ditemukan (mungkin sudah dihapus admin).",
+                ephemeral=True
+            )
+
+        stock_now = int(product.get("stock", 0))
+        if stock_now <= 0:
+            return await interaction.response.send_message(
+                f"{SOLD_EMOJI} Maaf, stock **{self.product_name}** sedang habis. Tunggu restock ya!",
+                ephemeral=True
+            )
+
+        # Sudah punya ticket terbuka: langsung arahkan ke sana, tidak perlu isi modal
+        if interaction.guild is not None:
+            redirect = open_ticket_redirect(interaction.guild, interaction.user.id)
+            if redirect is not None:
+                return await interaction.response.send_message(redirect, ephemeral=True)
+
+        modal = PurchaseModal(self.product_name)
+        await interaction.response.send_modal(modal)
+
+# ============================================
+# SELECT MENU PRODUK & NAVIGASI STOREFRONT
+# ============================================
+class ProductSelect(discord.ui.Select):
+    def __init__(self, options: list, custom_id: str = None):
+        options = list(options)
+        if not options:
+            options = [
+                discord.SelectOption(
+                    label="Belum ada produk",
+                    value="__none",
+                    description="Minta admin tambahkan produk dulu."
+                )
+            ]
+
+        extra = {"custom_id": custom_id} if custom_id else {}
+        super().__init__(
+            placeholder="🔽 Pilih produk yang ingin dibeli",
+            min_values=1,
+            max_values=1,
+            options=options,
+            row=0,
+            **extra
+        )
+
+    @instrumented("storefront_product_select")
+    async def callback(self, interaction: discord.Interaction):
+        value = self.values[0]
+
+        if value == "__none":
+            await interaction.response.send_message(
+                "❌ Belum ada produk yang bisa dibeli. Minta admin menambahkan produk dulu.",
+                ephemeral=True
+            )
+            return
+
+        products = store.products
+        product = products.get(value)
+        if not product:
+            await interaction.response.send_message(
+                "❌ Produk tidak ditemukan!",
+                ephemeral=True
+            )
+            return
+
+        stock_now = int(product.get("stock", 0))
+        if stock_now <= 0:
+            await interaction.response.send_message(
+                f"{SOLD_EMOJI} Stock **{value}** habis. Tunggu restock ya!",
+                ephemeral=True
+            )
+            return
+
+        # RESET SELECT SUPAYA BISA KLIK PRODUK YANG SAMA BERKALI-KALI
+        # Dilakukan lewat response interaction (update message) dengan view yang
+        # sudah di-cache, bukan message.edit terpisah.
+        await interaction.response.edit_message(view=self.view.reset_view())
+        storefront_pages.edits_saved += 1
+
+        # Kirim ephemeral "Beli Sekarang"
+        view = EphemeralBuyView(value)
+        await interaction.followup.send(
+            f"📌 Kamu memilih produk: **{value}**\n"
+            f"Klik tombol di bawah untuk melanjutkan pembelian.",
+            view=view,
+            ephemeral=True
+        )
+
+
+class CategorySelect(discord.ui.Select):
+    def __init__(self, categories: list, current: str = None, custom_id: str = None):
+        options = [discord.SelectOption(label="Semua Produk", value="__all", default=current is None)]
+        for category in categories[:24]:
+            options.append(discord.SelectOption(label=category[:100], value=category, default=category == current))
+
+        extra = {"custom_id": custom_id} if custom_id else {}
+        super().__init__(
+            placeholder="📂 Pilih kategori",
+            min_values=1,
+            max_values=1,
+            options=options,
+            row=1,
+            **extra
+        )
+
+    @instrumented("storefront_category")
+    async def callback(self, interaction: discord.Interaction):
+        value = self.values[0]
+        category = None if value == "__all" else value
+        await self.view.show_page(interaction, category, 0, reset=True)
+
+
+class StorefrontNavButton(discord.ui.Button):
+    def __init__(self, step: int, custom_id: str = None):
+        extra = {"custom_id": custom_id} if custom_id else {}
+        super().__init__(
+            label="Sebelumnya" if step < 0 else "Berikutnya",
+            emoji="◀️" if step < 0 else "▶️",
+            style=discord.ButtonStyle.secondary,
+            row=2,
+            **extra
+        )
+        self.step = step
+
+    @instrumented("storefront_nav")
+    async def callback(self, interaction: discord.Interaction):
+        page = self.view.page
+        await self.view.show_page(interaction, page.category, page.index + self.step)
+
+
+class StorefrontSearchButton(discord.ui.Button):
+    def __init__(self, custom_id: str = None):
+        extra = {"custom_id": custom_id} if custom_id else {}
+        super().__init__(label="Cari Produk", emoji="🔍", style=discord.ButtonStyle.primary, row=2, **extra)
+
+    @instrumented("storefront_search_button")
+    async def callback(self, interaction: discord.Interaction):
+        await interaction.response.send_modal(StorefrontSearchModal())
+
+
+class StorefrontSearchModal(discord.ui.Modal, title="Cari Produk"):
+    query = discord.ui.TextInput(
+        label="Nama produk",
+        placeholder="Contoh: ikan",
+        required=True,
+        max_length=100
+    )
+
+    @instrumented("storefront_search")
+    async def on_submit(self, interaction: discord.Interaction):
+        page = storefront_pages.search_page(self.query.value)
+        if not page.names:
+            return await interaction.response.send_message(
+                f"❌ Tidak ada produk yang cocok dengan **{self.query.value}**.",
+                ephemeral=True
+            )
+        await interaction.response.send_message(embed=page.embed, view=StorefrontView(page), ephemeral=True)
+
+
+class StorefrontView(discord.ui.View):
+    """
+    View storefront untuk satu halaman.
+
+    persistent=True dipakai message utama: custom_id tetap (tetap jalan setelah
+    restart) dan navigasi membuka salinan ephemeral untuk user yang klik, jadi
+    message utama tidak berubah untuk pembeli lain. View ephemeral mengedit
+    message-nya sendiri saat navigasi.
+
+    Callback selalu membaca halaman lewat `storefront_pages` toko aktif, jadi
+    view yang sama aman dipakai semua toko. `categories` diisi kalau view
+    dibangun di luar interaction (mis. StorefrontRefresher).
+    """
+
+    def __init__(self, page: StorefrontPage, persistent: bool = False, categories: list = None):
+        super().__init__(timeout=None if persistent else 300)
+        self.page = page
+        self.persistent = persistent
+
+        def cid(name: str):
+            return f"storefront_{name}" if persistent else None
+
+        self.add_item(ProductSelect(page.options, custom_id="product_select_menu" if persistent else None))
+        if page.navigable:
+            if categories is None:
+                categories = storefront_pages.categories()
+            if categories:
+                self.add_item(CategorySelect(categories, page.category, custom_id=cid("category")))
+            if page.total_pages > 1:
+                self.add_item(StorefrontNavButton(-1, custom_id=cid("prev")))
+                self.add_item(StorefrontNavButton(1, custom_id=cid("next")))
+        self.add_item(StorefrontSearchButton(custom_id=cid("search")))
+
+    @classmethod
+    def dispatcher(cls) -> "StorefrontView":
+        """
+        View persistent yang didaftarkan sekali lewat bot.add_view: memuat semua
+        custom_id message utama, supaya message utama toko mana pun tetap
+        dilayani setelah restart tanpa perlu load toko itu dulu.
+        """
+        page = StorefrontPage(None, 0, 1, [], (), embed=None, options=[], navigable=False)
+        view = cls(page, persistent=True)
+        view.add_item(CategorySelect([], custom_id="storefront_category"))
+        view.add_item(StorefrontNavButton(-1, custom_id="storefront_prev"))
+        view.add_item(StorefrontNavButton(1, custom_id="storefront_next"))
+        return view
+
+    def reset_view(self) -> "StorefrontView":
+        """View untuk me-reset select setelah dipilih."""
+        return storefront_pages.main_view() if self.persistent else self
+
+    async def show_page(self, interaction: discord.Interaction, category, index: int, reset: bool = False):
+        page = storefront_pages.page(category, index)
+        view = StorefrontView(page)
+        if not self.persistent:
+            await interaction.response.edit_message(embed=page.embed, view=view)
+        elif reset:
+            # Select di message utama ikut di-reset, halaman dikirim sebagai followup ephemeral
+            await interaction.response.edit_message(view=self.reset_view())
+            await interaction.followup.send(embed=page.embed, view=view, ephemeral=True)
+        else:
+            await interaction.response.send_message(embed=page.embed, view=view, ephemeral=True)
+
+# ============================================
+# VIEW TICKET (ADMIN: SUCCESS / CANCEL)
+# ============================================
+class TicketView(discord.ui.View):
+    def __init__(self, channel_id: int):
+        super().__init__(timeout=None)
+        self.channel_id = channel_id
+
+    @discord.ui.button(label="Success", style=discord.ButtonStyle.success, emoji="✅")
+    @defer_first("ticket_success")
+    async def success_button(self, interaction: discord.Interaction, button: discord.ui.Button):
+        if interaction.user.id not in settings.ALLOWED_USER_IDS:
+            return await interaction.followup.send(
+                "❌ Kamu tidak memiliki izin untuk menggunakan tombol ini!",
+                ephemeral=True
+            )
+
+        transactions = store.transactions
+        tx = transactions.get(str(self.channel_id))
+        if not tx:
+            return await interaction.followup.send(
+                "❌ Data transaksi tidak ditemukan!",
+                ephemeral=True
+            )
+
+        if tx.get("status") != "pending":
+            return await interaction.followup.send(
+                "❌ Transaksi ini sudah diproses sebelumnya!",
+                ephemeral=True
+            )
+
+        product_name = tx.get("product")
+
+        # Kurangi stock produk & update transaksi
+        remaining_stock = store.complete_sale(self.channel_id, interaction.user.id)
+
+        # Update embed di ticket (langsung ke message ticket, tanpa scan history)
+        channel = interaction.channel
+        if isinstance(channel, discord.TextChannel):
+            await update_ticket_message(channel, tx)
+
+        # Log testimoni (dikirim batch di background, bukan di jalur klik admin)
+        testimoni_publisher.publish(tx)
+
+        # Refresh main embed (update stock)
+        refresh_main_embed()
+
+        await interaction.followup.send(
+            f"✅ Transaksi **{product_name}** berhasil! Stock tersisa: **{remaining_stock}**",
+            ephemeral=False
+        )
+
+        # Tutup ticket setelah beberapa detik (dijadwalkan, tetap jalan walau bot restart)
+        await interaction.followup.send(f"Ticket akan ditutup dalam {config.TICKET_CLOSE_DELAY} detik...")
+        scheduler.schedule("delete_channel", config.TICKET_CLOSE_DELAY, key=str(channel.id), channel_id=channel.id)
+
+    @discord.ui.button(label="Cancel", style=discord.ButtonStyle.danger, emoji="❌")
+    @defer_first("ticket_cancel")
+    async def cancel_button(self, interaction: discord.Interaction, button: discord.ui.Button):
+        if interaction.user.id not in settings.ALLOWED_USER_IDS:
+            return await interaction.followup.send(
+                "❌ Kamu tidak memiliki izin untuk menggunakan tombol ini!",
+                ephemeral=True
+            )
+
+        transactions = store.transactions
+        tx = transactions.get(str(self.channel_id))
+        if not tx:
+            return await interaction.followup.send(
+                "❌ Data transaksi tidak ditemukan!",
+                ephemeral=True
+            )
+
+        if tx.get("status") != "pending":
+            return await interaction.followup.send(
+                "❌ Transaksi ini sudah diproses sebelumnya!",
+                ephemeral=True
+            )
+
+        store.set_transaction_status(self.channel_id, "cancelled", interaction.user.id)
+
+        # Update embed di ticket (langsung ke message ticket, tanpa scan history)
+        channel = interaction.channel
+        if isinstance(channel, discord.TextChannel):
+            await update_ticket_message(channel, tx)
+
+        await interaction.followup.send(
+            "❌ Transaksi dibatalkan!",
+            ephemeral=False
+        )
+
+        await interaction.followup.send(f"Ticket akan ditutup dalam {config.TICKET_CLOSE_DELAY} detik...")
+        scheduler.schedule("delete_channel", config.TICKET_CLOSE_DELAY, key=str(channel.id), channel_id=channel.id)